@@ -0,0 +1,202 @@
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from joblib import Memory, Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, brier_score_loss, log_loss
+
+from preprocess_data import DataPreprocessor
+from train_models import ModelTrainer
+from compiled_scorer import CompiledScorer
+from game_log import nickname
+
+LEGACY_FILES = [os.path.join("NBA_data", "NBA_data_all_80-19.csv"),
+                os.path.join("NBA_data", "NBA_data_all_19-20.csv")]
+API_FILES = [os.path.join("NBA_data", "historical_data.csv")]
+CACHE_DIR = os.path.join("NBA_data", "cache", "backtest")
+REPORT_PATH = os.path.join("NBA_data", "backtest_report.json")
+
+# Features that mean the same in the basketball-reference exports and the NBA.com
+# API files; the API files carry estimated ratings in the shooting and rebounding
+# columns, and the exports have no PA/G
+SHARED_FEATURES = ['W', 'L', 'W/L%', 'GB', 'PS/G', 'PTS']
+
+# Seasons of history required before a season is scored
+MIN_TRAIN_SEASONS = 5
+
+memory = Memory(CACHE_DIR, verbose=0)
+
+
+def load_seasons(legacy_files=LEGACY_FILES, api_files=API_FILES):
+    """Every available season in one table; later files win for repeated years
+
+    Teams are named by nickname, as in the API files. When both sources are
+    loaded only SHARED_FEATURES are kept, so every season is described by the
+    same columns.
+    """
+    preprocessor = DataPreprocessor()
+    frames, sources = [], set()
+    for path in legacy_files + api_files:
+        if not os.path.exists(path):
+            print(f"Skipping missing data file {path}")
+            continue
+        legacy = path in legacy_files
+        df = preprocessor.load_legacy_data(path) if legacy else preprocessor.load_data(path)
+        df['Team'] = df['Team'].astype(str).map(nickname)
+        frames.append(df[['Team', 'Year', 'Conference', 'Playoffs'] + preprocessor.features])
+        sources.add(legacy)
+
+    data = pd.concat(frames, ignore_index=True)
+    if len(sources) > 1:
+        data = data[['Team', 'Year', 'Conference', 'Playoffs'] + SHARED_FEATURES]
+    return data.drop_duplicates(['Team', 'Year'], keep='last').sort_values(['Year', 'Team']).reset_index(drop=True)
+
+
+def backtest_features(df):
+    """The model features present in a load_seasons table"""
+    return [feature for feature in DataPreprocessor().features if feature in df]
+
+
+@memory.cache
+def preprocess_season(season_df):
+    """Quantile-transform one season's features (cached on disk by content)
+
+    Seasons are transformed independently, as in DataPreprocessor.preprocess, so a
+    season's fold never sees later seasons and can be reused by every split.
+    """
+    features = backtest_features(season_df)
+    season_df = season_df.copy()
+    season_df[features] = DataPreprocessor()._transform_features(season_df[features])
+    return season_df
+
+
+def score(y_true, probabilities):
+    """Accuracy, log loss and Brier score of playoff probabilities"""
+    probabilities = np.clip(probabilities, 1e-15, 1 - 1e-15)
+    return {
+        'accuracy': float(accuracy_score(y_true, probabilities > 0.5)),
+        'log_loss': float(log_loss(y_true, probabilities, labels=[0, 1])),
+        'brier': float(brier_score_loss(y_true, probabilities))
+    }
+
+
+def backtest_season(processed, season):
+    """Train on every earlier season and score one season, per conference like ModelTrainer
+
+    Returns:
+        (rows of per-model metrics, seconds spent training, seconds spent scoring)
+    """
+    features = backtest_features(processed)
+    specs = ModelTrainer().models
+    train_time = score_time = 0.0
+    probabilities = {name: [] for name in list(specs) + ['ensemble']}
+    targets = []
+
+    for conf in ['East', 'West']:
+        conf_df = processed[processed['Conference'] == conf]
+        train = conf_df[conf_df['Year'] < season]
+        test = conf_df[conf_df['Year'] == season]
+        if test.empty:
+            continue
+
+        start = time.perf_counter()
+        models = {name: clone(model).fit(train[features], train['Playoffs']) for name, model in specs.items()}
+        train_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        conf_probabilities = CompiledScorer.from_models(models).predict_proba(test[features])
+        conf_probabilities['ensemble'] = np.mean(list(conf_probabilities.values()), axis=0)
+        score_time += time.perf_counter() - start
+
+        for name, values in conf_probabilities.items():
+            probabilities[name].append(values)
+        targets.append(test['Playoffs'].to_numpy())
+
+    y_true = np.concatenate(targets)
+    rows = [dict(season=int(season), model=name, n_teams=int(len(y_true)),
+                 **score(y_true, np.concatenate(values)))
+            for name, values in probabilities.items()]
+    return rows, train_time, score_time
+
+
+def run_backtest(data=None, n_jobs=-1, min_train_seasons=MIN_TRAIN_SEASONS, seasons=None):
+    """Walk forward over every season, training on all earlier seasons
+
+    Args:
+        data: Output of load_seasons (loaded when None)
+        n_jobs: Seasons backtested in parallel (joblib convention, -1 for all cores)
+        min_train_seasons: Seasons of history required before scoring
+        seasons: Optional subset of seasons to score
+
+    Returns:
+        Report dictionary (see write_report)
+    """
+    timings = {}
+    start = time.perf_counter()
+    if data is None:
+        data = load_seasons()
+    timings['load'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    processed = pd.concat([preprocess_season(season_df) for _, season_df in data.groupby('Year')],
+                          ignore_index=True)
+    timings['preprocess'] = time.perf_counter() - start
+
+    all_seasons = sorted(processed['Year'].unique())
+    scored = [s for s in all_seasons[min_train_seasons:] if seasons is None or s in seasons]
+
+    start = time.perf_counter()
+    results = Parallel(n_jobs=n_jobs)(delayed(backtest_season)(processed, season) for season in scored)
+    timings['backtest'] = time.perf_counter() - start
+    # Training and scoring time summed over all seasons (and so over workers)
+    timings['train'] = sum(train_time for _, train_time, _ in results)
+    timings['score'] = sum(score_time for _, _, score_time in results)
+
+    per_season = [row for rows, _, _ in results for row in rows]
+    summary = pd.DataFrame(per_season).groupby('model')[['accuracy', 'log_loss', 'brier']].mean()
+    return {
+        'seasons': per_season,
+        'summary': {model: {metric: float(value) for metric, value in row.items()}
+                    for model, row in summary.iterrows()},
+        'timings': {stage: round(seconds, 3) for stage, seconds in timings.items()}
+    }
+
+
+def write_report(report, path=REPORT_PATH):
+    """Write the report as stable JSON (sorted keys, rounded metrics)"""
+    def rounded(value):
+        if isinstance(value, float):
+            return round(value, 6)
+        if isinstance(value, dict):
+            return {key: rounded(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [rounded(item) for item in value]
+        return value
+
+    with open(path, 'w') as f:
+        json.dump(rounded(report), f, indent=2, sort_keys=True)
+    print(f"Report saved to '{path}'")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the playoff classifiers")
+    parser.add_argument('--jobs', type=int, default=-1, help="Seasons to backtest in parallel")
+    parser.add_argument('--min-train-seasons', type=int, default=MIN_TRAIN_SEASONS)
+    parser.add_argument('--output', default=REPORT_PATH)
+    args = parser.parse_args(argv)
+
+    report = run_backtest(n_jobs=args.jobs, min_train_seasons=args.min_train_seasons)
+    for model, metrics in report['summary'].items():
+        print(f"{model:>14}: accuracy {metrics['accuracy']:.4f}, "
+              f"log loss {metrics['log_loss']:.4f}, Brier {metrics['brier']:.4f}")
+    print("Wall time per stage: " + ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in report['timings'].items()))
+    write_report(report, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import warnings
+import platform
+import tempfile
+import subprocess
+import contextlib
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+HISTORY_PATH = os.path.join("NBA_data", "benchmark_history.json")
+FIXTURE_TEAMS = os.path.join("NBA_data", "benchmark_teams.csv")
+FIXTURE_SEASONS = os.path.join("NBA_data", "NBA_data_all_80-19.csv")
+
+# A benchmark fails when its median time exceeds the baseline by more than this
+DEFAULT_THRESHOLD_PCT = 25.0
+
+# Looser limits for benchmarks that are noisier than the rest
+THRESHOLD_PCT = {
+    'visualizer_render': 50.0,
+    'train_models': 40.0,
+}
+
+# Absolute limits in seconds, checked on every run whatever the history says
+BUDGETS = {
+    'startup_predict': 0.8,
+    'startup_simulate': 0.8,
+}
+
+# Number of recent history entries whose median forms the baseline
+BASELINE_RUNS = 5
+
+
+def _fixture_conferences():
+    """East and West tables of the recorded simulation input, sorted by record"""
+    teams = pd.read_csv(FIXTURE_TEAMS)
+    east = teams[teams['Conference'] == 'East'].sort_values('W/L%', ascending=False).reset_index(drop=True)
+    west = teams[teams['Conference'] == 'West'].sort_values('W/L%', ascending=False).reset_index(drop=True)
+    return east, west
+
+
+def _loaded_seasons(workdir):
+    """Write the bundled seasons in load_data's layout and return (path, preprocessor)"""
+    from preprocess_data import DataPreprocessor
+
+    preprocessor = DataPreprocessor()
+    path = os.path.join(workdir, "seasons.csv")
+    if not os.path.exists(path):
+        legacy = preprocessor.load_legacy_data(FIXTURE_SEASONS)
+        legacy.drop(columns=['Playoffs']).to_csv(path, index=False)
+    return path, preprocessor
+
+
+def bench_simulate_series(workdir, n_simulations):
+    from playoff_simulator import PlayoffSimulator
+
+    simulator = PlayoffSimulator(n_simulations)
+    east, _ = _fixture_conferences()
+    team1, team2 = east.iloc[0], east.iloc[7]
+
+    def run():
+        np.random.seed(0)
+        for _ in range(simulator.n_simulations):
+            simulator.simulate_series(team1, team2, True)
+    return run
+
+
+def bench_simulate_playoffs(workdir, n_simulations):
+    from playoff_simulator import PlayoffSimulator
+
+    simulator = PlayoffSimulator(n_simulations)
+    east, west = _fixture_conferences()
+
+    def run():
+        np.random.seed(0)
+        simulator.simulate_playoffs(east.copy(), west.copy())
+    return run
+
+
+def bench_solve_playoffs(workdir):
+    from playoff_simulator import PlayoffSimulator
+
+    simulator = PlayoffSimulator()
+    east, west = _fixture_conferences()
+    return lambda: simulator.solve_playoffs(east, west)
+
+
+def bench_stream_simulations(workdir, n_simulations):
+    from playoff_simulator import PlayoffSimulator
+    from trial_pipeline import stream_simulations
+
+    simulator = PlayoffSimulator()
+    east, west = _fixture_conferences()
+    return lambda: stream_simulations(simulator, east, west, n_simulations, seed=0, report_every=None)
+
+
+def bench_load_data(workdir):
+    path, preprocessor = _loaded_seasons(workdir)
+    return lambda: preprocessor.load_data(path)
+
+
+def bench_preprocess(workdir):
+    path, preprocessor = _loaded_seasons(workdir)
+    data = preprocessor.load_data(path)
+    return lambda: preprocessor.preprocess(data)
+
+
+def _training_split(workdir):
+    from train_models import ModelTrainer
+
+    path, preprocessor = _loaded_seasons(workdir)
+    processed = preprocessor.preprocess(preprocessor.load_data(path))
+    east, _ = preprocessor.split_conferences(processed)
+    return ModelTrainer(), preprocessor.prepare_train_test(east, test_year=2019)
+
+
+def bench_train_models(workdir):
+    trainer, (X_train, _, y_train, _) = _training_split(workdir)
+    return lambda: trainer.train_models(X_train, y_train, 'East')
+
+
+def bench_predict_playoffs(workdir):
+    trainer, (X_train, X_test, y_train, _) = _training_split(workdir)
+    trainer.train_models(X_train, y_train, 'East')
+    return lambda: trainer.predict_playoffs(X_test, 'East')
+
+
+def bench_compiled_predict(workdir):
+    from compiled_scorer import CompiledScorer
+
+    trainer, (X_train, X_test, y_train, _) = _training_split(workdir)
+    scorer = CompiledScorer.from_models(trainer.train_models(X_train, y_train, 'East'))
+    return lambda: scorer.predict_playoffs(X_test)
+
+
+def bench_visualizer_render(workdir):
+    from generate_visualizations import Visualizer
+
+    visualizer = Visualizer()
+    visualizer.output_dir = workdir
+    visualizer.render_cache_path = os.path.join(workdir, ".render_cache.json")
+    east, _ = _fixture_conferences()
+    rng = np.random.default_rng(0)
+    probabilities = {name: rng.random(len(east)) for name in ['logistic', 'random_forest', 'svm']}
+
+    def run():
+        # Drop the render cache so the chart is drawn every time
+        if os.path.exists(visualizer.render_cache_path):
+            os.remove(visualizer.render_cache_path)
+        visualizer.plot_prediction_probabilities(probabilities, east['Team'].values, 'East')
+    return run
+
+
+def bench_startup(workdir, command):
+    """Fresh interpreter importing everything a cli.py command needs before it starts working"""
+    code = f"import cli; cli.load({command!r})"
+    root = os.path.dirname(os.path.abspath(__file__))
+    return lambda: subprocess.run([sys.executable, '-c', code], cwd=root, check=True)
+
+
+# name -> (setup function, keyword arguments, repeats)
+BENCHMARKS = {
+    'simulate_series_1000': (bench_simulate_series, {'n_simulations': 1000}, 5),
+    'simulate_series_10000': (bench_simulate_series, {'n_simulations': 10000}, 3),
+    'simulate_playoffs_100': (bench_simulate_playoffs, {'n_simulations': 100}, 5),
+    'simulate_playoffs_1000': (bench_simulate_playoffs, {'n_simulations': 1000}, 3),
+    'solve_playoffs': (bench_solve_playoffs, {}, 20),
+    'stream_simulations_1000000': (bench_stream_simulations, {'n_simulations': 1000000}, 3),
+    'load_data': (bench_load_data, {}, 10),
+    'preprocess': (bench_preprocess, {}, 5),
+    'train_models': (bench_train_models, {}, 3),
+    'predict_playoffs': (bench_predict_playoffs, {}, 10),
+    'compiled_predict': (bench_compiled_predict, {}, 20),
+    'visualizer_render': (bench_visualizer_render, {}, 3),
+    'startup_predict': (bench_startup, {'command': 'predict'}, 5),
+    'startup_simulate': (bench_startup, {'command': 'simulate'}, 5),
+}
+
+
+def run_benchmark(name, workdir, repeats=None):
+    """Time one benchmark, with its setup and output kept out of the measurement
+
+    Returns:
+        Dictionary with the median, minimum and number of timed runs in seconds
+    """
+    setup, kwargs, default_repeats = BENCHMARKS[name]
+    repeats = repeats or default_repeats
+    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        run = setup(workdir, **kwargs)
+        run()  # Warm-up: imports, caches and first-call overhead
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+    return {'median': float(np.median(times)), 'min': float(np.min(times)), 'repeats': repeats}
+
+
+def load_history(path=HISTORY_PATH):
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            return json.load(f)
+    return []
+
+
+def save_history(history, path=HISTORY_PATH):
+    with open(path, 'w') as f:
+        json.dump(history, f, indent=2, sort_keys=True)
+
+
+def find_regressions(results, history, default_threshold=DEFAULT_THRESHOLD_PCT, thresholds=THRESHOLD_PCT,
+                     baseline_runs=BASELINE_RUNS):
+    """Benchmarks whose median time grew past their threshold over the baseline
+
+    The baseline for each benchmark is the median of its medians over the last
+    baseline_runs history entries that include it.
+
+    Returns:
+        List of dictionaries with the benchmark, baseline, current time and change
+    """
+    regressions = []
+    for name, result in results.items():
+        past = [entry['results'][name]['median'] for entry in history if name in entry['results']]
+        if not past:
+            continue
+        baseline = float(np.median(past[-baseline_runs:]))
+        change = 100.0 * (result['median'] - baseline) / baseline
+        limit = thresholds.get(name, default_threshold)
+        if change > limit:
+            regressions.append({'benchmark': name, 'baseline': baseline, 'current': result['median'],
+                                'change_pct': change, 'threshold_pct': limit})
+    return regressions
+
+
+def over_budget(results, budgets=BUDGETS):
+    """Benchmarks whose median time is above their absolute budget"""
+    return [{'benchmark': name, 'current': results[name]['median'], 'budget': budget}
+            for name, budget in budgets.items() if name in results and results[name]['median'] > budget]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the project's hot paths on bundled fixture data")
+    parser.add_argument('benchmarks', nargs='*', help="Benchmarks to run (default: all)")
+    parser.add_argument('--repeat', type=int, default=None, help="Timed runs per benchmark")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD_PCT,
+                        help="Allowed slowdown in percent for benchmarks without their own threshold")
+    parser.add_argument('--history', default=HISTORY_PATH)
+    parser.add_argument('--no-save', action='store_true', help="Don't append this run to the history")
+    parser.add_argument('--list', action='store_true', help="List the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+    names = args.benchmarks or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in names:
+            results[name] = run_benchmark(name, workdir, args.repeat)
+            print(f"{name:>28}: {results[name]['median'] * 1000:10.2f} ms "
+                  f"(min {results[name]['min'] * 1000:.2f} ms over {results[name]['repeats']} runs)")
+
+    history = load_history(args.history)
+    regressions = find_regressions(results, history, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression['benchmark']}: {regression['current'] * 1000:.2f} ms vs baseline "
+              f"{regression['baseline'] * 1000:.2f} ms (+{regression['change_pct']:.1f}%, "
+              f"limit {regression['threshold_pct']:.0f}%)")
+    overruns = over_budget(results)
+    for overrun in overruns:
+        print(f"OVER BUDGET {overrun['benchmark']}: {overrun['current'] * 1000:.2f} ms "
+              f"(budget {overrun['budget'] * 1000:.0f} ms)")
+
+    if not args.no_save:
+        history.append({
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'results': results
+        })
+        save_history(history, args.history)
+        print(f"Results appended to '{args.history}'")
+
+    return 1 if regressions or overruns else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+import os
+import json
+import hashlib
+
+BRACKET_DIR = os.path.join("Images", "bracket")
+MANIFEST_NAME = "bracket.json"
+MATCHUPS_DIR = "matchups"
+
+
+def _compact(data):
+    return json.dumps(data, separators=(',', ':'), sort_keys=True)
+
+
+def matchup_key(round_index, matchup_index):
+    """Stable identifier of a bracket cell, shared with index.html"""
+    return f"r{round_index}-m{matchup_index}"
+
+
+def bracket_cells(simulation_results):
+    """Flatten a bracket into {cell key: matchup or None} with page-relative logo paths"""
+    cells = {}
+    for round_index, round_data in enumerate(simulation_results["rounds"]):
+        for matchup_index, matchup in enumerate(round_data["matchups"]):
+            key = matchup_key(round_index, matchup_index)
+            if not matchup["team1"] or not matchup["team2"]:
+                cells[key] = None
+                continue
+
+            # The simulator writes logo paths with a leading slash
+            cells[key] = {
+                slot: {**matchup[slot], "logo": matchup[slot]["logo"].lstrip('/')}
+                for slot in ("team1", "team2")
+            }
+    return cells
+
+
+class BracketWriter:
+    """Write bracket data as a small manifest plus one content-addressed file per matchup
+
+    The manifest (bracket.json) is the only file that changes between refreshes; it
+    lists the matchup files for each round. Matchup files are named after a hash of
+    their contents, so they never change once written and can be cached forever, and
+    a refresh only writes the matchups whose odds actually moved.
+    """
+
+    def __init__(self, output_dir=BRACKET_DIR):
+        self.output_dir = output_dir
+        self.manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+
+    def load_manifest(self):
+        """Load the current manifest, or None if nothing has been written yet"""
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)
+        return None
+
+    def matchup_file(self, round_index, matchup_index, matchup):
+        """Relative path of the content-addressed file for a matchup"""
+        digest = hashlib.sha256(_compact(matchup).encode()).hexdigest()[:12]
+        return f"{MATCHUPS_DIR}/{matchup_key(round_index, matchup_index)}.{digest}.json"
+
+    def write(self, simulation_results):
+        """Write the bracket, only touching matchups that changed
+
+        Args:
+            simulation_results: Bracket dictionary from PlayoffSimulator.simulate_playoffs
+
+        Returns:
+            Dictionary with the manifest version and counts of written/unchanged matchups
+        """
+        os.makedirs(os.path.join(self.output_dir, MATCHUPS_DIR), exist_ok=True)
+        previous = self.load_manifest()
+
+        cells = bracket_cells(simulation_results)
+        written = 0
+        unchanged = 0
+        rounds = []
+        for round_index, round_data in enumerate(simulation_results["rounds"]):
+            files = []
+            for matchup_index in range(len(round_data["matchups"])):
+                matchup = cells[matchup_key(round_index, matchup_index)]
+                if matchup is None:
+                    files.append(None)
+                    continue
+
+                relative_path = self.matchup_file(round_index, matchup_index, matchup)
+                path = os.path.join(self.output_dir, relative_path)
+                if os.path.exists(path):
+                    unchanged += 1
+                else:
+                    with open(path, 'w') as f:
+                        f.write(_compact(matchup))
+                    written += 1
+                files.append(relative_path)
+            rounds.append({"name": round_data["name"], "matchups": files})
+
+        manifest = {"title": simulation_results.get("title", ""), "rounds": rounds}
+        manifest["version"] = hashlib.sha256(_compact(manifest).encode()).hexdigest()[:12]
+
+        # Replace the manifest atomically so readers never see a partial file
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(_compact(manifest))
+        os.replace(tmp_path, self.manifest_path)
+
+        # Keep the previous version's files for pages that are mid-refresh
+        keep = self._referenced(manifest) | self._referenced(previous)
+        self._prune(keep)
+
+        print(f"Bracket {manifest['version']}: {written} matchups written, {unchanged} unchanged")
+        return {"version": manifest["version"], "written": written, "unchanged": unchanged}
+
+    @staticmethod
+    def _referenced(manifest):
+        if not manifest:
+            return set()
+        return {os.path.basename(path) for round_data in manifest["rounds"]
+                for path in round_data["matchups"] if path}
+
+    def _prune(self, keep):
+        matchups_dir = os.path.join(self.output_dir, MATCHUPS_DIR)
+        for name in os.listdir(matchups_dir):
+            if name.endswith('.json') and name not in keep:
+                os.remove(os.path.join(matchups_dir, name))
+
+
+if __name__ == "__main__":
+    with open("NBA_data/playoff_simulations.json", "r") as f:
+        BracketWriter().write(json.load(f))
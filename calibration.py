@@ -0,0 +1,352 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from joblib import Memory, Parallel, delayed
+
+from backtest import load_seasons, write_report
+from game_log import PLAYOFFS, load_game_log, pair_games
+from playoff_simulator import HOME_COURT_PATTERN, PlayoffSimulator
+from ratings import MasseyRatings
+
+CACHE_DIR = os.path.join("NBA_data", "cache", "calibration")
+REPORT_PATH = os.path.join("NBA_data", "calibration_report.json")
+
+# First season with a 16-team bracket, and the first with a play-in tournament
+FIRST_BRACKET_SEASON = 1984
+FIRST_PLAY_IN_SEASON = 2021
+
+# Best-of-five first rounds (2-2-1) until 2002, and 2-3-2 Finals from 1985 to 2013
+LAST_BEST_OF_FIVE_SEASON = 2002
+BEST_OF_FIVE_PATTERN = [1, 1, 0, 0, 1]
+FINALS_2_3_2_SEASONS = range(1985, 2014)
+FINALS_2_3_2_PATTERN = [1, 1, 0, 0, 0, 1, 1]
+
+# Division winners were guaranteed the top two seeds with four divisions, the top
+# three with six, and from 2007 a top-four seed alongside the best other team;
+# from 2016 teams are seeded by record alone
+FIRST_TOP_FOUR_SEASON = 2007
+FIRST_RECORD_SEEDING_SEASON = 2016
+
+# Division alignment from the season each took effect, by nickname
+DIVISIONS = {
+    1984: {'Atlantic': ['Celtics', '76ers', 'Knicks', 'Nets', 'Bullets'],
+           'Central': ['Bucks', 'Pistons', 'Bulls', 'Cavaliers', 'Hawks', 'Pacers'],
+           'Midwest': ['Jazz', 'Mavericks', 'Nuggets', 'Spurs', 'Rockets', 'Kings'],
+           'Pacific': ['Lakers', 'Trail Blazers', 'SuperSonics', 'Suns', 'Warriors', 'Clippers']},
+    1989: {'Atlantic': ['Celtics', '76ers', 'Knicks', 'Nets', 'Bullets', 'Hornets'],
+           'Central': ['Bucks', 'Pistons', 'Bulls', 'Cavaliers', 'Hawks', 'Pacers'],
+           'Midwest': ['Jazz', 'Mavericks', 'Nuggets', 'Spurs', 'Rockets', 'Heat'],
+           'Pacific': ['Lakers', 'Trail Blazers', 'SuperSonics', 'Suns', 'Warriors', 'Clippers', 'Kings']},
+    1990: {'Atlantic': ['Celtics', '76ers', 'Knicks', 'Nets', 'Bullets', 'Heat'],
+           'Central': ['Bucks', 'Pistons', 'Bulls', 'Cavaliers', 'Hawks', 'Pacers', 'Magic'],
+           'Midwest': ['Jazz', 'Mavericks', 'Nuggets', 'Spurs', 'Rockets', 'Hornets', 'Timberwolves'],
+           'Pacific': ['Lakers', 'Trail Blazers', 'SuperSonics', 'Suns', 'Warriors', 'Clippers', 'Kings']},
+    1991: {'Atlantic': ['Celtics', '76ers', 'Knicks', 'Nets', 'Bullets', 'Heat'],
+           'Central': ['Bucks', 'Pistons', 'Bulls', 'Cavaliers', 'Hawks', 'Pacers', 'Hornets'],
+           'Midwest': ['Jazz', 'Mavericks', 'Nuggets', 'Spurs', 'Rockets', 'Magic', 'Timberwolves'],
+           'Pacific': ['Lakers', 'Trail Blazers', 'SuperSonics', 'Suns', 'Warriors', 'Clippers', 'Kings']},
+    1992: {'Atlantic': ['Celtics', '76ers', 'Knicks', 'Nets', 'Bullets', 'Wizards', 'Heat', 'Magic'],
+           'Central': ['Bucks', 'Pistons', 'Bulls', 'Cavaliers', 'Hawks', 'Pacers', 'Hornets', 'Raptors'],
+           'Midwest': ['Jazz', 'Mavericks', 'Nuggets', 'Spurs', 'Rockets', 'Timberwolves', 'Grizzlies'],
+           'Pacific': ['Lakers', 'Trail Blazers', 'SuperSonics', 'Suns', 'Warriors', 'Clippers', 'Kings']},
+    2005: {'Atlantic': ['Celtics', '76ers', 'Knicks', 'Nets', 'Raptors'],
+           'Central': ['Bucks', 'Pistons', 'Bulls', 'Cavaliers', 'Pacers'],
+           'Southeast': ['Hawks', 'Heat', 'Magic', 'Wizards', 'Bobcats', 'Hornets'],
+           'Northwest': ['Jazz', 'Nuggets', 'Timberwolves', 'Trail Blazers', 'SuperSonics', 'Thunder'],
+           'Pacific': ['Lakers', 'Suns', 'Warriors', 'Clippers', 'Kings'],
+           'Southwest': ['Mavericks', 'Spurs', 'Rockets', 'Grizzlies', 'Hornets', 'Pelicans']},
+}
+
+# Conference of each division, to tell apart the New Orleans and Charlotte Hornets
+DIVISION_CONFERENCES = {'Atlantic': 'East', 'Central': 'East', 'Southeast': 'East',
+                        'Midwest': 'West', 'Pacific': 'West', 'Northwest': 'West', 'Southwest': 'West'}
+
+# Points of average margin per unit of W/L%, for seasons without a cached game log
+# (each point of margin is worth about 2.7 wins over 82 games)
+MARGIN_PER_WIN_PCT = 30.0
+
+N_RELIABILITY_BINS = 10
+
+# NBA champions by season, by nickname
+CHAMPIONS = {
+    1980: 'Lakers', 1981: 'Celtics', 1982: 'Lakers', 1983: '76ers', 1984: 'Celtics',
+    1985: 'Lakers', 1986: 'Celtics', 1987: 'Lakers', 1988: 'Lakers', 1989: 'Pistons',
+    1990: 'Pistons', 1991: 'Bulls', 1992: 'Bulls', 1993: 'Bulls', 1994: 'Rockets',
+    1995: 'Rockets', 1996: 'Bulls', 1997: 'Bulls', 1998: 'Bulls', 1999: 'Spurs',
+    2000: 'Lakers', 2001: 'Lakers', 2002: 'Lakers', 2003: 'Spurs', 2004: 'Pistons',
+    2005: 'Spurs', 2006: 'Heat', 2007: 'Spurs', 2008: 'Celtics', 2009: 'Lakers',
+    2010: 'Lakers', 2011: 'Mavericks', 2012: 'Heat', 2013: 'Heat', 2014: 'Spurs',
+    2015: 'Warriors', 2016: 'Cavaliers', 2017: 'Warriors', 2018: 'Warriors', 2019: 'Raptors',
+    2020: 'Lakers', 2021: 'Bucks', 2022: 'Warriors', 2023: 'Nuggets', 2024: 'Celtics',
+    2025: 'Thunder'
+}
+
+memory = Memory(CACHE_DIR, verbose=0)
+
+
+def matches(team, nickname):
+    """Whether a full team name (e.g. "Los Angeles Lakers") is the given nickname"""
+    return team == nickname or team.endswith(' ' + nickname)
+
+
+def round_patterns(season):
+    """Series format of each round in a season, for PlayoffSimulator.solve_playoffs"""
+    first_round = BEST_OF_FIVE_PATTERN if season <= LAST_BEST_OF_FIVE_SEASON else HOME_COURT_PATTERN
+    finals = FINALS_2_3_2_PATTERN if season in FINALS_2_3_2_SEASONS else HOME_COURT_PATTERN
+    return [first_round, HOME_COURT_PATTERN, HOME_COURT_PATTERN, finals]
+
+
+def division_of(team, conference, season):
+    """Division of a team in a season, or None if it isn't in the alignment"""
+    alignment = DIVISIONS[max(start for start in DIVISIONS if start <= season)]
+    return next((division for division, members in alignment.items()
+                 if team in members and DIVISION_CONFERENCES[division] == conference), None)
+
+
+def seed_playoff_teams(playoff_teams, season):
+    """Order a conference's playoff teams by seed under the season's division rules
+
+    Args:
+        playoff_teams: The conference's playoff teams sorted by record
+
+    Returns:
+        The teams in seed order, or None if a team's division is unknown
+    """
+    if season >= FIRST_RECORD_SEEDING_SEASON:
+        return playoff_teams
+    conference = playoff_teams['Conference'].iloc[0]
+    divisions = [division_of(team, conference, season) for team in playoff_teams['Team']]
+    if None in divisions:
+        return None
+
+    # The first team listed from each division has its best record
+    winner = ~pd.Series(divisions, index=playoff_teams.index).duplicated()
+    if season >= FIRST_TOP_FOUR_SEASON:
+        # The best other team joins the division winners in the top four
+        winner[winner[~winner].index[0]] = True
+    top = playoff_teams[winner.to_numpy()]
+    return pd.concat([top, playoff_teams.drop(top.index)])
+
+
+def season_bracket(season_df):
+    """Conference tables and fixed seeds for a past season
+
+    Teams are seeded by record among the teams that made the playoffs, after the
+    division winners where the season guaranteed them a top seed; before the
+    play-in era the 7th and 8th seeds are passed as settled play-in results.
+
+    Returns:
+        (east_df, west_df, play_in_results), or None if the season's playoff teams
+        don't fit the 16-team bracket or a team's division is unknown
+    """
+    season = int(season_df['Year'].iloc[0])
+    if season < FIRST_BRACKET_SEASON:
+        return None
+
+    tables, play_in_results = {}, {}
+    for conf in ['East', 'West']:
+        conf_df = season_df[season_df['Conference'] == conf].sort_values('W/L%', ascending=False)
+        if season < FIRST_PLAY_IN_SEASON:
+            playoff_teams = seed_playoff_teams(conf_df[conf_df['Playoffs'] == 1], season)
+            if playoff_teams is None or len(playoff_teams) != 8:
+                return None
+            conf_df = pd.concat([playoff_teams, conf_df[conf_df['Playoffs'] == 0]])
+            play_in_results[conf] = (conf_df['Team'].iloc[6], conf_df['Team'].iloc[7])
+        if len(conf_df) < 10:
+            return None
+        tables[conf] = conf_df.reset_index(drop=True)
+    return tables['East'], tables['West'], play_in_results
+
+
+def season_ratings(season_df, games=None):
+    """NET_RATING for each team: SRS from the season's game log, else from W/L%"""
+    if games is not None:
+        srs = MasseyRatings(ridge=0.0).fit(pair_games(games)).ratings
+        by_nickname = {team: next((rating for nickname, rating in srs.items() if matches(team, nickname)), None)
+                       for team in season_df['Team']}
+        if all(rating is not None for rating in by_nickname.values()):
+            return season_df['Team'].map(by_nickname).astype(float)
+    return (season_df['W/L%'] - 0.5) * MARGIN_PER_WIN_PCT
+
+
+@memory.cache
+def solve_season(season_df, games, home_court_advantage, game_sd, rating_scale):
+    """Exact title odds and series probabilities for one past season (cached on disk)
+
+    The cache is keyed on the season's table, its raw game log (None when not
+    cached) and the model parameters, so only seasons where one of those changed
+    are recomputed.
+
+    Returns:
+        (odds DataFrame from solve_playoffs, series win matrix by team, actual
+        (winner, loser) series from the game log) or None
+    """
+    season_df = season_df.copy()
+    season_df['NET_RATING'] = season_ratings(season_df, games)
+    bracket = season_bracket(season_df)
+    if bracket is None:
+        return None
+    east_df, west_df, play_in_results = bracket
+
+    simulator = PlayoffSimulator()
+    simulator.home_court_advantage, simulator.game_sd, simulator.rating_scale = home_court_advantage, game_sd, rating_scale
+    season = int(season_df['Year'].iloc[0])
+    patterns = round_patterns(season)
+    odds = simulator.solve_playoffs(east_df, west_df, play_in_results=play_in_results, round_patterns=patterns)
+
+    # Each pair's series in the format of the round they would meet in
+    field = simulator._playoff_field(east_df, west_df)
+    by_round = np.stack(simulator.round_series_matrices(field, simulator.bracket_home_win(field),
+                                                        round_patterns=patterns))
+    n_teams = len(field['field'])
+    series = by_round[simulator.meeting_rounds(field), np.arange(n_teams)[:, None], np.arange(n_teams)[None, :]]
+    teams = list(field['field']['Team'])
+    return odds, pd.DataFrame(series, index=teams, columns=teams), actual_series(games, teams)
+
+
+def actual_series(games, teams):
+    """Winner and loser of every playoff series in a raw game log, if any"""
+    if games is None:
+        return []
+    games = pair_games(games, season_types=(PLAYOFFS,))
+    if games.empty:
+        return []
+
+    names = {nickname: next((team for team in teams if matches(team, nickname)), None)
+             for nickname in pd.unique(games[['HOME', 'AWAY']].to_numpy().ravel())}
+    winners = np.where(games['HOME_MARGIN'] > 0, games['HOME'], games['AWAY'])
+    pairs = games[['HOME', 'AWAY']].apply(lambda row: tuple(sorted(row)), axis=1)
+
+    results = []
+    for pair, won in pd.Series(winners, index=games.index).groupby(pairs):
+        counts = won.value_counts()
+        winner, loser = counts.index[0], [team for team in pair if team != counts.index[0]][0]
+        if names.get(winner) and names.get(loser):
+            results.append((names[winner], names[loser]))
+    return results
+
+
+def reliability(predicted, observed, n_bins=N_RELIABILITY_BINS):
+    """Mean prediction, observed frequency and count in equal-width probability bins"""
+    predicted, observed = np.asarray(predicted, dtype=float), np.asarray(observed, dtype=float)
+    bins = np.minimum((predicted * n_bins).astype(int), n_bins - 1)
+    return [{'bin': f"{b / n_bins:.1f}-{(b + 1) / n_bins:.1f}", 'count': int(np.sum(bins == b)),
+             'mean_predicted': float(predicted[bins == b].mean()), 'observed': float(observed[bins == b].mean())}
+            for b in range(n_bins) if np.any(bins == b)]
+
+
+def scores(predicted, observed):
+    """Brier score and log loss of binary predictions"""
+    predicted = np.clip(np.asarray(predicted, dtype=float), 1e-15, 1 - 1e-15)
+    observed = np.asarray(observed, dtype=float)
+    return {
+        'n': int(len(predicted)),
+        'brier': float(np.mean((predicted - observed) ** 2)),
+        'log_loss': float(-np.mean(observed * np.log(predicted) + (1 - observed) * np.log(1 - predicted)))
+    }
+
+
+def run_calibration(data=None, simulator=None, n_jobs=-1):
+    """Score the bracket engine's series and title odds against past postseasons
+
+    Args:
+        data: Output of backtest.load_seasons (loaded when None)
+        simulator: Simulator whose parameters are scored (defaults to PlayoffSimulator())
+        n_jobs: Seasons solved in parallel (joblib convention)
+
+    Returns:
+        Report dictionary with per-season title results, per-series predictions,
+        summary scores, reliability bins and wall time per stage
+    """
+    simulator = simulator or PlayoffSimulator()
+    timings = {}
+    start = time.perf_counter()
+    if data is None:
+        data = load_seasons()
+    timings['load'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    seasons = [(int(season), season_df.reset_index(drop=True)) for season, season_df in data.groupby('Year')
+               if season >= FIRST_BRACKET_SEASON]
+    solved = Parallel(n_jobs=n_jobs)(
+        delayed(solve_season)(season_df, load_game_log(season), simulator.home_court_advantage,
+                              simulator.game_sd, simulator.rating_scale)
+        for season, season_df in seasons)
+    timings['solve'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    title_rows, series_rows = [], []
+    title_predicted, title_observed = [], []
+    for (season, _), result in zip(seasons, solved):
+        if result is None or season not in CHAMPIONS:
+            continue
+        odds, series, results = result
+        champion = odds['Team'].map(lambda team: matches(team, CHAMPIONS[season])).to_numpy()
+        if not champion.any():
+            continue
+
+        title_predicted.extend(odds['champion'])
+        title_observed.extend(champion.astype(float))
+        title_rows.append({
+            'season': season,
+            'champion': odds.loc[champion, 'Team'].iloc[0],
+            'champion_probability': float(odds.loc[champion, 'champion'].iloc[0]),
+            'favourite': odds.loc[odds['champion'].idxmax(), 'Team'],
+            'brier': float(np.sum((odds['champion'].to_numpy() - champion) ** 2)),
+            'log_loss': float(-np.log(max(odds.loc[champion, 'champion'].iloc[0], 1e-15)))
+        })
+
+        for winner, loser in results:
+            series_rows.append({'season': season, 'winner': winner, 'loser': loser,
+                                'winner_probability': float(series.at[winner, loser])})
+    timings['score'] = time.perf_counter() - start
+
+    # Series are scored from the favourite's side so the bins cover the whole range
+    series_predicted = [max(row['winner_probability'], 1 - row['winner_probability']) for row in series_rows]
+    series_observed = [float(row['winner_probability'] >= 0.5) for row in series_rows]
+
+    summary = {'title': scores(title_predicted, title_observed)}
+    summary['title']['mean_champion_probability'] = float(np.mean([row['champion_probability'] for row in title_rows]))
+    if series_rows:
+        summary['series'] = scores(series_predicted, series_observed)
+
+    return {
+        'parameters': {'home_court_advantage': simulator.home_court_advantage,
+                       'game_sd': simulator.game_sd, 'rating_scale': simulator.rating_scale},
+        'seasons': title_rows,
+        'series': series_rows,
+        'summary': summary,
+        'reliability': {'title': reliability(title_predicted, title_observed),
+                        'series': reliability(series_predicted, series_observed) if series_rows else []},
+        'timings': {stage: round(seconds, 3) for stage, seconds in timings.items()}
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibration backtest of the bracket engine")
+    parser.add_argument('--jobs', type=int, default=-1, help="Seasons to solve in parallel")
+    parser.add_argument('--home-court', type=float, default=None)
+    parser.add_argument('--game-sd', type=float, default=None)
+    parser.add_argument('--rating-scale', type=float, default=None)
+    parser.add_argument('--output', default=REPORT_PATH)
+    args = parser.parse_args(argv)
+
+    simulator = PlayoffSimulator()
+    for attribute, value in [('home_court_advantage', args.home_court), ('game_sd', args.game_sd),
+                             ('rating_scale', args.rating_scale)]:
+        if value is not None:
+            setattr(simulator, attribute, value)
+
+    report = run_calibration(simulator=simulator, n_jobs=args.jobs)
+    for level, metrics in report['summary'].items():
+        print(f"{level:>6}: {metrics['n']} predictions, Brier {metrics['brier']:.4f}, log loss {metrics['log_loss']:.4f}")
+    print(f"Scored {len(report['seasons'])} postseasons and {len(report['series'])} series")
+    write_report(report, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""Single entry point for the pipeline scripts
+
+    python cli.py <command> [options]
+
+Only the module behind the chosen command is imported, so `predict` and
+`simulate` start without loading matplotlib, seaborn or the NBA API client.
+"""
+import sys
+import argparse
+import importlib
+
+# command -> (module whose main(argv) runs it, arguments passed before the user's, help)
+COMMANDS = {
+    'logos': ('download_logos', [], "Download team logos and pack the sprite sheet"),
+    'scrape': ('nba_scraper_2025', [], "Fetch current and historical season data"),
+    'preprocess': ('preprocess_data', [], "Quantile-transform the historical data"),
+    'train': ('train_models', [], "Train and evaluate the playoff classifiers"),
+    'visualize': ('generate_visualizations', [], "Render the model charts"),
+    'update': ('update_predictions', [], "Refresh the season data and predict the playoff field"),
+    'predict': ('update_predictions', ['--skip-update'], "Predict the playoff field from the data on disk"),
+    'simulate': ('playoff_simulator', [], "Simulate the playoffs from the current standings"),
+    'game-model': ('game_model', [], "Train the game-level win probability model on cached game logs"),
+    'backtest': ('backtest', [], "Walk-forward backtest of the classifiers"),
+    'calibrate': ('calibration', [], "Score the bracket engine against past postseasons"),
+    'benchmark': ('benchmarks', [], "Time the hot paths and check for regressions"),
+    'pipeline': ('run_pipeline', [], "Run every step in order"),
+}
+
+
+def load(command):
+    """Import the module behind a command and return its main function"""
+    module, _, _ = COMMANDS[command]
+    return importlib.import_module(module).main
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="cli.py", description="NBA Playoffs Predictor")
+    parser.add_argument('command', choices=list(COMMANDS), metavar='command',
+                        help="One of: " + ", ".join(COMMANDS))
+    parser.add_argument('args', nargs=argparse.REMAINDER, help="Options for the command (see <command> --help)")
+    parser.epilog = "\n".join(f"  {name:<11} {help_text}" for name, (_, _, help_text) in COMMANDS.items())
+    parser.formatter_class = argparse.RawDescriptionHelpFormatter
+    args = parser.parse_args(argv)
+
+    _, defaults, _ = COMMANDS[args.command]
+    return load(args.command)(defaults + args.args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict
+
+COMPILED_FILE = "compiled.npz"
+
+# libsvm clamps Platt probabilities to this distance from 0 and 1
+SVM_MIN_PROBABILITY = 1e-7
+
+# libsvm's pairwise coupling stops at this error (0.005 / number of classes) or iteration count
+COUPLING_TOLERANCE = 0.005 / 2
+COUPLING_MAX_ITER = 100
+
+
+def compile_logistic(model) -> Dict[str, np.ndarray]:
+    return {'coef': model.coef_[0].astype(np.float64), 'intercept': model.intercept_.astype(np.float64)}
+
+
+def compile_forest(model) -> Dict[str, np.ndarray]:
+    """Every tree's nodes in one set of flat arrays
+
+    Leaves point to themselves, so a batch of samples can descend all trees for
+    max_depth steps without checking which samples have already stopped.
+    """
+    features, thresholds, lefts, rights, leaf_values, roots = [], [], [], [], [], []
+    offset, max_depth = 0, 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        nodes = np.arange(tree.node_count)
+        leaf = tree.children_left == -1
+        value = tree.value[:, 0, :]
+
+        features.append(np.where(leaf, 0, tree.feature))
+        thresholds.append(np.where(leaf, 0.0, tree.threshold))
+        lefts.append(np.where(leaf, nodes, tree.children_left) + offset)
+        rights.append(np.where(leaf, nodes, tree.children_right) + offset)
+        leaf_values.append(value[:, 1] / value.sum(axis=1))
+        roots.append(offset)
+        offset += tree.node_count
+        max_depth = max(max_depth, tree.max_depth)
+
+    return {
+        'feature': np.concatenate(features).astype(np.int32),
+        'threshold': np.concatenate(thresholds),
+        # Row per node: (left child, right child)
+        'children': np.stack([np.concatenate(lefts), np.concatenate(rights)], axis=1).astype(np.int32),
+        'leaf_value': np.concatenate(leaf_values),
+        'roots': np.array(roots, dtype=np.int32),
+        'max_depth': np.array(max_depth)
+    }
+
+
+def compile_svc(model) -> Dict[str, np.ndarray]:
+    """Support vectors and libsvm's own coefficients (sklearn flips their sign for binary problems)"""
+    if model.kernel not in ('rbf', 'linear', 'poly', 'sigmoid'):
+        raise ValueError(f"Can't compile an SVC with a {model.kernel!r} kernel")
+    return {
+        'kernel': np.array(model.kernel),
+        'support_vectors': model.support_vectors_.astype(np.float64),
+        'dual_coef': model._dual_coef_[0].astype(np.float64),
+        'intercept': model._intercept_.astype(np.float64),
+        'gamma': np.array(model._gamma, dtype=np.float64),
+        'coef0': np.array(model.coef0, dtype=np.float64),
+        'degree': np.array(model.degree),
+        'prob_a': model.probA_.astype(np.float64),
+        'prob_b': model.probB_.astype(np.float64)
+    }
+
+
+def pairwise_coupling(first: np.ndarray) -> np.ndarray:
+    """libsvm's multiclass_probability for two classes, run for every sample at once
+
+    libsvm doesn't return the Platt probability of a binary SVC directly; it feeds
+    it through the iterative coupling used for multiclass problems, which stops
+    as soon as the error is under COUPLING_TOLERANCE. The iteration is repeated
+    here step for step so the result matches predict_proba, not just roughly.
+
+    Args:
+        first: Clamped Platt probability of the first class
+
+    Returns:
+        Coupled probability of the first class
+    """
+    second = 1.0 - first
+    q = np.array([[second ** 2, -first * second], [-first * second, first ** 2]])
+    p = np.full((2, len(first)), 0.5)
+    for _ in range(COUPLING_MAX_ITER):
+        qp = np.einsum('ijn,jn->in', q, p)
+        pqp = (p * qp).sum(axis=0)
+        active = np.abs(qp - pqp).max(axis=0) >= COUPLING_TOLERANCE
+        if not active.any():
+            break
+        for t in range(2):
+            diff = np.where(active, (pqp - qp[t]) / q[t, t], 0.0)
+            p[t] += diff
+            pqp = (pqp + diff * (diff * q[t, t] + 2 * qp[t])) / (1 + diff) ** 2
+            qp = (qp + diff * q[t]) / (1 + diff)
+            p /= (1 + diff)
+    return p[0]
+
+
+COMPILERS = {
+    'LogisticRegression': ('logistic', compile_logistic),
+    'RandomForestClassifier': ('forest', compile_forest),
+    'SVC': ('svc', compile_svc),
+}
+
+
+def compile_models(models: Dict) -> Dict[str, np.ndarray]:
+    """Flatten fitted binary classifiers into arrays keyed "<model>/<array>" for np.savez"""
+    arrays = {}
+    for name, model in models.items():
+        estimator_type = type(model).__name__
+        if estimator_type not in COMPILERS:
+            raise ValueError(f"Can't compile {name}: unsupported estimator {estimator_type}")
+        if len(model.classes_) != 2:
+            raise ValueError(f"Can't compile {name}: only binary classifiers are supported")
+        kind, compiler = COMPILERS[estimator_type]
+        arrays[f"{name}/kind"] = np.array(kind)
+        arrays[f"{name}/classes"] = np.asarray(model.classes_)
+        if hasattr(model, 'feature_names_in_'):
+            arrays[f"{name}/features"] = np.asarray(model.feature_names_in_, dtype=str)
+        for key, value in compiler(model).items():
+            arrays[f"{name}/{key}"] = value
+    return arrays
+
+
+def save_compiled(models: Dict, path: str):
+    """Write the compiled form of a conference's models to an .npz file"""
+    np.savez(path, **compile_models(models))
+
+
+class CompiledScorer:
+    """NumPy-only replacement for ModelTrainer.predict_playoffs
+
+    Reproduces each model's predict and predict_proba from the arrays written by
+    save_compiled, without importing sklearn or unpickling estimators.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.models = {}
+        for key, value in arrays.items():
+            name, field = key.split('/', 1)
+            self.models.setdefault(name, {})[field] = value
+
+    @classmethod
+    def load(cls, path: str) -> 'CompiledScorer':
+        with np.load(path, allow_pickle=False) as arrays:
+            return cls({key: arrays[key] for key in arrays.files})
+
+    @classmethod
+    def from_models(cls, models: Dict) -> 'CompiledScorer':
+        return cls(compile_models(models))
+
+    def _matrix(self, X, model) -> np.ndarray:
+        if isinstance(X, pd.DataFrame) and 'features' in model:
+            X = X[list(model['features'])]
+        return np.asarray(X, dtype=np.float64)
+
+    def _logistic(self, model, X):
+        decision = X @ model['coef'] + model['intercept'][0]
+        return 1.0 / (1.0 + np.exp(-decision)), decision > 0
+
+    def _forest(self, model, X):
+        # Trees split on float32 copies of the features, as in sklearn
+        values = X.astype(np.float32).astype(np.float64).ravel()
+        row_starts = (np.arange(len(X), dtype=np.int32) * X.shape[1])[:, None]
+        children = model['children'].ravel()
+        # One row of current nodes per sample, one column per tree
+        nodes = np.repeat(model['roots'][None, :], len(X), axis=0)
+        for _ in range(int(model['max_depth'])):
+            go_right = np.take(values, row_starts + np.take(model['feature'], nodes)) > np.take(model['threshold'], nodes)
+            nodes = np.take(children, 2 * nodes + go_right)
+        probability = np.take(model['leaf_value'], nodes).mean(axis=1)
+        return probability, probability > 1.0 - probability
+
+    def _kernel(self, model, X):
+        support_vectors, gamma = model['support_vectors'], float(model['gamma'])
+        kernel = str(model['kernel'])
+        if kernel == 'rbf':
+            distances = ((X ** 2).sum(axis=1)[:, None] - 2.0 * X @ support_vectors.T
+                         + (support_vectors ** 2).sum(axis=1)[None, :])
+            return np.exp(-gamma * np.maximum(distances, 0.0))
+        if kernel == 'linear':
+            return X @ support_vectors.T
+        if kernel == 'poly':
+            return (gamma * X @ support_vectors.T + model['coef0']) ** int(model['degree'])
+        return np.tanh(gamma * X @ support_vectors.T + model['coef0'])
+
+    def _svc(self, model, X):
+        # libsvm's decision value is positive for the first class
+        decision = self._kernel(model, X) @ model['dual_coef'] + model['intercept'][0]
+        first = 1.0 / (1.0 + np.exp(decision * model['prob_a'][0] + model['prob_b'][0]))
+        first = np.clip(first, SVM_MIN_PROBABILITY, 1.0 - SVM_MIN_PROBABILITY)
+        return 1.0 - pairwise_coupling(first), decision < 0
+
+    def score(self, X):
+        """Positive-class probability and predicted label from every model
+
+        Returns:
+            Tuple of (predictions, probabilities), each a dictionary by model name
+        """
+        predictions, probabilities = {}, {}
+        for name, model in self.models.items():
+            kind = str(model['kind'])
+            probability, positive = getattr(self, f"_{kind}")(model, self._matrix(X, model))
+            probabilities[name] = probability
+            predictions[name] = model['classes'][positive.astype(int)]
+        return predictions, probabilities
+
+    def predict_proba(self, X) -> Dict[str, np.ndarray]:
+        return self.score(X)[1]
+
+    def predict_playoffs(self, X):
+        """Same outputs as ModelTrainer.predict_playoffs for one conference"""
+        predictions, probabilities = self.score(X)
+        avg_proba = np.mean([prob for prob in probabilities.values()], axis=0)
+        final_predictions = (avg_proba > 0.5).astype(int)
+        return predictions, probabilities, final_predictions, avg_proba
+
+
+def load_compiled(input_dir="models"):
+    """CompiledScorer for each conference with a compiled artifact, by conference name"""
+    scorers = {}
+    for conference in ['East', 'West']:
+        path = os.path.join(input_dir, conference.lower(), COMPILED_FILE)
+        if os.path.exists(path):
+            scorers[conference] = CompiledScorer.load(path)
+    return scorers
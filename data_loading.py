@@ -0,0 +1,58 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+# Labels repeated on every row, stored once per category
+CATEGORICAL_COLUMNS = ['Team', 'Conference']
+
+# Counts that fit in small integers
+INTEGER_COLUMNS = {'Year': np.int16, 'W': np.int16, 'L': np.int16, 'Playoffs': np.int8}
+
+# Team stats carry a few significant digits, well within float32
+FLOAT_DTYPE = np.float32
+
+
+def frame_memory(df: pd.DataFrame) -> int:
+    """Bytes held by a frame, including the strings in object columns"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def report_memory(df: pd.DataFrame, name: str):
+    print(f"{name}: {len(df)} rows x {df.shape[1]} columns, {frame_memory(df) / 2**20:.2f} MB")
+
+
+def compact_dtypes(df: pd.DataFrame, categorical: List[str] = CATEGORICAL_COLUMNS,
+                   integer: Dict[str, type] = INTEGER_COLUMNS) -> pd.DataFrame:
+    """Convert a frame's columns to compact dtypes in place
+
+    Label columns become categorical, count columns small integers (when they
+    have no missing values), and every other float64 column float32. Columns
+    are replaced one at a time, so the extra memory needed is one column.
+
+    Returns:
+        The same frame, for chaining
+    """
+    for column in categorical:
+        if column in df and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('category')
+    for column, dtype in integer.items():
+        if column in df and pd.api.types.is_numeric_dtype(df[column]) and df[column].notna().all():
+            df[column] = df[column].astype(dtype)
+    for column in df.columns:
+        if df[column].dtype == np.float64:
+            df[column] = df[column].astype(FLOAT_DTYPE)
+    return df
+
+
+def read_table(filepath: str, name: str = None) -> pd.DataFrame:
+    """Read a team table CSV straight into compact dtypes and report its size
+
+    Label columns are parsed as categorical by read_csv itself, so the repeated
+    strings are never materialised as one object per row.
+    """
+    header = pd.read_csv(filepath, nrows=0).columns
+    df = pd.read_csv(filepath, dtype={column: 'category' for column in CATEGORICAL_COLUMNS if column in header})
+    compact_dtypes(df)
+    report_memory(df, name or os.path.basename(filepath))
+    return df
@@ -1,135 +1,225 @@
 import os
+import argparse
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import requests
-import time
-from PIL import Image
-import io
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from logo_sprites import build_sprite_sheet
+
+# Team logo URLs from ESPN's CDN
+TEAM_LOGOS = {
+    "Hawks": "https://a.espncdn.com/i/teamlogos/nba/500/atl.png",
+    "Celtics": "https://a.espncdn.com/i/teamlogos/nba/500/bos.png",
+    "Nets": "https://a.espncdn.com/i/teamlogos/nba/500/bkn.png",
+    "Hornets": "https://a.espncdn.com/i/teamlogos/nba/500/cha.png",
+    "Bulls": "https://a.espncdn.com/i/teamlogos/nba/500/chi.png",
+    "Cavaliers": "https://a.espncdn.com/i/teamlogos/nba/500/cle.png",
+    "Mavericks": "https://a.espncdn.com/i/teamlogos/nba/500/dal.png",
+    "Nuggets": "https://a.espncdn.com/i/teamlogos/nba/500/den.png",
+    "Pistons": "https://a.espncdn.com/i/teamlogos/nba/500/det.png",
+    "Warriors": "https://a.espncdn.com/i/teamlogos/nba/500/gsw.png",
+    "Rockets": "https://a.espncdn.com/i/teamlogos/nba/500/hou.png",
+    "Pacers": "https://a.espncdn.com/i/teamlogos/nba/500/ind.png",
+    "Clippers": "https://a.espncdn.com/i/teamlogos/nba/500/lac.png",
+    "Lakers": "https://a.espncdn.com/i/teamlogos/nba/500/lal.png",
+    "Grizzlies": "https://a.espncdn.com/i/teamlogos/nba/500/mem.png",
+    "Heat": "https://a.espncdn.com/i/teamlogos/nba/500/mia.png",
+    "Bucks": "https://a.espncdn.com/i/teamlogos/nba/500/mil.png",
+    "Timberwolves": "https://a.espncdn.com/i/teamlogos/nba/500/min.png",
+    "Pelicans": "https://a.espncdn.com/i/teamlogos/nba/500/nop.png",
+    "Knicks": "https://a.espncdn.com/i/teamlogos/nba/500/nyk.png",
+    "Thunder": "https://a.espncdn.com/i/teamlogos/nba/500/okc.png",
+    "Magic": "https://a.espncdn.com/i/teamlogos/nba/500/orl.png",
+    "76ers": "https://a.espncdn.com/i/teamlogos/nba/500/phi.png",
+    "Suns": "https://a.espncdn.com/i/teamlogos/nba/500/phx.png",
+    "Trail Blazers": "https://a.espncdn.com/i/teamlogos/nba/500/por.png",
+    "Kings": "https://a.espncdn.com/i/teamlogos/nba/500/sac.png",
+    "Spurs": "https://a.espncdn.com/i/teamlogos/nba/500/sas.png",
+    "Raptors": "https://a.espncdn.com/i/teamlogos/nba/500/tor.png",
+    "Jazz": "https://a.espncdn.com/i/teamlogos/nba/500/uta.png",
+    "Wizards": "https://a.espncdn.com/i/teamlogos/nba/500/wsh.png"
+}
+
+# URLs for NBA logos (conference and league)
+MAIN_LOGOS = {
+    "nba_no_background.png": "https://a.espncdn.com/i/teamlogos/leagues/500/nba.png",
+    "nba-Eastern_Conference_logo.png": "https://a.espncdn.com/i/teamlogos/nba/500/east.png",
+    "nba-Western_Conference_logo.png": "https://a.espncdn.com/i/teamlogos/nba/500/west.png"
+}
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Referer': 'https://www.espn.com/',
+    'Origin': 'https://www.espn.com'
+}
+
+MANIFEST_NAME = "manifest.json"
+
+
+def create_session(max_workers=8, headers=None):
+    """Create a keep-alive session with a connection pool sized for the workers"""
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS if headers is None else headers)
+
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def load_manifest(manifest_path):
+    """Load the logo manifest (ETags, modification dates and content hashes)"""
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            return json.load(f)
+    return {}
+
+
+def save_manifest(manifest_path, manifest):
+    """Save the logo manifest"""
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def fetch_logo(session, url, local_path, entry=None, timeout=10):
+    """Fetch a single logo, using the manifest entry for a conditional request
+
+    Args:
+        session: Shared requests session
+        url: Logo URL
+        local_path: Where the full-size logo is stored
+        entry: Previous manifest entry for this logo, if any
+        timeout: Request timeout in seconds
+
+    Returns:
+        Tuple of (status, content, new manifest entry) where status is one of
+        'downloaded', 'not_modified', 'unchanged' or 'failed'
+    """
+    entry = dict(entry or {})
+    headers = {}
+    if os.path.exists(local_path) and entry.get('url') == url:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
 
-def download_file(url, local_path, headers=None):
-    """Download a file from a URL to a local path"""
     try:
-        if headers is None:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Referer': 'https://www.espn.com/',
-                'Origin': 'https://www.espn.com'
-            }
-        
-        response = requests.get(url, stream=True, headers=headers)
+        response = session.get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304:
+            return 'not_modified', None, entry
         response.raise_for_status()
-        
-        # Create directory if it doesn't exist
+
+        content = response.content
+        if b'<?xml' in content[:100] or b'<svg' in content[:100]:
+            raise ValueError("received an SVG document instead of a PNG")
+
+        entry['url'] = url
+        entry['etag'] = response.headers.get('ETag')
+        entry['last_modified'] = response.headers.get('Last-Modified')
+
+        digest = hashlib.sha256(content).hexdigest()
+        if digest == entry.get('sha256') and os.path.exists(local_path):
+            return 'unchanged', content, entry
+        entry['sha256'] = digest
+
         os.makedirs(os.path.dirname(local_path), exist_ok=True)
-        
-        # Write the file directly
         with open(local_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        
-        print(f"Downloaded: {local_path}")
-        return True
-    
+            f.write(content)
+        return 'downloaded', content, entry
+
     except Exception as e:
         print(f"Error downloading {url}: {str(e)}")
-        return False
+        return 'failed', None, entry
 
-def main():
+
+def download_logos(team_logos=None, main_logos=None, images_dir="Images",
+                   max_workers=8, session=None):
+    """Download all logos concurrently, skipping anything that hasn't changed
+
+    Args:
+        team_logos: Mapping of team name to logo URL (defaults to TEAM_LOGOS)
+        main_logos: Mapping of file name to logo URL (defaults to MAIN_LOGOS)
+        images_dir: Root image directory; team logos go in its logos/ folder
+        max_workers: Number of concurrent downloads
+        session: Optional session to reuse
+
+    Returns:
+        Dictionary mapping each local logo path to its fetch status
+    """
+    team_logos = TEAM_LOGOS if team_logos is None else team_logos
+    main_logos = MAIN_LOGOS if main_logos is None else main_logos
+
+    logos_dir = os.path.join(images_dir, "logos")
+    os.makedirs(logos_dir, exist_ok=True)
+
+    manifest_path = os.path.join(logos_dir, MANIFEST_NAME)
+    manifest = load_manifest(manifest_path)
+
+    # (manifest key, url, local path)
+    jobs = [(filename, url, os.path.join(images_dir, filename))
+            for filename, url in main_logos.items()]
+    jobs += [(f"logos/{team}.png", url, os.path.join(logos_dir, f"{team}.png"))
+             for team, url in team_logos.items()]
+
+    own_session = session is None
+    if own_session:
+        session = create_session(max_workers)
+
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(fetch_logo, session, url, local_path, manifest.get(key)): (key, local_path)
+                for key, url, local_path in jobs
+            }
+            for future in as_completed(futures):
+                key, local_path = futures[future]
+                status, _, entry = future.result()
+                results[local_path] = status
+
+                if status == 'failed':
+                    continue
+                manifest[key] = entry
+
+                if status == 'downloaded':
+                    print(f"Downloaded: {local_path}")
+                else:
+                    print(f"Up to date: {local_path}")
+    finally:
+        if own_session:
+            session.close()
+
+    save_manifest(manifest_path, manifest)
+    return results
+
+
+def main(argv=None):
     """Download NBA logos for the web interface"""
+    argparse.ArgumentParser(description="Download NBA logos and pack the sprite sheet").parse_args(argv)
     print("Downloading NBA logos...")
-    
-    # Create Images directory if it doesn't exist
-    if not os.path.exists("Images"):
-        os.makedirs("Images")
-    
-    # Create logos directory if it doesn't exist
-    logos_dir = os.path.join("Images", "logos")
-    if not os.path.exists(logos_dir):
-        os.makedirs(logos_dir)
-
-    # Team logo URLs from ESPN's CDN
-    team_logos = {
-        "Hawks": "https://a.espncdn.com/i/teamlogos/nba/500/atl.png",
-        "Celtics": "https://a.espncdn.com/i/teamlogos/nba/500/bos.png",
-        "Nets": "https://a.espncdn.com/i/teamlogos/nba/500/bkn.png",
-        "Hornets": "https://a.espncdn.com/i/teamlogos/nba/500/cha.png",
-        "Bulls": "https://a.espncdn.com/i/teamlogos/nba/500/chi.png",
-        "Cavaliers": "https://a.espncdn.com/i/teamlogos/nba/500/cle.png",
-        "Mavericks": "https://a.espncdn.com/i/teamlogos/nba/500/dal.png",
-        "Nuggets": "https://a.espncdn.com/i/teamlogos/nba/500/den.png",
-        "Pistons": "https://a.espncdn.com/i/teamlogos/nba/500/det.png",
-        "Warriors": "https://a.espncdn.com/i/teamlogos/nba/500/gsw.png",
-        "Rockets": "https://a.espncdn.com/i/teamlogos/nba/500/hou.png",
-        "Pacers": "https://a.espncdn.com/i/teamlogos/nba/500/ind.png",
-        "Clippers": "https://a.espncdn.com/i/teamlogos/nba/500/lac.png",
-        "Lakers": "https://a.espncdn.com/i/teamlogos/nba/500/lal.png",
-        "Grizzlies": "https://a.espncdn.com/i/teamlogos/nba/500/mem.png",
-        "Heat": "https://a.espncdn.com/i/teamlogos/nba/500/mia.png",
-        "Bucks": "https://a.espncdn.com/i/teamlogos/nba/500/mil.png",
-        "Timberwolves": "https://a.espncdn.com/i/teamlogos/nba/500/min.png",
-        "Pelicans": "https://a.espncdn.com/i/teamlogos/nba/500/nop.png",
-        "Knicks": "https://a.espncdn.com/i/teamlogos/nba/500/nyk.png",
-        "Thunder": "https://a.espncdn.com/i/teamlogos/nba/500/okc.png",
-        "Magic": "https://a.espncdn.com/i/teamlogos/nba/500/orl.png",
-        "76ers": "https://a.espncdn.com/i/teamlogos/nba/500/phi.png",
-        "Suns": "https://a.espncdn.com/i/teamlogos/nba/500/phx.png",
-        "Trail Blazers": "https://a.espncdn.com/i/teamlogos/nba/500/por.png",
-        "Kings": "https://a.espncdn.com/i/teamlogos/nba/500/sac.png",
-        "Spurs": "https://a.espncdn.com/i/teamlogos/nba/500/sas.png",
-        "Raptors": "https://a.espncdn.com/i/teamlogos/nba/500/tor.png",
-        "Jazz": "https://a.espncdn.com/i/teamlogos/nba/500/uta.png",
-        "Wizards": "https://a.espncdn.com/i/teamlogos/nba/500/wsh.png"
-    }
-
-    # URLs for NBA logos (conference and league)
-    main_logos = {
-        "nba_no_background.png": "https://a.espncdn.com/i/teamlogos/leagues/500/nba.png",
-        "nba-Eastern_Conference_logo.png": "https://a.espncdn.com/i/teamlogos/nba/500/east.png",
-        "nba-Western_Conference_logo.png": "https://a.espncdn.com/i/teamlogos/nba/500/west.png"
-    }
-
-    # Download main logos
-    success_count = 0
-    total_logos = len(main_logos) + len(team_logos)
-
-    for filename, url in main_logos.items():
-        local_path = os.path.join("Images", filename)
-        
-        if os.path.exists(local_path):
-            print(f"File already exists: {local_path}")
-            success_count += 1
-            continue
-        
-        if download_file(url, local_path):
-            success_count += 1
-        
-        time.sleep(0.5)
-
-    # Download team logos
-    for team, url in team_logos.items():
-        local_path = os.path.join(logos_dir, f"{team}.png")
-        
-        if os.path.exists(local_path):
-            # Remove existing file if it's an SVG saved as PNG
-            with open(local_path, 'rb') as f:
-                if b'<?xml' in f.read(100) or b'<svg' in f.read(100):
-                    os.remove(local_path)
-                else:
-                    print(f"File already exists: {local_path}")
-                    success_count += 1
-                    continue
-        
-        if download_file(url, local_path):
-            success_count += 1
-        
-        time.sleep(0.5)
-    
+
+    results = download_logos()
+
+    # Repack the sprite sheet used by index.html and Visualizer when logos change
+    if 'downloaded' in results.values() or not os.path.exists(os.path.join("Images", "logos", "sprite.png")):
+        build_sprite_sheet()
+
     # Print summary
-    print(f"\nDownloaded {success_count} of {total_logos} logos.")
-    
-    if success_count == total_logos:
+    success_count = sum(1 for status in results.values() if status != 'failed')
+    downloaded = sum(1 for status in results.values() if status == 'downloaded')
+    print(f"\nFetched {downloaded} new logos, {success_count} of {len(results)} logos available.")
+
+    if success_count == len(results):
         print("All logos downloaded successfully!")
     else:
         print("Some logos could not be downloaded.")
         print("The web interface may not display correctly.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,180 @@
+import bisect
+import numpy as np
+import pandas as pd
+from typing import List
+
+INITIAL_ELO = 1500.0
+ELO_K = 20.0
+HOME_ADVANTAGE_ELO = 100.0
+
+# Share of a team's distance from the mean kept over the offseason
+SEASON_CARRYOVER = 0.75
+
+# Roughly how many Elo points one point of scoring margin is worth
+ELO_PER_POINT = 28.0
+
+
+def season_of(dates: pd.Series) -> pd.Series:
+    """NBA season (by its ending year) of each game date"""
+    dates = pd.to_datetime(dates)
+    return dates.dt.year + (dates.dt.month >= 8)
+
+
+def margin_multiplier(margin: np.ndarray, elo_diff: np.ndarray) -> np.ndarray:
+    """Scale K up for lopsided wins, less so when the favourite was expected to win big"""
+    return (np.abs(margin) + 3.0) ** 0.8 / (7.5 + 0.006 * elo_diff)
+
+
+class EloRatings:
+    """Game-by-game Elo ratings with a checkpoint after every date
+
+    Games on the same date never share a team, so each date is applied as one
+    vectorized batch. update_game handles one new game in constant time.
+    """
+
+    def __init__(self, k: float = ELO_K, home_advantage: float = HOME_ADVANTAGE_ELO,
+                 season_carryover: float = SEASON_CARRYOVER, initial: float = INITIAL_ELO):
+        self.k = k
+        self.home_advantage = home_advantage
+        self.season_carryover = season_carryover
+        self.initial = initial
+        self.teams = []
+        self._team_index = {}
+        self._elo = np.zeros(0)
+        self.season = None
+        self._checkpoint_dates = []
+        self._checkpoints = []
+
+    def _index(self, team: str) -> int:
+        if team not in self._team_index:
+            self._team_index[team] = len(self.teams)
+            self.teams.append(team)
+            self._elo = np.append(self._elo, self.initial)
+        return self._team_index[team]
+
+    def expected(self, home_elo, away_elo) -> np.ndarray:
+        """Probability that the home team wins"""
+        return 1.0 / (1.0 + 10.0 ** (-(np.asarray(home_elo) - away_elo + self.home_advantage) / 400.0))
+
+    def _start_season(self, season):
+        """Regress every rating part of the way back to the mean between seasons"""
+        if self.season is not None and season != self.season and len(self._elo):
+            mean = self._elo.mean()
+            self._elo = mean + self.season_carryover * (self._elo - mean)
+        self.season = season
+
+    def _apply(self, home: np.ndarray, away: np.ndarray, margin: np.ndarray):
+        """Update ratings for a batch of games in which no team appears twice"""
+        home_elo, away_elo = self._elo[home], self._elo[away]
+        home_won = (margin > 0).astype(float)
+        elo_diff = np.where(home_won == 1.0, 1.0, -1.0) * (home_elo - away_elo + self.home_advantage)
+        shift = self.k * margin_multiplier(margin, elo_diff) * (home_won - self.expected(home_elo, away_elo))
+        self._elo[home] += shift
+        self._elo[away] -= shift
+
+    def _checkpoint(self, date):
+        date = pd.Timestamp(date)
+        if self._checkpoint_dates and self._checkpoint_dates[-1] == date:
+            self._checkpoints[-1] = (self.season, self._elo.copy())
+        else:
+            self._checkpoint_dates.append(date)
+            self._checkpoints.append((self.season, self._elo.copy()))
+
+    def process(self, games: pd.DataFrame) -> 'EloRatings':
+        """Apply a chronological game log from game_log.pair_games
+
+        Games must be later than anything already processed.
+        """
+        games = games.sort_values(['GAME_DATE', 'GAME_ID'] if 'GAME_ID' in games else ['GAME_DATE'])
+        dates = pd.to_datetime(games['GAME_DATE']).to_numpy()
+        seasons = (games['SEASON'] if 'SEASON' in games else season_of(games['GAME_DATE'])).to_numpy()
+        home = np.array([self._index(team) for team in games['HOME']], dtype=np.int64)
+        away = np.array([self._index(team) for team in games['AWAY']], dtype=np.int64)
+        margin = games['HOME_MARGIN'].to_numpy(dtype=float)
+
+        # A team playing twice on one date (bad data) goes into a batch after each
+        # of its earlier games that day, so no batch holds a team twice
+        appearances = pd.Series(np.concatenate([home, away]))
+        dates_twice = np.concatenate([dates, dates])
+        repeat = appearances.groupby([dates_twice, appearances.to_numpy()]).cumcount().to_numpy()
+        batch = np.zeros(len(games), dtype=np.int64)
+        repeated_dates = set(dates_twice[repeat > 0])
+        if repeated_dates:
+            last_batch = {}
+            for i in np.flatnonzero(pd.Series(dates).isin(repeated_dates).to_numpy()):
+                home_key, away_key = (dates[i], home[i]), (dates[i], away[i])
+                batch[i] = max(last_batch.get(home_key, -1), last_batch.get(away_key, -1)) + 1
+                last_batch[home_key] = last_batch[away_key] = batch[i]
+            order = np.lexsort((batch, dates))
+            dates, seasons, home, away, margin, batch = (
+                dates[order], seasons[order], home[order], away[order], margin[order], batch[order])
+
+        boundaries = np.flatnonzero((dates[1:] != dates[:-1]) | (batch[1:] != batch[:-1])) + 1
+        for start, end in zip(np.r_[0, boundaries], np.r_[boundaries, len(games)]):
+            self._start_season(seasons[start])
+            order = slice(start, end)
+            self._apply(home[order], away[order], margin[order])
+            self._checkpoint(dates[start])
+        return self
+
+    def update_game(self, home: str, away: str, home_margin: float, date=None, season=None):
+        """Apply a single new game in O(1) (checkpointing the date when one is given)"""
+        if season is None and date is not None:
+            date = pd.Timestamp(date)
+            season = date.year + (date.month >= 8)
+        if season is not None:
+            self._start_season(season)
+        home_index, away_index = self._index(home), self._index(away)
+        self._apply(np.array([home_index]), np.array([away_index]), np.array([float(home_margin)]))
+        if date is not None:
+            self._checkpoint(date)
+
+    @property
+    def ratings(self) -> pd.Series:
+        return pd.Series(self._elo, index=self.teams, name='ELO')
+
+    def ratings_on(self, date) -> pd.Series:
+        """Ratings as they stood after every game on or before date"""
+        position = bisect.bisect_right(self._checkpoint_dates, pd.Timestamp(date))
+        if position == 0:
+            return pd.Series(self.initial, index=self.teams, name='ELO')
+        elo = self._checkpoints[position - 1][1]
+        ratings = np.full(len(self.teams), self.initial)
+        ratings[:len(elo)] = elo
+        return pd.Series(ratings, index=self.teams, name='ELO')
+
+    def replay(self, date) -> 'EloRatings':
+        """New engine restored to its state at the end of date, ready for later games"""
+        position = bisect.bisect_right(self._checkpoint_dates, pd.Timestamp(date))
+        engine = EloRatings(self.k, self.home_advantage, self.season_carryover, self.initial)
+        if position == 0:
+            return engine
+        season, elo = self._checkpoints[position - 1]
+        engine.teams = self.teams[:len(elo)]
+        engine._team_index = {team: i for i, team in enumerate(engine.teams)}
+        engine._elo = elo.copy()
+        engine.season = season
+        engine._checkpoint_dates = self._checkpoint_dates[:position]
+        engine._checkpoints = self._checkpoints[:position]
+        return engine
+
+    def point_ratings(self, teams: List[str], date=None) -> np.ndarray:
+        """Ratings in points relative to the league mean, for NET_RATING"""
+        ratings = self.ratings if date is None else self.ratings_on(date)
+        elo = ratings.reindex(teams).fillna(ratings.mean()).to_numpy()
+        return (elo - ratings.mean()) / ELO_PER_POINT
+
+    def apply(self, team_df: pd.DataFrame, date=None) -> pd.DataFrame:
+        """Copy of a conference table with NET_RATING replaced by Elo in points"""
+        rated = team_df.copy()
+        rated['NET_RATING'] = self.point_ratings(team_df['Team'], date)
+        return rated
+
+    def win_probabilities(self, teams: List[str], date=None) -> pd.DataFrame:
+        """Probability that the row team beats the column team at home
+
+        Pass the result to PlayoffSimulator.use_win_probabilities.
+        """
+        ratings = self.ratings if date is None else self.ratings_on(date)
+        elo = ratings.reindex(teams).fillna(self.initial).to_numpy()
+        return pd.DataFrame(self.expected(elo[:, None], elo[None, :]), index=teams, columns=teams)
@@ -0,0 +1,104 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from typing import Dict
+from joblib import Parallel, delayed, effective_n_jobs, hash as joblib_hash
+
+from compiled_scorer import CompiledScorer, compile_models
+
+CACHE_DIR = os.path.join("NBA_data", "cache", "importance")
+
+N_REPEATS = 10
+
+
+def brier_scores(probabilities: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Brier score of each row of a (n_sets, n_rows) probability array"""
+    return np.mean((probabilities - y) ** 2, axis=-1)
+
+
+def _permuted_scores(scorer, X, y, features, n_repeats, seeds):
+    """Brier score of every model with each feature in a chunk shuffled n_repeats times
+
+    All repeats for one feature are stacked into a single (n_repeats * n_rows)
+    batch, so each model scores a feature's shuffles in one call.
+
+    Returns:
+        Array shaped (feature in chunk, model, repeat)
+    """
+    n_rows = len(X)
+    scores = np.empty((len(features), len(scorer.models), n_repeats))
+    for i, (feature, seed) in enumerate(zip(features, seeds)):
+        order = np.random.default_rng(seed).permuted(np.tile(np.arange(n_rows), (n_repeats, 1)), axis=1)
+        stacked = np.repeat(np.asarray(X)[None], n_repeats, axis=0)
+        stacked[:, :, feature] = np.asarray(X)[order, feature]
+        probabilities = scorer.predict_proba(stacked.reshape(n_repeats * n_rows, -1))
+        for m, name in enumerate(scorer.models):
+            scores[i, m] = brier_scores(probabilities[name].reshape(n_repeats, n_rows), y)
+    return scores
+
+
+def _cache_key(arrays, X, y, n_repeats, seed):
+    return joblib_hash((sorted(arrays.items()), X, y, n_repeats, seed))
+
+
+def permutation_importance(models: Dict, X: pd.DataFrame, y, n_repeats=N_REPEATS, seed=0, n_jobs=-1,
+                           cache_dir=CACHE_DIR) -> Dict[str, pd.DataFrame]:
+    """Model-agnostic feature importance for every model in an ensemble
+
+    Importance is the increase in Brier score when one feature's values are
+    shuffled across rows, averaged over n_repeats shuffles. Baseline scores are
+    computed once per model, features are shuffled in parallel worker processes,
+    and results are cached on disk per model, keyed by a hash of the model's
+    compiled arrays and the data, so unchanged models are never rescored.
+
+    Args:
+        models: Fitted binary classifiers by name (anything compiled_scorer supports)
+        X: Feature rows to score on
+        y: Labels for X
+        n_repeats: Shuffles per feature
+        seed: Seed for the shuffles (results don't depend on n_jobs)
+        n_jobs: Worker processes (joblib convention, -1 for all cores)
+        cache_dir: Directory for cached results (None disables caching)
+
+    Returns:
+        Dictionary by model name of DataFrames indexed by feature, with the mean
+        and standard deviation of the importance over the repeats
+    """
+    trained_on = getattr(next(iter(models.values())), 'feature_names_in_', None)
+    if trained_on is not None:
+        X = X[list(trained_on)]
+    features = list(X.columns)
+    X_values = np.ascontiguousarray(X, dtype=np.float64)
+    y_values = np.asarray(y, dtype=np.float64)
+
+    results, paths, missing = {}, {}, {}
+    for name, model in models.items():
+        arrays = compile_models({name: model})
+        paths[name] = None if cache_dir is None else os.path.join(
+            cache_dir, f"{_cache_key(arrays, X_values, y_values, n_repeats, seed)}.json")
+        if paths[name] and os.path.exists(paths[name]):
+            with open(paths[name], 'r') as f:
+                results[name] = pd.DataFrame(json.load(f), index=features)
+        else:
+            missing[name] = model
+
+    if missing:
+        scorer = CompiledScorer.from_models(missing)
+        baseline = scorer.predict_proba(X_values)
+        seeds = np.random.SeedSequence(seed).generate_state(len(features))
+        chunks = np.array_split(np.arange(len(features)), min(len(features), effective_n_jobs(n_jobs)))
+        scores = np.concatenate(Parallel(n_jobs=n_jobs, max_nbytes=0, mmap_mode='r')(
+            delayed(_permuted_scores)(scorer, X_values, y_values, chunk, n_repeats, seeds[chunk])
+            for chunk in chunks if len(chunk)))
+
+        for m, name in enumerate(missing):
+            increase = scores[:, m] - brier_scores(baseline[name], y_values)
+            result = {'importance': increase.mean(axis=1).tolist(), 'std': increase.std(axis=1).tolist()}
+            if paths[name]:
+                os.makedirs(cache_dir, exist_ok=True)
+                with open(paths[name], 'w') as f:
+                    json.dump(result, f)
+            results[name] = pd.DataFrame(result, index=features)
+
+    return {name: results[name] for name in models}
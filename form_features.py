@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+from typing import Tuple
+from nba_api.stats.static import teams
+
+from game_log import REGULAR_SEASON
+
+# Per-game metrics averaged into form features
+FORM_METRICS = ['MARGIN', 'ORTG', 'DRTG', 'PACE']
+
+# Rolling windows in games, and the half-life in games of the exponential average
+FORM_WINDOWS = (5, 15)
+FORM_HALFLIFE = 7.0
+
+FORM_COLUMNS = ([f"{metric}_LAST{window}" for metric in FORM_METRICS for window in FORM_WINDOWS]
+                + [f"{metric}_EWM" for metric in FORM_METRICS])
+
+# Weight of free throw attempts in the possession estimate
+FTA_POSSESSION_WEIGHT = 0.44
+
+
+def team_games(games_df, season_types=(REGULAR_SEASON,)):
+    """One row per team per game with that game's margin, ratings and pace
+
+    Possessions are estimated from the box score (FGA - OREB + TOV + 0.44 FTA) and
+    averaged over both teams; ratings are points per 100 possessions and pace is
+    possessions per 48 minutes.
+
+    Args:
+        games_df: Raw leaguegamefinder rows
+        season_types: GAME_ID prefixes to keep (regular season by default)
+
+    Returns:
+        DataFrame with GAME_ID, GAME_DATE, TEAM, OPPONENT, HOME and FORM_METRICS,
+        sorted by date
+    """
+    nicknames = {team['id']: team['nickname'] for team in teams.get_teams()}
+    games = games_df[games_df['TEAM_ID'].isin(nicknames)].copy()
+    games['GAME_ID'] = games['GAME_ID'].astype(str).str.zfill(10)
+    games = games[games['GAME_ID'].str[:3].isin(season_types)]
+    games['TEAM'] = games['TEAM_ID'].map(nicknames)
+    games['POSS'] = games['FGA'] - games['OREB'] + games['TOV'] + FTA_POSSESSION_WEIGHT * games['FTA']
+
+    games['HOME'] = games['MATCHUP'].str.contains(' vs. ', regex=False)
+
+    own = games[['GAME_ID', 'GAME_DATE', 'TEAM', 'HOME', 'PTS', 'POSS'] + (['MIN'] if 'MIN' in games else [])]
+    paired = own.merge(games[['GAME_ID', 'TEAM', 'PTS', 'POSS']], on='GAME_ID', suffixes=('', '_OPP'))
+    paired = paired[paired['TEAM'] != paired['TEAM_OPP']]
+
+    possessions = (paired['POSS'] + paired['POSS_OPP']) / 2
+    # MIN is team minutes (240 in regulation); without it every game counts as 48 minutes
+    minutes = paired['MIN'] / 5 if 'MIN' in paired else 48.0
+    result = pd.DataFrame({
+        'GAME_ID': paired['GAME_ID'],
+        'GAME_DATE': pd.to_datetime(paired['GAME_DATE']),
+        'TEAM': paired['TEAM'],
+        'OPPONENT': paired['TEAM_OPP'],
+        'HOME': paired['HOME'],
+        'MARGIN': (paired['PTS'] - paired['PTS_OPP']).astype(float),
+        'ORTG': 100 * paired['PTS'] / possessions,
+        'DRTG': 100 * paired['PTS_OPP'] / possessions,
+        'PACE': 48 * possessions / minutes
+    })
+    return result.sort_values(['GAME_DATE', 'GAME_ID', 'TEAM']).reset_index(drop=True)
+
+
+class FormFeatures:
+    """Rolling and exponentially weighted form for every team, updated game by game
+
+    fit computes features for a whole game log with grouped window operations and
+    keeps each team's last max(windows) games and current exponential average;
+    update then applies new games in time proportional to the number of new rows.
+    Features describe a team after the game on their row.
+    """
+
+    def __init__(self, windows: Tuple[int, ...] = FORM_WINDOWS, halflife: float = FORM_HALFLIFE):
+        self.windows = tuple(windows)
+        self.alpha = 1.0 - 0.5 ** (1.0 / halflife)
+        self.columns = ([f"{metric}_LAST{window}" for metric in FORM_METRICS for window in self.windows]
+                        + [f"{metric}_EWM" for metric in FORM_METRICS])
+        self._reset()
+
+    def _reset(self):
+        self.teams = []
+        self._team_index = {}
+        self._recent = np.zeros((0, max(self.windows), len(FORM_METRICS)))
+        self._n_games = np.zeros(0, dtype=np.int64)
+        self._ewm = np.zeros((0, len(FORM_METRICS)))
+        self._seen = set()
+
+    def _index(self, team: str) -> int:
+        if team not in self._team_index:
+            self._team_index[team] = len(self.teams)
+            self.teams.append(team)
+            self._recent = np.concatenate([self._recent, np.zeros((1,) + self._recent.shape[1:])])
+            self._n_games = np.append(self._n_games, 0)
+            self._ewm = np.vstack([self._ewm, np.zeros(len(FORM_METRICS))])
+        return self._team_index[team]
+
+    def fit(self, games: pd.DataFrame) -> pd.DataFrame:
+        """Features after every game in a team_games log, replacing any previous state
+
+        Returns:
+            DataFrame with GAME_ID, GAME_DATE, TEAM and the form columns
+        """
+        self._reset()
+        games = games.sort_values(['GAME_DATE', 'GAME_ID', 'TEAM']).reset_index(drop=True)
+        grouped = games.groupby('TEAM', sort=False)[FORM_METRICS]
+
+        features = games[['GAME_ID', 'GAME_DATE', 'TEAM']].copy()
+        for window in self.windows:
+            rolled = grouped.rolling(window, min_periods=1).mean().reset_index(level=0, drop=True)
+            for metric in FORM_METRICS:
+                features[f"{metric}_LAST{window}"] = rolled[metric]
+        smoothed = grouped.ewm(alpha=self.alpha, adjust=False).mean().reset_index(level=0, drop=True)
+        for metric in FORM_METRICS:
+            features[f"{metric}_EWM"] = smoothed[metric]
+
+        # Keep each team's latest games in its ring buffer, slot = game number % size
+        size = self._recent.shape[1]
+        game_number = games.groupby('TEAM', sort=False).cumcount().to_numpy()
+        index = np.array([self._index(team) for team in games['TEAM']], dtype=np.int64)
+        self._n_games = np.bincount(index, minlength=len(self.teams))
+        latest = game_number >= self._n_games[index] - size
+        self._recent[index[latest], game_number[latest] % size] = games.loc[latest, FORM_METRICS].to_numpy()
+        last = games.groupby('TEAM', sort=False).tail(1)
+        self._ewm[[self._team_index[team] for team in last['TEAM']]] = \
+            features.loc[last.index, [f"{metric}_EWM" for metric in FORM_METRICS]].to_numpy()
+        self._seen = set(zip(games['GAME_ID'], games['TEAM']))
+        return features[['GAME_ID', 'GAME_DATE', 'TEAM'] + self.columns]
+
+    def _team_features(self, i: int) -> np.ndarray:
+        size = self._recent.shape[1]
+        n = self._n_games[i]
+        values = []
+        for window in self.windows:
+            count = min(window, n)
+            slots = (n - 1 - np.arange(count)) % size
+            values.append(self._recent[i, slots].mean(axis=0))
+        # Column order: every window for a metric, then the exponential averages
+        return np.concatenate([np.stack(values, axis=1).ravel(), self._ewm[i]])
+
+    def update(self, games: pd.DataFrame) -> pd.DataFrame:
+        """Apply new rows of a team_games log; rows already seen are skipped
+
+        Returns:
+            Features after each new game, in the same layout as fit
+        """
+        games = games.sort_values(['GAME_DATE', 'GAME_ID', 'TEAM'])
+        size = self._recent.shape[1]
+        rows = []
+        for game_id, date, team, values in zip(games['GAME_ID'], games['GAME_DATE'], games['TEAM'],
+                                               games[FORM_METRICS].to_numpy(dtype=float)):
+            if (game_id, team) in self._seen:
+                continue
+            self._seen.add((game_id, team))
+            i = self._index(team)
+            self._recent[i, self._n_games[i] % size] = values
+            self._ewm[i] = values if self._n_games[i] == 0 else (1 - self.alpha) * self._ewm[i] + self.alpha * values
+            self._n_games[i] += 1
+            rows.append([game_id, date, team] + list(self._team_features(i)))
+        return pd.DataFrame(rows, columns=['GAME_ID', 'GAME_DATE', 'TEAM'] + self.columns)
+
+    def save(self, path: str):
+        """Write the ring buffers, exponential averages and seen games to an .npz file"""
+        seen = sorted(self._seen)
+        np.savez(path, windows=np.array(self.windows), alpha=np.array(self.alpha),
+                 teams=np.array(self.teams, dtype=str), recent=self._recent, n_games=self._n_games,
+                 ewm=self._ewm, seen_games=np.array([game for game, _ in seen], dtype=str),
+                 seen_teams=np.array([team for _, team in seen], dtype=str))
+
+    @classmethod
+    def load(cls, path: str) -> 'FormFeatures':
+        """State written by save, ready for update"""
+        with np.load(path, allow_pickle=False) as arrays:
+            form = cls(windows=tuple(arrays['windows'].tolist()))
+            form.alpha = float(arrays['alpha'])
+            form.teams = arrays['teams'].tolist()
+            form._team_index = {team: i for i, team in enumerate(form.teams)}
+            form._recent = arrays['recent']
+            form._n_games = arrays['n_games']
+            form._ewm = arrays['ewm']
+            form._seen = set(zip(arrays['seen_games'].tolist(), arrays['seen_teams'].tolist()))
+        return form
+
+    def current(self) -> pd.DataFrame:
+        """Latest form of every team, one row per team"""
+        values = [self._team_features(i) for i in range(len(self.teams))]
+        return pd.DataFrame(values, columns=self.columns).assign(Team=self.teams)[['Team'] + self.columns]
@@ -0,0 +1,82 @@
+import os
+import json
+import pandas as pd
+from nba_api.stats.static import teams
+
+from data_loading import compact_dtypes
+
+CACHE_DIR = os.path.join("NBA_data", "cache")
+
+# leaguegamefinder columns repeated on every row of a team's games
+GAME_LOG_CATEGORICAL = ['SEASON_ID', 'TEAM_ABBREVIATION', 'TEAM_NAME', 'WL']
+
+# leaguegamefinder GAME_ID prefixes by season type
+REGULAR_SEASON = "002"
+PLAYOFFS = "004"
+
+
+def season_string(year):
+    """NBA.com season label for the season ending in year (e.g. 2025 -> "2024-25")"""
+    return f"{year-1}-{str(year)[2:]}"
+
+
+def nickname(team_name):
+    """Nickname of a full team name as the NBA.com API names teams ("San Antonio Spurs" -> "Spurs")
+
+    Current teams match their nba_api nickname, so "Portland Trail Blazers" keeps
+    both words; former names ("Seattle SuperSonics") fall back to the last word.
+    """
+    for team in teams.get_teams():
+        if team_name == team['nickname'] or team_name.endswith(' ' + team['nickname']):
+            return team['nickname']
+    return team_name.rsplit(' ', 1)[-1]
+
+
+def load_game_log(year, cache_dir=CACHE_DIR):
+    """Load the cached leaguegamefinder rows for a season
+
+    Returns:
+        DataFrame with one row per team per game in compact dtypes, or None if the
+        season is not cached
+    """
+    cache_path = os.path.join(cache_dir, f"games_{season_string(year)}.json")
+    if not os.path.exists(cache_path):
+        print(f"No cached game log for {season_string(year)} at {cache_path}")
+        return None
+    with open(cache_path, 'r') as f:
+        return compact_dtypes(pd.DataFrame(json.load(f)), categorical=GAME_LOG_CATEGORICAL, integer={})
+
+
+def pair_games(games_df, season_types=(REGULAR_SEASON,)):
+    """Join the two team rows of each game into one row from the home team's side
+
+    leaguegamefinder returns a row per team per game; the home row has "vs." in
+    MATCHUP and the road row has "@". Teams are named by nickname, as elsewhere in
+    the project. Rows for non-NBA teams and unpaired games are dropped.
+
+    Args:
+        games_df: Raw leaguegamefinder rows
+        season_types: GAME_ID prefixes to keep (regular season by default)
+
+    Returns:
+        DataFrame with GAME_ID, GAME_DATE, HOME, AWAY and HOME_MARGIN, sorted by date
+    """
+    nicknames = {team['id']: team['nickname'] for team in teams.get_teams()}
+    games = games_df[games_df['TEAM_ID'].isin(nicknames)].copy()
+    games['GAME_ID'] = games['GAME_ID'].astype(str).str.zfill(10)
+    games = games[games['GAME_ID'].str[:3].isin(season_types)]
+    games['TEAM'] = games['TEAM_ID'].map(nicknames)
+
+    is_home = games['MATCHUP'].str.contains(' vs. ', regex=False)
+    home = games.loc[is_home, ['GAME_ID', 'GAME_DATE', 'TEAM', 'PLUS_MINUS']]
+    away = games.loc[~is_home, ['GAME_ID', 'TEAM']]
+    paired = home.merge(away, on='GAME_ID', suffixes=('_HOME', '_AWAY'))
+
+    paired = pd.DataFrame({
+        'GAME_ID': paired['GAME_ID'],
+        'GAME_DATE': pd.to_datetime(paired['GAME_DATE']),
+        'HOME': paired['TEAM_HOME'],
+        'AWAY': paired['TEAM_AWAY'],
+        'HOME_MARGIN': paired['PLUS_MINUS'].astype(float)
+    })
+    return paired.sort_values(['GAME_DATE', 'GAME_ID']).reset_index(drop=True)
@@ -0,0 +1,175 @@
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+from game_log import CACHE_DIR, load_game_log
+from form_features import FORM_COLUMNS, FormFeatures, team_games
+
+# Model inputs: the team's form minus the opponent's, then +1 at home / -1 on the road
+GAME_FEATURES = [f"{column}_DIFF" for column in FORM_COLUMNS] + ['HOME']
+
+# Rows per partial_fit call, and passes over the whole history
+CHUNK_SIZE = 20000
+EPOCHS = 5
+
+# L2 penalty of the SGD logistic regression
+SGD_ALPHA = 1e-4
+
+MODEL_FILE = os.path.join("models", "game_model.joblib")
+
+Chunks = Callable[[], Iterable[Tuple[np.ndarray, np.ndarray]]]
+
+
+def game_rows(games_df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Training rows for one season of raw leaguegamefinder rows
+
+    Each game gives two rows, one from each team's side, so the model sees every
+    matchup both ways. Features describe both teams before tip-off; each team's
+    first game of the season has no form yet and is dropped.
+
+    Returns:
+        Tuple of (X, y): X is float32 with columns GAME_FEATURES, y is 1 where the
+        row team won
+    """
+    games = team_games(games_df)
+    features = FormFeatures().fit(games)
+    # fit gives form after each game; shifting within a team gives form before it
+    before = features.groupby('TEAM', sort=False)[FORM_COLUMNS].shift(1)
+    before[['GAME_ID', 'TEAM']] = features[['GAME_ID', 'TEAM']]
+
+    rows = games[['GAME_ID', 'TEAM', 'OPPONENT', 'HOME', 'MARGIN']].merge(before, on=['GAME_ID', 'TEAM'])
+    rows = rows.merge(before, left_on=['GAME_ID', 'OPPONENT'], right_on=['GAME_ID', 'TEAM'],
+                      suffixes=('', '_OPP')).dropna(subset=FORM_COLUMNS + [f"{c}_OPP" for c in FORM_COLUMNS])
+
+    X = np.empty((len(rows), len(GAME_FEATURES)), dtype=np.float32)
+    X[:, :-1] = rows[FORM_COLUMNS].to_numpy() - rows[[f"{c}_OPP" for c in FORM_COLUMNS]].to_numpy()
+    X[:, -1] = np.where(rows['HOME'], 1.0, -1.0)
+    y = (rows['MARGIN'] > 0).to_numpy(dtype=np.int8)
+    return X, y
+
+
+def season_chunks(years: Iterable[int], chunk_size=CHUNK_SIZE, cache_dir=CACHE_DIR) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Stream (X, y) chunks of at most chunk_size rows, one season in memory at a time
+
+    Seasons without a cached game log are skipped.
+    """
+    for year in years:
+        games_df = load_game_log(year, cache_dir)
+        if games_df is None:
+            continue
+        X, y = game_rows(games_df)
+        del games_df
+        for start in range(0, len(y), chunk_size):
+            yield X[start:start + chunk_size], y[start:start + chunk_size]
+
+
+class GameModel:
+    """Out-of-core logistic model of single-game win probability
+
+    Trained with partial_fit over a stream of chunks, so memory use is set by the
+    chunk size (and the season being turned into rows), not the length of the
+    history: a first pass fits the feature scaling, then SGD makes `epochs` passes
+    with each chunk shuffled.
+    """
+
+    def __init__(self, epochs=EPOCHS, alpha=SGD_ALPHA, seed=0):
+        from sklearn.linear_model import SGDClassifier
+        from sklearn.preprocessing import StandardScaler
+        self.epochs = epochs
+        self.seed = seed
+        self.scaler = StandardScaler()
+        self.classifier = SGDClassifier(loss='log_loss', alpha=alpha, random_state=seed)
+        self.n_games = 0
+
+    def fit_stream(self, chunks: Chunks) -> 'GameModel':
+        """Fit from a chunk source
+
+        Args:
+            chunks: Callable returning a fresh iterable of (X, y) chunks each time
+                it's called (e.g. lambda: season_chunks(years)); the data is read
+                once for the scaling and once per epoch
+        """
+        rng = np.random.default_rng(self.seed)
+        n_rows = 0
+        for X, _ in chunks():
+            self.scaler.partial_fit(X)
+            n_rows += len(X)
+        if not n_rows:
+            raise ValueError("No training games in the chunk source")
+
+        for epoch in range(self.epochs):
+            for X, y in chunks():
+                order = rng.permutation(len(y))
+                self.classifier.partial_fit(self.scaler.transform(X[order]), y[order], classes=[0, 1])
+        # Two rows per game
+        self.n_games = n_rows // 2
+        print(f"Trained game model on {self.n_games} games over {self.epochs} epochs")
+        return self
+
+    def fit_seasons(self, years: Iterable[int], chunk_size=CHUNK_SIZE, cache_dir=CACHE_DIR) -> 'GameModel':
+        """Fit on the cached game logs of the given seasons"""
+        years = list(years)
+        return self.fit_stream(lambda: season_chunks(years, chunk_size, cache_dir))
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Probability that the row team wins, for rows laid out as GAME_FEATURES"""
+        return self.classifier.predict_proba(self.scaler.transform(np.asarray(X, dtype=np.float32)))[:, 1]
+
+    def win_probabilities(self, form: pd.DataFrame, teams: List[str] = None) -> pd.DataFrame:
+        """Probability that the row team beats the column team at home
+
+        Every ordered pair is scored in one predict_proba call. Pass the result to
+        PlayoffSimulator.use_win_probabilities.
+
+        Args:
+            form: Current form, one row per team (FormFeatures.current())
+            teams: Teams to include, in order (all teams in form by default)
+        """
+        form = form.set_index('Team') if 'Team' in form else form
+        teams = list(form.index) if teams is None else list(teams)
+        values = form.loc[teams, FORM_COLUMNS].to_numpy(dtype=np.float32)
+
+        n = len(teams)
+        X = np.empty((n * n, len(GAME_FEATURES)), dtype=np.float32)
+        X[:, :-1] = (values[:, None, :] - values[None, :, :]).reshape(n * n, -1)
+        X[:, -1] = 1.0
+        home_win = self.predict_proba(X).reshape(n, n)
+        np.fill_diagonal(home_win, 0.5)
+        return pd.DataFrame(home_win, index=teams, columns=teams)
+
+    def save(self, path=MODEL_FILE):
+        import joblib
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path=MODEL_FILE) -> 'GameModel':
+        import joblib
+        return joblib.load(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the game-level win probability model on cached game logs")
+    parser.add_argument('--first', type=int, default=1997, help="First season (by ending year)")
+    parser.add_argument('--last', type=int, default=2025, help="Last season (by ending year)")
+    parser.add_argument('--epochs', type=int, default=EPOCHS)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--output', default=MODEL_FILE)
+    args = parser.parse_args(argv)
+
+    try:
+        model = GameModel(epochs=args.epochs).fit_seasons(range(args.first, args.last + 1),
+                                                          args.chunk_size, args.cache_dir)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    model.save(args.output)
+    print(f"Game model saved to {args.output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
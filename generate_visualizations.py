@@ -1,15 +1,23 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.metrics import confusion_matrix
+import matplotlib
+import matplotlib.style
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import os
+import sys
+import argparse
 import json
+import pickle
+import hashlib
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 from matplotlib.patches import Rectangle, ConnectionPatch, FancyBboxPatch
 from matplotlib.offsetbox import OffsetImage, AnnotationBbox
-import matplotlib.image as mpimg
 from matplotlib.font_manager import FontProperties
 import matplotlib.patheffects as path_effects
+from logo_sprites import LogoCache
+from bracket_writer import BracketWriter
 
 class Visualizer:
     def __init__(self):
@@ -52,113 +60,100 @@ class Visualizer:
         }
         
         # Set style for NBA look
-        plt.style.use('default')
+        matplotlib.style.use('default')
         self.round_names = {
             'first_round': 'FIRST ROUND',
             'conference_semis': 'CONFERENCE SEMIFINALS',
             'conference_finals': 'CONFERENCE FINALS',
             'NBA_Finals': 'NBA FINALS'
         }
+
+        # Logos are decoded once from the sprite sheet and reused across charts
+        self.logo_cache = LogoCache()
+
+        # Input hashes of the last render of each chart, used to skip unchanged charts
+        self.render_cache_path = os.path.join(self.output_dir, ".render_cache.json")
+        self._pending = None
         
-    def load_team_logo(self, team_name):
-        """Load team logo from Images/logos directory"""
-        logo_path = os.path.join("Images", "logos", f"{team_name}.png")
-        if os.path.exists(logo_path):
-            return mpimg.imread(logo_path)
-        return None
+    def load_team_logo(self, team_name, size=None):
+        """Load team logo from the cached sprite sheet, optionally resized to size pixels"""
+        return self.logo_cache.get(team_name, size)
 
     def plot_playoff_bracket(self, simulation_results, conference=None):
-        """Create interactive playoff bracket"""
-        # Read the template
-        with open('index.html', 'r') as f:
-            template = f.read()
-
-        # Create a copy of the simulation results to modify
-        bracket_data = simulation_results.copy()
-
-        # Fix the logo paths by removing the leading slash
-        for round_data in bracket_data["rounds"]:
-            for matchup in round_data["matchups"]:
-                if matchup["team1"]:
-                    matchup["team1"]["logo"] = matchup["team1"]["logo"].lstrip('/')
-                if matchup["team2"]:
-                    matchup["team2"]["logo"] = matchup["team2"]["logo"].lstrip('/')
-        
-        # Save the updated HTML with the simulation results
-        output_path = os.path.join(self.output_dir, 'playoff_bracket.html')
-        with open(output_path, 'w') as f:
-            f.write(template.replace(
-                'const bracketData = {',
-                f'const bracketData = {json.dumps(bracket_data, indent=2)}'
-            ))
-
-    def plot_feature_importance(self, models, features, conference):
-        """Plot feature importance for each model"""
-        plt.figure(figsize=(15, 10))
-        
-        for i, (name, model) in enumerate(models.items()):
-            if hasattr(model, 'coef_'):
-                # For logistic regression and SVM
-                importance = np.abs(model.coef_[0])
-            elif hasattr(model, 'feature_importances_'):
-                # For random forest
-                importance = model.feature_importances_
-            else:
-                continue
-            
-            plt.subplot(1, len(models), i+1)
-            sns.barplot(x=importance, y=features)
-            plt.title(f"{name} Feature Importance\n{conference} Conference")
-            plt.xlabel("Importance")
-            plt.tight_layout()
-        
-        plt.savefig(os.path.join(self.output_dir, f"feature_importance_{conference}.png"))
-        plt.close()
+        """Write bracket data for the index.html template
+
+        Only matchups whose odds changed are rewritten; the page picks up the new
+        version from Images/bracket/bracket.json without being regenerated.
+        """
+        writer = BracketWriter(os.path.join(self.output_dir, 'bracket'))
+        return writer.write(simulation_results)
+
+    def plot_feature_importance(self, models, features, conference, X=None, y=None):
+        """Plot feature importance for each model
+
+        With X and y, every model (the RBF SVM included) is ranked by permutation
+        importance on those rows; otherwise coefficients and impurity importances
+        are used and models with neither are left out.
+        """
+        if X is not None and y is not None:
+            from feature_importance import permutation_importance
+            results = permutation_importance(models, X[list(features)], y)
+            importances = {name: result['importance'].to_numpy() for name, result in results.items()}
+        else:
+            importances = {}
+            for name, model in models.items():
+                if hasattr(model, 'coef_'):
+                    # For logistic regression and SVM
+                    importances[name] = np.abs(model.coef_[0])
+                elif hasattr(model, 'feature_importances_'):
+                    # For random forest
+                    importances[name] = model.feature_importances_
+                else:
+                    importances[name] = None
+
+        self._render({
+            'kind': 'feature_importance',
+            'path': os.path.join(self.output_dir, f"feature_importance_{conference}.png"),
+            'figsize': (15, 10),
+            'data': {'importances': importances, 'features': list(features), 'conference': conference}
+        })
 
     def plot_confusion_matrices(self, y_true, predictions, conference):
         """Plot confusion matrices for each model"""
-        plt.figure(figsize=(15, 5))
-        
-        for i, (name, y_pred) in enumerate(predictions.items()):
-            plt.subplot(1, len(predictions), i+1)
-            cm = confusion_matrix(y_true, y_pred)
-            sns.heatmap(cm, annot=True, fmt='d', cmap='Blues')
-            plt.title(f"{name} Confusion Matrix\n{conference} Conference")
-            plt.xlabel("Predicted")
-            plt.ylabel("Actual")
-        
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.output_dir, f"confusion_matrices_{conference}.png"))
-        plt.close()
+        from sklearn.metrics import confusion_matrix
+
+        matrices = {name: confusion_matrix(y_true, y_pred) for name, y_pred in predictions.items()}
+
+        self._render({
+            'kind': 'confusion_matrices',
+            'path': os.path.join(self.output_dir, f"confusion_matrices_{conference}.png"),
+            'figsize': (15, 5),
+            'data': {'matrices': matrices, 'conference': conference}
+        })
 
     def plot_prediction_probabilities(self, probabilities, teams, conference, year=2025):
         """Plot prediction probabilities for each team"""
-        plt.figure(figsize=(12, 8))
-        
         # Calculate average probabilities across models
         avg_proba = np.mean([prob for prob in probabilities.values()], axis=0)
         
         # Sort teams by probability
         sorted_indices = np.argsort(avg_proba)[::-1]
-        sorted_teams = teams[sorted_indices]
+        sorted_teams = np.asarray(teams)[sorted_indices]
         sorted_probas = avg_proba[sorted_indices]
-        
-        # Create bar plot
-        sns.barplot(x=sorted_probas, y=sorted_teams)
-        plt.title(f"{year} Playoff Probabilities - {conference} Conference")
-        plt.xlabel("Probability")
-        plt.axvline(x=0.5, color='red', linestyle='--', alpha=0.5)
-        
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.output_dir, f"playoff_probabilities_{conference}_{year}.png"))
-        plt.close()
 
-    def plot_round_probabilities(self, simulation_results):
+        self._render({
+            'kind': 'prediction_probabilities',
+            'path': os.path.join(self.output_dir, f"playoff_probabilities_{conference}_{year}.png"),
+            'figsize': (12, 8),
+            'data': {'teams': list(sorted_teams), 'probabilities': sorted_probas,
+                     'conference': conference, 'year': year}
+        })
+
+    def plot_round_probabilities(self, simulation_results, dpi=300):
         """Plot round-by-round advancement probabilities for all teams"""
         # Collect probabilities for each team in each round
         team_probs = {}
         rounds = ['first_round', 'conference_semis', 'conference_finals', 'NBA_Finals']
-        round_colors = ['#1f77b4', '#2ca02c', '#ff7f0e', '#d62728']  # Distinct colors for each round
         
         # Process conference rounds
         for conf in ['East', 'West']:
@@ -184,64 +179,206 @@ class Visualizer:
                         team_probs[team] = {r: 0.0 for r in rounds}
                     team_probs[team]['NBA_Finals'] = prob
 
-        # Create plot
-        plt.figure(figsize=(20, 12))
-        
         # Sort teams by their maximum probability across all rounds
         teams = sorted(team_probs.keys(),
                       key=lambda x: max(team_probs[x].values()),
                       reverse=True)
-        x = np.arange(len(teams))
-        width = 0.18
-        multiplier = 0
-
-        # Plot bars for each round
-        bars = []
-        for round_name, color in zip(rounds, round_colors):
-            probs = [team_probs[team][round_name] for team in teams]
-            offset = width * multiplier
-            bar = plt.bar(x + offset, probs, width,
-                         label=self.round_names[round_name],
-                         color=color,
-                         alpha=0.8)
-            
-            # Add percentage labels on bars
-            for i, prob in enumerate(probs):
-                if prob > 0.02:  # Only show labels for probabilities > 2%
-                    plt.text(x[i] + offset, prob, f'{prob:.0%}',
-                            ha='center', va='bottom',
-                            fontsize=8, rotation=90)
-            
-            bars.append(bar)
-            multiplier += 1
 
-        # Enhance plot styling
-        plt.xlabel('Teams', fontsize=12, labelpad=10)
-        plt.ylabel('Probability', fontsize=12, labelpad=10)
-        plt.title('NBA Playoff Round Advancement Probabilities',
-                 fontsize=16, pad=20)
-        
-        # Rotate team names for better readability
-        plt.xticks(x + width * 1.5, teams, rotation=45, ha='right',
-                  fontsize=10)
-        plt.yticks(fontsize=10)
-        
-        # Add legend with enhanced positioning and styling
-        plt.legend(loc='upper right', bbox_to_anchor=(1, 1),
-                  fontsize=10, framealpha=0.9)
+        # Save with high DPI for better quality
+        self._render({
+            'kind': 'round_probabilities',
+            'path': os.path.join(self.output_dir, "round_probabilities.png"),
+            'figsize': (20, 12),
+            'dpi': dpi,
+            'bbox_inches': 'tight',
+            'data': {'teams': teams,
+                     'probabilities': {r: [team_probs[team][r] for team in teams] for r in rounds},
+                     'round_labels': [self.round_names[r] for r in rounds]}
+        })
+
+    @contextmanager
+    def batch(self, processes=None):
+        """Collect charts plotted inside the block and render them together in a process pool
+
+        Args:
+            processes: Number of worker processes (defaults to one per CPU)
+        """
+        self._pending = []
+        try:
+            yield self
+            pending, self._pending = self._pending, None
+            self.render_charts(pending, processes)
+        finally:
+            self._pending = None
+
+    def render_charts(self, jobs, processes=None):
+        """Render chart jobs in parallel, skipping any whose inputs haven't changed
+
+        Returns:
+            List of output paths that were rendered
+        """
+        cache = self._load_render_cache()
+        stale = []
+        for job in jobs:
+            digest = chart_hash(job)
+            if cache.get(job['path']) == digest and os.path.exists(job['path']):
+                print(f"Unchanged, skipping: {job['path']}")
+                continue
+            stale.append((job, digest))
+
+        if len(stale) > 1 and processes != 1:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                rendered = list(executor.map(render_chart, [job for job, _ in stale]))
+        else:
+            rendered = [render_chart(job) for job, _ in stale]
+
+        for job, digest in stale:
+            cache[job['path']] = digest
+        self._save_render_cache(cache)
+        return rendered
+
+    def _render(self, job):
+        """Render a chart now, or queue it when inside a batch"""
+        if self._pending is not None:
+            self._pending.append(job)
+        else:
+            self.render_charts([job], processes=1)
+
+    def _load_render_cache(self):
+        if os.path.exists(self.render_cache_path):
+            with open(self.render_cache_path, 'r') as f:
+                return json.load(f)
+        return {}
+
+    def _save_render_cache(self, cache):
+        with open(self.render_cache_path, 'w') as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+
+
+def chart_hash(job):
+    """Hash of everything that determines a chart's pixels"""
+    digest = hashlib.sha256()
+    digest.update(pickle.dumps({k: v for k, v in job.items() if k != 'data'}, protocol=4))
+    digest.update(pickle.dumps(_hashable(job['data']), protocol=4))
+    return digest.hexdigest()
+
+
+def _hashable(value):
+    """Convert arrays to bytes so equal inputs always pickle identically"""
+    if isinstance(value, np.ndarray):
+        return (value.dtype.str, value.shape, value.tobytes())
+    if isinstance(value, dict):
+        return sorted((str(k), _hashable(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return [_hashable(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def render_chart(job):
+    """Draw a chart job on a standalone Agg figure and save it (safe to run in a worker process)"""
+    fig = Figure(figsize=job['figsize'])
+    FigureCanvasAgg(fig)
+    CHART_DRAWERS[job['kind']](fig, **job['data'])
+    fig.savefig(job['path'], dpi=job.get('dpi'), bbox_inches=job.get('bbox_inches'))
+    return job['path']
+
+
+def draw_feature_importance(fig, importances, features, conference):
+    import seaborn as sns
+
+    for i, (name, importance) in enumerate(importances.items()):
+        if importance is None:
+            continue
         
-        # Add grid for better readability
-        plt.grid(True, axis='y', alpha=0.3, linestyle='--')
+        ax = fig.add_subplot(1, len(importances), i+1)
+        sns.barplot(x=importance, y=features, ax=ax)
+        ax.set_title(f"{name} Feature Importance\n{conference} Conference")
+        ax.set_xlabel("Importance")
+        fig.tight_layout()
+
+
+def draw_confusion_matrices(fig, matrices, conference):
+    import seaborn as sns
+
+    for i, (name, cm) in enumerate(matrices.items()):
+        ax = fig.add_subplot(1, len(matrices), i+1)
+        sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', ax=ax)
+        ax.set_title(f"{name} Confusion Matrix\n{conference} Conference")
+        ax.set_xlabel("Predicted")
+        ax.set_ylabel("Actual")
+    
+    fig.tight_layout()
+
+
+def draw_prediction_probabilities(fig, teams, probabilities, conference, year):
+    import seaborn as sns
+
+    ax = fig.add_subplot()
+    
+    # Create bar plot
+    sns.barplot(x=probabilities, y=teams, ax=ax)
+    ax.set_title(f"{year} Playoff Probabilities - {conference} Conference")
+    ax.set_xlabel("Probability")
+    ax.axvline(x=0.5, color='red', linestyle='--', alpha=0.5)
+    
+    fig.tight_layout()
+
+
+def draw_round_probabilities(fig, teams, probabilities, round_labels):
+    ax = fig.add_subplot()
+    round_colors = ['#1f77b4', '#2ca02c', '#ff7f0e', '#d62728']  # Distinct colors for each round
+    
+    x = np.arange(len(teams))
+    width = 0.18
+    multiplier = 0
+
+    # Plot bars for each round
+    for probs, label, color in zip(probabilities.values(), round_labels, round_colors):
+        offset = width * multiplier
+        ax.bar(x + offset, probs, width, label=label, color=color, alpha=0.8)
         
-        # Adjust layout to prevent label cutoff
-        plt.tight_layout()
+        # Add percentage labels on bars
+        for i, prob in enumerate(probs):
+            if prob > 0.02:  # Only show labels for probabilities > 2%
+                ax.text(x[i] + offset, prob, f'{prob:.0%}',
+                        ha='center', va='bottom',
+                        fontsize=8, rotation=90)
         
-        # Save with high DPI for better quality
-        plt.savefig(os.path.join(self.output_dir, "round_probabilities.png"),
-                   dpi=300, bbox_inches='tight')
-        plt.close()
+        multiplier += 1
 
-if __name__ == "__main__":
+    # Enhance plot styling
+    ax.set_xlabel('Teams', fontsize=12, labelpad=10)
+    ax.set_ylabel('Probability', fontsize=12, labelpad=10)
+    ax.set_title('NBA Playoff Round Advancement Probabilities',
+                 fontsize=16, pad=20)
+    
+    # Rotate team names for better readability
+    ax.set_xticks(x + width * 1.5, teams, rotation=45, ha='right',
+                  fontsize=10)
+    ax.tick_params(axis='y', labelsize=10)
+    
+    # Add legend with enhanced positioning and styling
+    ax.legend(loc='upper right', bbox_to_anchor=(1, 1),
+              fontsize=10, framealpha=0.9)
+    
+    # Add grid for better readability
+    ax.grid(True, axis='y', alpha=0.3, linestyle='--')
+    
+    # Adjust layout to prevent label cutoff
+    fig.tight_layout()
+
+
+CHART_DRAWERS = {
+    'feature_importance': draw_feature_importance,
+    'confusion_matrices': draw_confusion_matrices,
+    'prediction_probabilities': draw_prediction_probabilities,
+    'round_probabilities': draw_round_probabilities,
+}
+
+def main(argv=None):
+    argparse.ArgumentParser(description="Chart feature importance, confusion matrices and playoff probabilities").parse_args(argv)
     from preprocess_data import DataPreprocessor
     from train_models import ModelTrainer
     
@@ -260,29 +397,36 @@ if __name__ == "__main__":
     # Initialize visualizer
     visualizer = Visualizer()
     
-    # Generate visualizations for each conference
-    for conf_data, conf_name in [(east_data, 'East'), (west_data, 'West')]:
-        # Prepare recent data
-        X_recent = conf_data[conf_data['Year'] == 2024][preprocessor.features]
-        y_recent = conf_data[conf_data['Year'] == 2024][preprocessor.target]
-        teams = conf_data[conf_data['Year'] == 2024]['Team']
-        
-        # Get predictions
-        predictions, probabilities, _, _ = trainer.predict_playoffs(X_recent, conf_name)
-        
-        # Generate visualizations
-        visualizer.plot_feature_importance(
-            trainer.trained_models[conf_name],
-            preprocessor.features,
-            conf_name
-        )
-        
-        visualizer.plot_confusion_matrices(y_recent, predictions, conf_name)
+    # Generate visualizations for each conference, rendered together in a process pool
+    with visualizer.batch():
+        for conf_data, conf_name in [(east_data, 'East'), (west_data, 'West')]:
+            # Prepare recent data
+            X_recent = conf_data[conf_data['Year'] == 2024][preprocessor.features]
+            y_recent = conf_data[conf_data['Year'] == 2024][preprocessor.target]
+            teams = conf_data[conf_data['Year'] == 2024]['Team']
+            
+            # Get predictions
+            predictions, probabilities, _, _ = trainer.predict_playoffs(X_recent, conf_name)
+            
+            # Generate visualizations
+            visualizer.plot_feature_importance(
+                trainer.trained_models[conf_name],
+                preprocessor.features,
+                conf_name,
+                X_recent,
+                y_recent
+            )
+            
+            visualizer.plot_confusion_matrices(y_recent, predictions, conf_name)
+            
+            visualizer.plot_prediction_probabilities(
+                probabilities,
+                teams.values,
+                conf_name
+            )
         
-        visualizer.plot_prediction_probabilities(
-            probabilities,
-            teams.values,
-            conf_name
-        )
-    
-    print("Visualizations generated!")
\ No newline at end of file
+    print("Visualizations generated!")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+import os
+import sys
+import json
+import queue
+import argparse
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from bracket_writer import BracketWriter, bracket_cells
+
+SIMULATIONS_PATH = os.path.join("NBA_data", "playoff_simulations.json")
+
+
+def bracket_diff(old_cells, new_cells):
+    """Cells whose matchup changed between two bracket_cells snapshots"""
+    return {key: matchup for key, matchup in new_cells.items()
+            if key not in old_cells or old_cells[key] != matchup}
+
+
+class BracketBroadcaster:
+    """Keep the latest bracket and push per-matchup diffs to subscribed pages"""
+
+    def __init__(self, writer=None):
+        self.writer = writer
+        self.cells = {}
+        self.version = 0
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        """Register a page; it is first sent the full bracket as a single patch"""
+        subscriber = queue.Queue()
+        with self._lock:
+            self._subscribers.add(subscriber)
+            if self.cells:
+                subscriber.put(self._event(self.cells))
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, simulation_results):
+        """Publish new simulator output, sending only the matchups that changed
+
+        Returns:
+            Dictionary of the changed cells
+        """
+        cells = bracket_cells(simulation_results)
+        with self._lock:
+            changed = bracket_diff(self.cells, cells)
+            if not changed:
+                return changed
+            self.cells = cells
+            self.version += 1
+            event = self._event(changed)
+            for subscriber in self._subscribers:
+                subscriber.put(event)
+
+        # Keep the static files current for pages that load after this update
+        if self.writer is not None:
+            self.writer.write(simulation_results)
+        return changed
+
+    def _event(self, cells):
+        data = json.dumps({"version": self.version, "matchups": cells}, separators=(',', ':'))
+        return f"event: patch\ndata: {data}\n\n".encode()
+
+    def watch(self, path, interval=1.0, stop_event=None):
+        """Poll a simulations JSON file and publish it whenever it changes"""
+        stop_event = stop_event or threading.Event()
+        last_mtime = None
+        while not stop_event.is_set():
+            try:
+                mtime = os.stat(path).st_mtime_ns
+                if mtime != last_mtime:
+                    with open(path, 'r') as f:
+                        results = json.load(f)
+                    last_mtime = mtime
+                    changed = self.publish(results)
+                    if changed:
+                        print(f"Published {len(changed)} changed matchups from {path}")
+            except (OSError, ValueError) as e:
+                # The file may be missing or mid-write; try again next poll
+                print(f"Warning: could not read {path}: {str(e)}")
+            stop_event.wait(interval)
+
+
+class LiveBracketHandler(SimpleHTTPRequestHandler):
+    """Serve the site and stream bracket patches as Server-Sent Events on /events"""
+
+    broadcaster = None
+    keepalive_interval = 15.0
+
+    def do_GET(self):
+        if self.path.split('?')[0] == '/events':
+            self._stream_events()
+        else:
+            super().do_GET()
+
+    def _stream_events(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'keep-alive')
+        self.end_headers()
+
+        subscriber = self.broadcaster.subscribe()
+        try:
+            while True:
+                try:
+                    message = subscriber.get(timeout=self.keepalive_interval)
+                except queue.Empty:
+                    message = b": keepalive\n\n"
+                self.wfile.write(message)
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.broadcaster.unsubscribe(subscriber)
+
+    def log_message(self, format, *args):
+        if self.path.split('?')[0] != '/events':
+            super().log_message(format, *args)
+
+
+def create_server(broadcaster, host='127.0.0.1', port=8000, directory='.'):
+    """Create the HTTP server; call serve_forever() on the result to run it"""
+    handler = type('Handler', (LiveBracketHandler,), {'broadcaster': broadcaster})
+    server = ThreadingHTTPServer((host, port), partial(handler, directory=directory))
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve index.html with live bracket updates")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--watch', default=SIMULATIONS_PATH,
+                        help="Simulation results file to watch for changes")
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help="Seconds between checks of the watched file")
+    args = parser.parse_args(argv)
+
+    broadcaster = BracketBroadcaster(BracketWriter())
+    threading.Thread(target=broadcaster.watch, args=(args.watch, args.interval), daemon=True).start()
+
+    server = create_server(broadcaster, args.host, args.port)
+    print(f"Serving live bracket on http://{args.host}:{args.port}/index.html")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+import os
+import json
+import math
+
+import numpy as np
+from PIL import Image
+
+LOGOS_DIR = os.path.join("Images", "logos")
+SPRITE_PATH = os.path.join(LOGOS_DIR, "sprite.png")
+SPRITE_INDEX_PATH = os.path.join(LOGOS_DIR, "sprite.json")
+SPRITE_CSS_PATH = os.path.join("static", "logos.css")
+
+# Cell size of the sprite sheet; large enough for chart thumbnails, and scaled
+# down by CSS to the bracket's 36px logo box
+SPRITE_CELL = 128
+SPRITE_COLUMNS = 6
+DISPLAY_SIZE = 36
+
+
+def team_slug(team_name):
+    """CSS-safe class suffix for a team, e.g. 'Trail Blazers' -> 'trail-blazers'"""
+    return team_name.lower().replace(' ', '-')
+
+
+def build_sprite_sheet(logos_dir=LOGOS_DIR, output_path=SPRITE_PATH, index_path=SPRITE_INDEX_PATH,
+                       css_path=SPRITE_CSS_PATH, cell=SPRITE_CELL, columns=SPRITE_COLUMNS,
+                       display_size=DISPLAY_SIZE):
+    """Pack every team logo into one sprite sheet with a JSON index and CSS offsets
+
+    Args:
+        logos_dir: Directory holding the full-size {team}.png logos
+        output_path: Where to write the sprite sheet PNG
+        index_path: Where to write the {"cell": cell, "teams": {team: [x, y]}} index
+        css_path: Where to write the stylesheet for index.html (None to skip)
+        cell: Pixel size of each sprite cell
+        columns: Number of cells per sprite row
+        display_size: Pixel size the CSS renders each logo at
+
+    Returns:
+        Dictionary mapping team name to its (x, y) offset in the sheet
+    """
+    teams = sorted(os.path.splitext(name)[0] for name in os.listdir(logos_dir)
+                   if name.endswith('.png') and name != os.path.basename(output_path))
+    if not teams:
+        print(f"No logos found in {logos_dir}")
+        return {}
+
+    rows = math.ceil(len(teams) / columns)
+    sheet = Image.new('RGBA', (columns * cell, rows * cell), (0, 0, 0, 0))
+    offsets = {}
+
+    for i, team in enumerate(teams):
+        x, y = (i % columns) * cell, (i // columns) * cell
+        with Image.open(os.path.join(logos_dir, f"{team}.png")) as logo:
+            logo = logo.convert('RGBA')
+            logo.thumbnail((cell, cell), Image.LANCZOS)
+            # Center logos that aren't square
+            sheet.paste(logo, (x + (cell - logo.width) // 2, y + (cell - logo.height) // 2))
+        offsets[team] = (x, y)
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    sheet.save(output_path, optimize=True)
+
+    with open(index_path, 'w') as f:
+        json.dump({
+            'cell': cell,
+            'teams': {team: [x, y] for team, (x, y) in offsets.items()}
+        }, f, indent=2, sort_keys=True)
+
+    if css_path:
+        write_sprite_css(offsets, css_path, output_path, cell, columns, rows, display_size)
+
+    print(f"Packed {len(teams)} logos into {output_path}")
+    return offsets
+
+
+def write_sprite_css(offsets, css_path, sprite_path, cell, columns, rows, display_size):
+    """Write background-position rules for each team's sprite cell"""
+    scale = display_size / cell
+    sprite_url = os.path.relpath(sprite_path, os.path.dirname(css_path)).replace(os.sep, '/')
+
+    lines = [
+        "/* Generated by logo_sprites.py - do not edit */",
+        ".team-sprite {",
+        "    display: inline-block;",
+        f"    width: {display_size}px;",
+        f"    height: {display_size}px;",
+        f"    background-image: url('{sprite_url}');",
+        f"    background-size: {columns * cell * scale:g}px {rows * cell * scale:g}px;",
+        "    background-repeat: no-repeat;",
+        "}",
+        "",
+    ]
+    for team, (x, y) in sorted(offsets.items()):
+        lines.append(f".logo-{team_slug(team)} {{ background-position: {-x * scale:g}px {-y * scale:g}px; }}")
+
+    os.makedirs(os.path.dirname(css_path), exist_ok=True)
+    with open(css_path, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+
+
+class LogoCache:
+    """In-memory cache of decoded team logos keyed by (team, size)
+
+    The sprite sheet is decoded once on first use and each logo is cut out of it
+    and resized at most once per size. Teams missing from the sprite fall back to
+    their individual PNG.
+    """
+
+    def __init__(self, sprite_path=SPRITE_PATH, index_path=SPRITE_INDEX_PATH, logos_dir=LOGOS_DIR):
+        self.sprite_path = sprite_path
+        self.index_path = index_path
+        self.logos_dir = logos_dir
+        self._sheet = None
+        self._index = None
+        self._logos = {}
+
+    def _load_sheet(self):
+        if self._index is None:
+            self._index = {}
+            if os.path.exists(self.sprite_path) and os.path.exists(self.index_path):
+                with open(self.index_path, 'r') as f:
+                    index = json.load(f)
+                with Image.open(self.sprite_path) as sheet:
+                    self._sheet = sheet.convert('RGBA')
+                self._index = {team: (x, y, index['cell']) for team, (x, y) in index['teams'].items()}
+
+    def _load_image(self, team_name):
+        self._load_sheet()
+        if team_name in self._index:
+            x, y, cell = self._index[team_name]
+            return self._sheet.crop((x, y, x + cell, y + cell))
+
+        logo_path = os.path.join(self.logos_dir, f"{team_name}.png")
+        if os.path.exists(logo_path):
+            with Image.open(logo_path) as logo:
+                return logo.convert('RGBA')
+        return None
+
+    def get(self, team_name, size=None):
+        """Get a team logo as a float RGBA array (like mpimg.imread), or None
+
+        Args:
+            team_name: Team name, e.g. 'Thunder'
+            size: Square pixel size to return; None keeps the stored size
+        """
+        key = (team_name, size)
+        if key not in self._logos:
+            image = self._load_image(team_name)
+            if image is not None:
+                if size is not None and image.size != (size, size):
+                    image = image.resize((size, size), Image.LANCZOS)
+                image = np.asarray(image, dtype=np.float32) / 255.0
+            self._logos[key] = image
+        return self._logos[key]
+
+    def clear(self):
+        """Drop all decoded logos and the sprite sheet"""
+        self._sheet = None
+        self._index = None
+        self._logos = {}
+
+
+if __name__ == "__main__":
+    build_sprite_sheet()
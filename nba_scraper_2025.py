@@ -1,16 +1,23 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
+import argparse
 import json
 from datetime import datetime
 from nba_api.stats.endpoints import leaguegamefinder, teamestimatedmetrics, leaguestandings
 from nba_api.stats.static import teams
 import time
 
+from game_log import pair_games, season_string
+from ratings import MasseyRatings
+from form_features import FORM_HALFLIFE, FORM_WINDOWS, FormFeatures, team_games
+from data_loading import compact_dtypes, report_memory
+
 class NBAScraper:
-    def __init__(self):
+    def __init__(self, cache_dir="NBA_data/cache"):
         self.nba_teams = teams.get_teams()
-        self.cache_dir = "NBA_data/cache"
+        self.cache_dir = cache_dir
         if not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir)
     
@@ -43,8 +50,7 @@ class NBAScraper:
             year = current_year
         
         try:
-            # Get season string (e.g., "2024-25" for 2025)
-            season = f"{year-1}-{str(year)[2:]}"
+            season = season_string(year)
             
             # Get standings data
             print("Fetching standings data...")
@@ -81,6 +87,22 @@ class NBAScraper:
                 games_df = gamefinder.get_data_frames()[0]
                 self._save_cache("games", season, games_df.to_dict('records'))
             
+            # Margin-of-victory ratings and form from this season's games. Early in the
+            # season the game log can be empty or partial, so a failure here keeps the
+            # team stats: SRS falls back to the estimated net rating and form is left out
+            try:
+                played = pair_games(games_df).dropna(subset=['HOME_MARGIN'])
+                srs = MasseyRatings(ridge=0.0).fit(played).ratings
+            except Exception as e:
+                print(f"Warning: Could not fit SRS from the game log ({e}); using net rating")
+                srs = pd.Series(dtype=float)
+            try:
+                # Rolling and exponentially weighted form over the same games
+                form = self.get_form(season, games_df)
+            except Exception as e:
+                print(f"Warning: Could not compute form from the game log ({e}); leaving it out")
+                form = pd.DataFrame()
+            
             # Process standings data
             team_data = []
             for _, team in standings_df.iterrows():
@@ -88,12 +110,12 @@ class NBAScraper:
                     team_id = team['TeamID']
                     
                     # Get team games
-                    team_games = games_df[games_df['TEAM_ID'] == team_id]
+                    team_rows = games_df[games_df['TEAM_ID'] == team_id]
                     
                     # Calculate points per game
-                    if not team_games.empty:
-                        ppg = team_games['PTS'].mean()
-                        point_diff = team_games['PLUS_MINUS'].mean() if 'PLUS_MINUS' in team_games else 0
+                    if not team_rows.empty:
+                        ppg = team_rows['PTS'].mean()
+                        point_diff = team_rows['PLUS_MINUS'].mean() if 'PLUS_MINUS' in team_rows else 0
                         papg = ppg - point_diff
                     else:
                         ppg = float(team['PointsPG']) if 'PointsPG' in team else 0
@@ -110,6 +132,11 @@ class NBAScraper:
                     else:
                         team_metrics = team_metrics.iloc[0]
                     
+                    # Teams without a margin rating yet fall back to their net rating
+                    team_srs = srs.get(team['TeamName'])
+                    if pd.isna(team_srs):
+                        team_srs = float(team_metrics['E_NET_RATING'])
+                    
                     # Map conference name
                     conference = team['Conference']
                     if conference == 'Eastern':
@@ -126,7 +153,7 @@ class NBAScraper:
                         'GB': float(team['ConferenceGamesBack']) if team['ConferenceGamesBack'] != '-' else 0.0,
                         'PS/G': ppg,
                         'PA/G': papg,
-                        'SRS': None,  # Not available in API
+                        'SRS': team_srs,
                         'Year': year,
                         'FG': float(team_metrics['E_OFF_RATING']),
                         'FGA': float(team_metrics['E_DEF_RATING']),
@@ -150,6 +177,8 @@ class NBAScraper:
                         'PF': 0.0,  # Not directly available
                         'PTS': ppg
                     }
+                    if team['TeamName'] in form.index:
+                        team_info.update(form.loc[team['TeamName']].to_dict())
                     
                     team_data.append(team_info)
                     
@@ -162,8 +191,9 @@ class NBAScraper:
                 return None
             
             # Create DataFrame
-            df = pd.DataFrame(team_data)
+            df = compact_dtypes(pd.DataFrame(team_data))
             print(f"Successfully fetched data for {len(df)} teams.")
+            report_memory(df, f"{season} season data")
             
             # Verify conference distribution
             east_count = len(df[df['Conference'] == 'East'])
@@ -176,7 +206,42 @@ class NBAScraper:
             print(f"Error fetching data: {str(e)}")
             return None
 
-if __name__ == "__main__":
+    def get_form(self, season, games_df):
+        """Current form of every team, applying only games not seen on the last run
+        
+        The FormFeatures state is saved next to the cached game results, so a
+        refresh after new games costs time proportional to those games.
+        """
+        path = os.path.join(self.cache_dir, f"form_{season}.npz")
+        games = team_games(games_df)
+        expected = FormFeatures(FORM_WINDOWS, FORM_HALFLIFE)
+        form = FormFeatures.load(path) if os.path.exists(path) else None
+        if form is not None and form.windows == expected.windows and np.isclose(form.alpha, expected.alpha):
+            new_rows = form.update(games)
+            print(f"Updated form with {len(new_rows)} new team games")
+        else:
+            form = expected
+            form.fit(games)
+        form.save(path)
+        return form.current().set_index('Team')
+
+    def get_game_log(self, year=2025):
+        """Get one row per regular season game with the home team's margin
+        
+        Uses the same cached leaguegamefinder results as get_season_data.
+        """
+        season = season_string(year)
+        cached_games = self._load_cache("games", season)
+        if cached_games:
+            games_df = pd.DataFrame(cached_games)
+        else:
+            gamefinder = leaguegamefinder.LeagueGameFinder(season_nullable=season)
+            games_df = gamefinder.get_data_frames()[0]
+            self._save_cache("games", season, games_df.to_dict('records'))
+        return pair_games(games_df)
+
+def main(argv=None):
+    argparse.ArgumentParser(description="Fetch the current season's team data from the NBA stats API").parse_args(argv)
     # Create NBA_data directory if it doesn't exist
     if not os.path.exists("NBA_data"):
         os.makedirs("NBA_data")
@@ -191,7 +256,7 @@ if __name__ == "__main__":
         print("Current season data saved to 'NBA_data/current_season.csv'")
     else:
         print("Error: Failed to fetch current season data")
-        exit(1)
+        return 1
     
     # Get historical data (last 5 seasons for training)
     print("\nFetching historical data...")
@@ -211,4 +276,8 @@ if __name__ == "__main__":
         print("\nHistorical data saved to 'NBA_data/historical_data.csv'")
     else:
         print("Error: Failed to fetch historical data")
-        exit(1)
\ No newline at end of file
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
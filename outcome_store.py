@@ -0,0 +1,293 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr
+from typing import Dict, List, Tuple
+
+from playoff_simulator import PlayoffSimulator, BRACKET_SEEDS, HOME_COURT_PATTERN, ROUND_COLUMNS
+from sampling_kernel import ThresholdSampler, probability_thresholds
+
+OUTCOMES_DIR = os.path.join("NBA_data", "outcomes")
+WINNERS_FILE = "winners.npy"
+META_FILE = "meta.json"
+
+# Per-trial game probabilities are looked up on a grid of expected margins rather
+# than evaluated with ndtr for every game (error under 1e-4 in probability)
+MARGIN_STEP = 0.005
+MARGIN_LIMIT = 60.0
+
+
+def bracket_slots(conferences: List[Tuple[str, int]]) -> List[Dict]:
+    """Every series (and play-in game) of the bracket in the order it is played
+
+    Each slot names its two participants as either a fixed team code or the winner
+    or loser of an earlier slot, so a trial only needs to store the winner of every
+    slot to recover the whole bracket.
+
+    Args:
+        conferences: (conference, number of teams) in field order, as from
+            PlayoffSimulator._playoff_field
+
+    Returns:
+        List of {name, round, sources} dictionaries
+    """
+    slots = []
+
+    def add(name, round_index, sources):
+        slots.append({"name": name, "round": round_index, "sources": sources})
+        return len(slots) - 1
+
+    conf_champions = []
+    offset = 0
+    for conf, n_conf in conferences:
+        def team(seed):
+            return ["team", offset + seed - 1]
+
+        # 7 hosts 8, 9 hosts 10, then the 7/8 loser hosts the 9/10 winner
+        game_7_8 = add(f"{conf} play-in 7/8", -1, [team(7), team(8)])
+        game_9_10 = add(f"{conf} play-in 9/10", -1, [team(9), team(10)])
+        play_in_final = add(f"{conf} play-in final", -1, [["loser", game_7_8], ["winner", game_9_10]])
+        seed_sources = {seed: team(seed) for seed in range(1, 7)}
+        seed_sources[7] = ["winner", game_7_8]
+        seed_sources[8] = ["winner", play_in_final]
+
+        first_round = [add(f"{conf} first round {seed1}v{seed2}", 0, [seed_sources[seed1], seed_sources[seed2]])
+                       for seed1, seed2 in BRACKET_SEEDS]
+        semis = [add(f"{conf} semifinal {i + 1}", 1,
+                     [["winner", first_round[2 * i]], ["winner", first_round[2 * i + 1]]])
+                 for i in range(2)]
+        conf_champions.append(add(f"{conf} conference finals", 2,
+                                  [["winner", semis[0]], ["winner", semis[1]]]))
+        offset += n_conf
+
+    add("Finals", 3, [["winner", conf_champions[0]], ["winner", conf_champions[1]]])
+    return slots
+
+
+class OutcomeStore:
+    """Per-trial series winners on disk with vectorized probability queries
+
+    Winners are stored slot-major as small integer team codes in a memory-mapped
+    .npy file, so each query reads only the slots it touches. Events are boolean
+    arrays over trials and combine with &, | and ~.
+    """
+
+    def __init__(self, path: str = OUTCOMES_DIR):
+        self.path = path
+        with open(os.path.join(path, META_FILE), 'r') as f:
+            meta = json.load(f)
+        self.teams = meta['teams']
+        self.slots = meta['slots']
+        self.winners = np.load(os.path.join(path, WINNERS_FILE), mmap_mode='r')
+        self.n_trials = self.winners.shape[1]
+        self._team_codes = {team: code for code, team in enumerate(self.teams)}
+        self._slot_index = {slot['name']: i for i, slot in enumerate(self.slots)}
+        self._participants = {}
+
+    def code(self, team: str) -> int:
+        if team not in self._team_codes:
+            raise ValueError(f"Unknown team: {team}")
+        return self._team_codes[team]
+
+    def slot(self, name) -> int:
+        """Index of a slot given its index or name"""
+        if isinstance(name, (int, np.integer)):
+            return int(name)
+        if name not in self._slot_index:
+            raise ValueError(f"Unknown series slot: {name}")
+        return self._slot_index[name]
+
+    def winner(self, slot) -> np.ndarray:
+        """Winner code of a slot in every trial"""
+        return np.asarray(self.winners[self.slot(slot)])
+
+    def participants(self, slot) -> Tuple[np.ndarray, np.ndarray]:
+        """Codes of the two teams in a slot in every trial"""
+        index = self.slot(slot)
+        if index not in self._participants:
+            sides = []
+            for kind, value in self.slots[index]['sources']:
+                if kind == 'team':
+                    sides.append(np.full(self.n_trials, value, dtype=self.winners.dtype))
+                elif kind == 'winner':
+                    sides.append(self.winner(value))
+                else:
+                    sides.append(self.loser(value))
+            self._participants[index] = tuple(sides)
+        return self._participants[index]
+
+    def loser(self, slot) -> np.ndarray:
+        """Loser code of a slot in every trial"""
+        team1, team2 = self.participants(slot)
+        winner = self.winner(slot)
+        return np.where(winner == team1, team2, team1)
+
+    def _round_slots(self, round_index: int) -> List[int]:
+        return [i for i, slot in enumerate(self.slots) if slot['round'] == round_index]
+
+    def wins(self, team: str, slot) -> np.ndarray:
+        """Trials in which team won the given slot"""
+        return self.winner(slot) == self.code(team)
+
+    def beat(self, winner: str, loser: str) -> np.ndarray:
+        """Trials in which winner beat loser in any series or play-in game"""
+        winner_code, loser_code = self.code(winner), self.code(loser)
+        event = np.zeros(self.n_trials, dtype=bool)
+        for index in range(len(self.slots)):
+            event |= (self.winner(index) == winner_code) & (self.loser(index) == loser_code)
+        return event
+
+    def reaches(self, team: str, column: str = 'champion') -> np.ndarray:
+        """Trials in which team reached a round, named as in ROUND_COLUMNS"""
+        code = self.code(team)
+        event = np.zeros(self.n_trials, dtype=bool)
+        if column == 'make_playoffs':
+            for index in self._round_slots(0):
+                team1, team2 = self.participants(index)
+                event |= (team1 == code) | (team2 == code)
+        else:
+            for index in self._round_slots(ROUND_COLUMNS.index(column) - 1):
+                event |= self.winner(index) == code
+        return event
+
+    def probability(self, event: np.ndarray, given: np.ndarray = None) -> float:
+        """Probability of an event, optionally conditional on another
+
+        Joint probabilities are probability(a & b). Returns NaN when the
+        conditioning event never happened.
+        """
+        if given is None:
+            return float(np.mean(event))
+        n_given = np.count_nonzero(given)
+        if n_given == 0:
+            return float('nan')
+        return float(np.count_nonzero(event & given) / n_given)
+
+    def conditional_odds(self, given: np.ndarray) -> pd.DataFrame:
+        """Round-by-round odds for every team across the trials where given holds"""
+        rows = []
+        for team in self.teams:
+            row = {'Team': team}
+            for column in ROUND_COLUMNS:
+                row[column] = self.probability(self.reaches(team, column), given)
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+
+def trial_blocks(simulator: PlayoffSimulator, bracket: Dict, slots: List[Dict],
+                 n_trials: int, block_size: int, seed=None):
+    """Simulate full brackets a block of trials at a time
+
+    Only one block is ever held in memory, so callers can stream any number of
+    trials through it. When the bracket carries per-team rating uncertainty, every
+    trial first draws its own rating for each team and plays its games from those
+    (ignoring any matrix set with use_win_probabilities).
+
+    Args:
+        simulator: Simulator whose ratings model and parameters are used
+        bracket: Playoff field from PlayoffSimulator._playoff_field
+        slots: Bracket slots from bracket_slots
+        n_trials: Total number of brackets to simulate
+        block_size: Trials per block
+        seed: Seed for the sampler
+
+    Yields:
+        (winners, losers) uint8 team codes of shape (n_slots, trials in block)
+    """
+    home_win = simulator.bracket_home_win(bracket)
+
+    # Thresholds for the home team winning when hosting and when on the road
+    host_thresholds = probability_thresholds(home_win)
+    road_thresholds = probability_thresholds(1.0 - home_win.T)
+    priority = bracket['home_priority']
+    rating_sd = bracket.get('rating_sd')
+    sampler = ThresholdSampler(seed)
+
+    if rating_sd is not None:
+        margins = np.arange(-round(MARGIN_LIMIT / MARGIN_STEP), round(MARGIN_LIMIT / MARGIN_STEP) + 1) * MARGIN_STEP
+        n_grid = len(margins)
+        host_table = probability_thresholds(ndtr((margins + simulator.home_court_advantage) / simulator.game_sd))
+        road_table = probability_thresholds(ndtr((margins - simulator.home_court_advantage) / simulator.game_sd))
+
+    for start in range(0, n_trials, block_size):
+        count = min(block_size, n_trials - start)
+        winners = np.empty((len(slots), count), dtype=np.uint8)
+        losers = np.empty_like(winners)
+
+        if rating_sd is None:
+            def thresholds(home, road):
+                return host_thresholds[home, road], road_thresholds[home, road]
+        else:
+            # Ratings are drawn straight into margin grid units so a game's threshold
+            # is one subtraction and one table lookup
+            grid_scale = np.float32(simulator.rating_scale / MARGIN_STEP)
+            grid_ratings = (bracket['ratings'].astype(np.float32) * grid_scale
+                            + rating_sd.astype(np.float32) * grid_scale
+                            * sampler.standard_normal((count, len(rating_sd)))).ravel()
+            row_start = np.arange(count, dtype=np.int64) * len(rating_sd)
+
+            def thresholds(home, road):
+                grid_index = (grid_ratings[row_start + home] - grid_ratings[row_start + road]
+                              + np.float32(n_grid // 2 + 0.5)).astype(np.int32)
+                np.clip(grid_index, 0, n_grid - 1, out=grid_index)
+                return host_table[grid_index], road_table[grid_index]
+
+        for index, slot in enumerate(slots):
+            team1, team2 = [np.full(count, value, dtype=np.uint8) if kind == 'team'
+                            else (winners if kind == 'winner' else losers)[value]
+                            for kind, value in slot['sources']]
+
+            if slot['round'] < 0:
+                # Play-in games are single games hosted by the first team
+                team1_won = sampler.sample(thresholds(team1, team2)[0])
+            else:
+                home = np.where(priority[team1] < priority[team2], team1, team2)
+                road = np.where(home == team1, team2, team1)
+                home_won = sampler.simulate_series(*thresholds(home, road), 1, HOME_COURT_PATTERN)[0]
+                team1_won = home_won == (home == team1)
+            winners[index] = np.where(team1_won, team1, team2)
+            losers[index] = np.where(team1_won, team2, team1)
+
+        yield winners, losers
+
+
+def simulate_outcomes(simulator: PlayoffSimulator, east_df: pd.DataFrame, west_df: pd.DataFrame,
+                      path: str = OUTCOMES_DIR, n_trials: int = None, seed=None,
+                      chunk_size: int = 100000) -> OutcomeStore:
+    """Simulate full brackets and persist every trial's series winners
+
+    Trials are simulated a chunk at a time with the threshold sampler and written
+    straight into the memory-mapped store, so the number of trials is limited by
+    disk rather than memory.
+
+    Args:
+        simulator: Simulator whose ratings model and parameters are used
+        east_df: Eastern conference teams sorted by record
+        west_df: Western conference teams sorted by record
+        path: Directory to write the store to
+        n_trials: Number of brackets to simulate (defaults to simulator.n_simulations)
+        seed: Seed for the sampler
+        chunk_size: Trials simulated per batch
+
+    Returns:
+        OutcomeStore opened on the written files
+    """
+    n_trials = n_trials or simulator.n_simulations
+    bracket = simulator._playoff_field(east_df, west_df)
+    slots = bracket_slots(bracket['conferences'])
+
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, META_FILE), 'w') as f:
+        json.dump({'teams': list(bracket['field']['Team']), 'slots': slots}, f, indent=2)
+    winners = np.lib.format.open_memmap(os.path.join(path, WINNERS_FILE), mode='w+',
+                                        dtype=np.uint8, shape=(len(slots), n_trials))
+
+    start = 0
+    for chunk_winners, _ in trial_blocks(simulator, bracket, slots, n_trials, chunk_size, seed):
+        winners[:, start:start + chunk_winners.shape[1]] = chunk_winners
+        start += chunk_winners.shape[1]
+
+    winners.flush()
+    del winners
+    return OutcomeStore(path)
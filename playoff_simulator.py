@@ -1,24 +1,126 @@
 import numpy as np
 import pandas as pd
 from typing import List, Dict, Tuple
+from scipy.special import ndtr
 import json
+import argparse
+
+from data_loading import read_table
+
+# 2-2-1-1-1 format: 1 where the team with home court advantage hosts the game
+HOME_COURT_PATTERN = [1, 1, 0, 0, 1, 0, 1]
+
+# First round pairings by seed; adjacent series meet in the next round
+BRACKET_SEEDS = [(1, 8), (4, 5), (3, 6), (2, 7)]
+
+# Series format of each round (first round, conference semifinals, conference
+# finals, finals); every round is currently best-of-seven 2-2-1-1-1
+ROUND_PATTERNS = [HOME_COURT_PATTERN] * 4
+
+ROUND_COLUMNS = ['make_playoffs', 'conf_semis', 'conf_finals', 'finals', 'champion']
+
+
+def series_state_table(p_home: np.ndarray, p_away: np.ndarray,
+                       home_pattern: List[int] = HOME_COURT_PATTERN,
+                       wins_needed: int = 4) -> np.ndarray:
+    """Probability of winning a series from every in-progress state
+    
+    The next game of a series is game number wins + losses, so (wins, losses) also
+    fixes whether it is played at home under home_pattern.
+    
+    Args:
+        p_home: Probability of winning a home game (any array shape)
+        p_away: Probability of winning a road game (same shape as p_home)
+        home_pattern: For each game, 1 if the team is at home
+        wins_needed: Wins needed to take the series
+        
+    Returns:
+        Array of shape p_home.shape + (wins_needed + 1, wins_needed + 1) where
+        [..., wins, losses] is the probability of winning the series from that state
+    """
+    p_home, p_away = np.broadcast_arrays(np.asarray(p_home, dtype=float), np.asarray(p_away, dtype=float))
+    table = np.zeros(p_home.shape + (wins_needed + 1, wins_needed + 1))
+    table[..., wins_needed, :wins_needed] = 1.0
+    
+    # Work backwards from the last possible game
+    for games_played in range(2 * wins_needed - 2, -1, -1):
+        p = p_home if home_pattern[games_played] else p_away
+        for wins in range(max(0, games_played - wins_needed + 1), min(games_played, wins_needed - 1) + 1):
+            losses = games_played - wins
+            table[..., wins, losses] = p * table[..., wins + 1, losses] + (1 - p) * table[..., wins, losses + 1]
+    
+    return table
+
+
+def series_win_probability(p_home: np.ndarray, p_away: np.ndarray,
+                           home_pattern: List[int] = HOME_COURT_PATTERN,
+                           wins_needed: int = 4) -> np.ndarray:
+    """Exact probability of winning a best-of-seven series from 0-0
+    
+    Only the states reachable after each game are kept, so memory stays at a few
+    arrays the shape of p_home however many matchups are evaluated at once.
+    
+    Args:
+        p_home: Probability of winning a home game (any array shape)
+        p_away: Probability of winning a road game (same shape as p_home)
+        home_pattern: For each game, 1 if the team is at home
+        wins_needed: Wins needed to take the series
+        
+    Returns:
+        Array of series win probabilities with the shape of p_home
+    """
+    p_home, p_away = np.broadcast_arrays(np.asarray(p_home, dtype=float), np.asarray(p_away, dtype=float))
+    
+    # Probability of each (wins, losses) state reached before the series ends
+    states = {(0, 0): np.ones_like(p_home)}
+    series_win = np.zeros_like(p_home)
+    
+    for game in range(2 * wins_needed - 1):
+        p = p_home if home_pattern[game] else p_away
+        next_states = {}
+        for (wins, losses), prob in states.items():
+            win, loss = prob * p, prob * (1 - p)
+            if wins + 1 == wins_needed:
+                series_win = series_win + win
+            else:
+                next_states[(wins + 1, losses)] = next_states.get((wins + 1, losses), 0) + win
+            if losses + 1 < wins_needed:
+                next_states[(wins, losses + 1)] = next_states.get((wins, losses + 1), 0) + loss
+        states = next_states
+        
+    return series_win
+
+
+def _advance(series_matrix: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Winner distribution of a series between the winners of two sub-brackets
+    
+    a and b are distributions over teams with disjoint support; series_matrix[i, j]
+    is the probability that team i beats team j in a series.
+    """
+    return (a * np.einsum('...ij,...j->...i', series_matrix, b)
+            + b * np.einsum('...ij,...j->...i', series_matrix, a))
 
 class PlayoffSimulator:
     def __init__(self, n_simulations: int = 10000):
         self.n_simulations = n_simulations
         self.home_court_advantage = 3.0  # Average NBA home court advantage in points
+        self.game_sd = 12.0  # Standard deviation of a game's final margin in points
+        self.rating_scale = 1.0  # Multiplier on rating differences when predicting margins
+        self.win_probabilities = None  # Optional home win matrix by team name (see use_win_probabilities)
+        self._series_table_cache = {}
         
     def load_team_data(self, filepath: str) -> pd.DataFrame:
         """Load and prepare team data for simulation"""
-        df = pd.read_csv(filepath)
-        current_season = df[df['Year'] == 2025].copy()
+        df = read_table(filepath)
+        
+        # One sort of the season's rows; each conference keeps that order
+        current_season = df[df['Year'] == 2025].sort_values('W/L%', ascending=False, kind='stable')
         
         # Calculate net rating from offensive and defensive ratings
         current_season['NET_RATING'] = current_season['FG'] - current_season['FGA']
         
-        # Sort teams by conference and win percentage
-        east = current_season[current_season['Conference'] == 'East'].sort_values('W/L%', ascending=False)
-        west = current_season[current_season['Conference'] == 'West'].sort_values('W/L%', ascending=False)
+        east = current_season[current_season['Conference'] == 'East']
+        west = current_season[current_season['Conference'] == 'West']
         
         return east, west
     
@@ -34,8 +136,11 @@ class PlayoffSimulator:
         Returns:
             1 if team1 wins, 2 if team2 wins
         """
+        if self.win_probabilities is not None:
+            return 1 if np.random.random() < self.team_win_probability(team1_stats['Team'], team2_stats['Team'], home_team) else 2
+        
         # Base expected margin from net ratings
-        expected_margin = team1_stats['NET_RATING'] - team2_stats['NET_RATING']
+        expected_margin = self.rating_scale * (team1_stats['NET_RATING'] - team2_stats['NET_RATING'])
         
         # Add home court advantage
         if home_team == 1:
@@ -44,26 +149,26 @@ class PlayoffSimulator:
             expected_margin -= self.home_court_advantage
             
         # Add random variance (standard deviation of ~12 points)
-        actual_margin = np.random.normal(expected_margin, 12.0)
+        actual_margin = np.random.normal(expected_margin, self.game_sd)
         
         return 1 if actual_margin > 0 else 2
     
     def simulate_series(self, team1_stats: pd.Series, team2_stats: pd.Series, 
-                       team1_home_court: bool) -> int:
+                       team1_home_court: bool, team1_wins: int = 0, team2_wins: int = 0) -> int:
         """Simulate a 7-game playoff series between two teams
         
         Args:
             team1_stats: Statistics for first team
             team2_stats: Statistics for second team
             team1_home_court: Whether team1 has home court advantage
+            team1_wins: Games team1 has already won in the series
+            team2_wins: Games team2 has already won in the series
             
         Returns:
             1 if team1 wins series, 2 if team2 wins series
         """
         wins_needed = 4
-        team1_wins = 0
-        team2_wins = 0
-        game_num = 0
+        game_num = team1_wins + team2_wins
         
         # 2-2-1-1-1 format
         home_court = [1,1,2,2,1,2,1] if team1_home_court else [2,2,1,1,2,1,2]
@@ -132,12 +237,15 @@ class PlayoffSimulator:
         
         return winner_7_8, eighth_seed
 
-    def simulate_playoffs(self, east_df: pd.DataFrame, west_df: pd.DataFrame) -> Dict:
+    def simulate_playoffs(self, east_df: pd.DataFrame, west_df: pd.DataFrame,
+                          series_states: Dict[Tuple[str, str], Tuple[int, int]] = None) -> Dict:
         """Simulate entire playoff bracket including play-in
         
         Args:
             east_df: Eastern conference teams dataframe
             west_df: Western conference teams dataframe
+            series_states: Optional {(team1, team2): (team1 wins, team2 wins)} for
+                series in progress; a side with 4 wins has won the series
             
         Returns:
             Dictionary with round-by-round probabilities
@@ -151,6 +259,9 @@ class PlayoffSimulator:
         
         # Process each conference
         for conf, df in [("West", west_df), ("East", east_df)]:
+            # The play-in results are written into the table, so leave the caller's standings alone
+            df = df.copy()
+            
             # Simulate play-in tournament
             orig_7_10 = df.iloc[6:10].copy()
             seventh_seed_counts = {team: 0 for team in orig_7_10['Team']}
@@ -165,9 +276,11 @@ class PlayoffSimulator:
             most_likely_7th = max(seventh_seed_counts.items(), key=lambda x: x[1])[0]
             most_likely_8th = max(eighth_seed_counts.items(), key=lambda x: x[1])[0]
             
-            # Update dataframe with play-in results
-            df.iloc[6] = df[df['Team'] == most_likely_7th].iloc[0]
-            df.iloc[7] = df[df['Team'] == most_likely_8th].iloc[0]
+            # Update dataframe with play-in results; read both rows before writing
+            # either slot, since the 8th seed may be the team that was in 7th place
+            seventh_row = df[df['Team'] == most_likely_7th].iloc[0].copy()
+            eighth_row = df[df['Team'] == most_likely_8th].iloc[0].copy()
+            df.iloc[6], df.iloc[7] = seventh_row, eighth_row
             
             # First round matchups (1v8, 4v5, 3v6, 2v7)
             seeds = [(1,8), (4,5), (3,6), (2,7)]
@@ -190,15 +303,26 @@ class PlayoffSimulator:
                     }
                 }
                 
-                # Simulate series multiple times
-                team1_wins = 0
-                for _ in range(self.n_simulations):
-                    winner = self.simulate_series(team1, team2, True)
-                    if winner == 1:
-                        team1_wins += 1
+                # Pick up series already in progress
+                state = (0, 0)
+                if series_states and (team1['Team'], team2['Team']) in series_states:
+                    state = series_states[(team1['Team'], team2['Team'])]
+                elif series_states and (team2['Team'], team1['Team']) in series_states:
+                    state = series_states[(team2['Team'], team1['Team'])][::-1]
                 
-                # Update probabilities
-                prob = team1_wins / self.n_simulations
+                if max(state) >= 4:
+                    # Settled series need no simulation
+                    prob = 1.0 if state[0] >= 4 else 0.0
+                else:
+                    # Simulate series multiple times
+                    team1_wins = 0
+                    for _ in range(self.n_simulations):
+                        winner = self.simulate_series(team1, team2, True, *state)
+                        if winner == 1:
+                            team1_wins += 1
+                    
+                    # Update probabilities
+                    prob = team1_wins / self.n_simulations
                 matchup["team1"]["probability"] = prob
                 matchup["team2"]["probability"] = 1 - prob
                 
@@ -217,12 +341,359 @@ class PlayoffSimulator:
             "rounds": rounds
         }
 
-def main():
+    def use_win_probabilities(self, win_probabilities: pd.DataFrame):
+        """Take game win probabilities from an external model instead of NET_RATING
+        
+        Args:
+            win_probabilities: Probability that the row team beats the column team
+                at home, indexed by team name on both axes (e.g. from
+                EloRatings.win_probabilities); None goes back to ratings
+        """
+        self.win_probabilities = win_probabilities
+        self._series_table_cache = {}
+        return self
+    
+    def team_win_probability(self, team1: str, team2: str, home_team: int) -> float:
+        """Probability that team1 beats team2 under use_win_probabilities
+        
+        home_team is 1 or 2 as in simulate_game; anything else is a neutral site.
+        """
+        if home_team == 1:
+            return float(self.win_probabilities.at[team1, team2])
+        if home_team == 2:
+            return 1.0 - float(self.win_probabilities.at[team2, team1])
+        return 0.5 * (float(self.win_probabilities.at[team1, team2]) + 1.0 - float(self.win_probabilities.at[team2, team1]))
+    
+    def bracket_home_win(self, bracket: Dict) -> np.ndarray:
+        """Home win matrix for a playoff field, from the external model when one is set"""
+        if self.win_probabilities is None:
+            return self.home_win_matrix(bracket['ratings'])
+        teams = list(bracket['field']['Team'])
+        missing = [team for team in teams if team not in self.win_probabilities.index]
+        if missing:
+            raise ValueError(f"No win probabilities for: {', '.join(missing)}")
+        return self.win_probabilities.loc[teams, teams].to_numpy(dtype=float)
+    
+    def game_win_probability(self, expected_margin: np.ndarray) -> np.ndarray:
+        """Probability that a normally distributed game margin is positive"""
+        return ndtr(np.asarray(expected_margin) / self.game_sd)
+    
+    def home_win_matrix(self, ratings: np.ndarray, home_court_advantage=None,
+                        game_sd=None, rating_scale=None) -> np.ndarray:
+        """Probability that team i beats team j at home, for every pair
+        
+        Parameters default to the simulator's own; passing arrays of shape (P,)
+        evaluates P parameter points at once.
+        
+        Returns:
+            Array of shape (P, n, n), or (n, n) when every parameter is a scalar
+        """
+        home_court_advantage = np.asarray(self.home_court_advantage if home_court_advantage is None else home_court_advantage, dtype=float)
+        game_sd = np.asarray(self.game_sd if game_sd is None else game_sd, dtype=float)
+        rating_scale = np.asarray(self.rating_scale if rating_scale is None else rating_scale, dtype=float)
+        
+        margin = ratings[:, None] - ratings[None, :]
+        expected = rating_scale[..., None, None] * margin + home_court_advantage[..., None, None]
+        return ndtr(expected / game_sd[..., None, None])
+    
+    def series_matrix(self, home_win: np.ndarray, home_priority: np.ndarray,
+                      series_states: Dict[Tuple[int, int], Tuple[int, int]] = None,
+                      home_pattern: List[int] = HOME_COURT_PATTERN) -> np.ndarray:
+        """Series win probabilities for every pair of teams
+        
+        Args:
+            home_win: Home win probabilities from home_win_matrix
+            home_priority: Rank of each team for home court (lower ranks host)
+            series_states: Optional {(i, j): (i wins, j wins)} for series in progress;
+                a side with enough wins has already won the series
+            home_pattern: Series format, 1 for each game the team with home court hosts
+            
+        Returns:
+            Array shaped like home_win where [..., i, j] is the probability that team
+            i beats team j in a series
+        """
+        p_home = home_win
+        p_away = 1.0 - np.swapaxes(home_win, -1, -2)
+        away_pattern = [1 - h for h in home_pattern]
+        wins_needed = (len(home_pattern) + 1) // 2
+        
+        with_home = series_win_probability(p_home, p_away, home_pattern, wins_needed)
+        without_home = series_win_probability(p_home, p_away, away_pattern, wins_needed)
+        has_home = home_priority[:, None] < home_priority[None, :]
+        matrix = np.where(has_home, with_home, without_home)
+        
+        for (i, j), (wins, losses) in (series_states or {}).items():
+            pattern = home_pattern if has_home[i, j] else away_pattern
+            table = series_state_table(p_home[..., i, j], p_away[..., i, j], pattern, wins_needed)
+            matrix[..., i, j] = table[..., wins, losses]
+            matrix[..., j, i] = 1.0 - matrix[..., i, j]
+        return matrix
+    
+    def live_series_probability(self, team1_stats: pd.Series, team2_stats: pd.Series,
+                                team1_home_court: bool, team1_wins: int, team2_wins: int) -> float:
+        """Probability that team1 wins a series already in progress
+        
+        The per-pair state table is computed once and cached, so updating the odds
+        after each game is a lookup.
+        """
+        key = (team1_stats['Team'], team2_stats['Team'], team1_home_court,
+               float(team1_stats['NET_RATING']), float(team2_stats['NET_RATING']),
+               self.home_court_advantage, self.game_sd, self.rating_scale)
+        if key not in self._series_table_cache:
+            pattern = HOME_COURT_PATTERN if team1_home_court else [1 - h for h in HOME_COURT_PATTERN]
+            if self.win_probabilities is not None:
+                p_home = self.team_win_probability(team1_stats['Team'], team2_stats['Team'], 1)
+                p_away = self.team_win_probability(team1_stats['Team'], team2_stats['Team'], 2)
+            else:
+                margin = self.rating_scale * (team1_stats['NET_RATING'] - team2_stats['NET_RATING'])
+                p_home = self.game_win_probability(margin + self.home_court_advantage)
+                p_away = self.game_win_probability(margin - self.home_court_advantage)
+            self._series_table_cache[key] = series_state_table(p_home, p_away, pattern)
+        return float(self._series_table_cache[key][team1_wins, team2_wins])
+    
+    def play_in_outcomes(self, home_win: np.ndarray, teams: List[int]) -> List[Tuple[np.ndarray, int, int]]:
+        """Every play-in result with its probability
+        
+        Args:
+            home_win: Home win probabilities from home_win_matrix
+            teams: Indices of the 7th to 10th place teams
+            
+        Returns:
+            List of (probability, 7th seed index, 8th seed index)
+        """
+        def home_win_prob(home, away):
+            return home_win[..., home, away]
+        
+        seventh, eighth, ninth, tenth = teams
+        outcomes = []
+        for winner_7_8, loser_7_8, p_7_8 in [(seventh, eighth, home_win_prob(seventh, eighth)),
+                                              (eighth, seventh, 1 - home_win_prob(seventh, eighth))]:
+            for winner_9_10, p_9_10 in [(ninth, home_win_prob(ninth, tenth)),
+                                        (tenth, 1 - home_win_prob(ninth, tenth))]:
+                p_final = home_win_prob(loser_7_8, winner_9_10)
+                for eighth_seed, p in [(loser_7_8, p_final), (winner_9_10, 1 - p_final)]:
+                    outcomes.append((p_7_8 * p_9_10 * p, winner_7_8, eighth_seed))
+        return outcomes
+    
+    def _playoff_field(self, east_df: pd.DataFrame, west_df: pd.DataFrame) -> Dict:
+        """Top ten teams of each conference with their seeds and home court order"""
+        conferences = [("West", west_df.iloc[:10]), ("East", east_df.iloc[:10])]
+        field = pd.concat([df for _, df in conferences], ignore_index=True)
+        
+        # Better record hosts; ties go to the higher seed
+        seeds = np.concatenate([np.arange(1, len(df) + 1) for _, df in conferences])
+        home_priority = np.argsort(np.lexsort((seeds, -field['W/L%'].to_numpy(dtype=float))))
+        
+        return {
+            'field': field,
+            'conferences': [(conf, len(df)) for conf, df in conferences],
+            'seeds': seeds,
+            'home_priority': home_priority,
+            'ratings': field['NET_RATING'].to_numpy(dtype=float),
+            # Per-team rating uncertainty, when the tables carry one (see ratings.py)
+            'rating_sd': field['NET_RATING_SD'].to_numpy(dtype=float) if 'NET_RATING_SD' in field else None,
+            'team_index': {team: i for i, team in enumerate(field['Team'])}
+        }
+    
+    def round_series_matrices(self, bracket: Dict, home_win: np.ndarray,
+                              series_states: Dict[Tuple[int, int], Tuple[int, int]] = None,
+                              round_patterns: List[List[int]] = None) -> List[np.ndarray]:
+        """series_matrix for each round's format, sharing the work between rounds with the same one"""
+        by_pattern = {}
+        for pattern in round_patterns or ROUND_PATTERNS:
+            if tuple(pattern) not in by_pattern:
+                by_pattern[tuple(pattern)] = self.series_matrix(home_win, bracket['home_priority'],
+                                                                series_states, list(pattern))
+        return [by_pattern[tuple(pattern)] for pattern in round_patterns or ROUND_PATTERNS]
+    
+    def meeting_rounds(self, bracket: Dict) -> np.ndarray:
+        """Round (0 for the first round to 3 for the finals) in which each pair of seeds would meet
+        
+        The 9th and 10th place play-in teams can only finish as the 8th seed, so
+        they take its slot.
+        """
+        slot_of = {seed: slot for slot, pair in enumerate(BRACKET_SEEDS) for seed in pair}
+        slots = np.array([slot_of[min(seed, 8)] for seed in bracket['seeds']])
+        conference = np.repeat(np.arange(len(bracket['conferences'])), [n for _, n in bracket['conferences']])
+        
+        rounds = np.full((len(slots), len(slots)), 2)
+        rounds[slots[:, None] // 2 == slots[None, :] // 2] = 1
+        rounds[slots[:, None] == slots[None, :]] = 0
+        rounds[conference[:, None] != conference[None, :]] = 3
+        return rounds
+    
+    def _solve_bracket(self, bracket: Dict, home_win: np.ndarray,
+                       series_states: Dict[Tuple[str, str], Tuple[int, int]] = None,
+                       play_in_results: Dict[str, Tuple[str, str]] = None,
+                       round_patterns: List[List[int]] = None) -> Dict[str, np.ndarray]:
+        """Reach probabilities for each round, batched over any leading axes of home_win"""
+        team_index = bracket['team_index']
+        n_teams = len(team_index)
+        batch_shape = home_win.shape[:-2]
+        
+        index_states = {(team_index[team1], team_index[team2]): state
+                        for (team1, team2), state in (series_states or {}).items()}
+        first_round_series, semis_series, conf_finals_series, finals_series = self.round_series_matrices(
+            bracket, home_win, index_states, round_patterns)
+        reach = {column: np.zeros(batch_shape + (n_teams,)) for column in ROUND_COLUMNS}
+        champions = []
+        
+        offset = 0
+        for conf, n_conf in bracket['conferences']:
+            conf_champion = np.zeros(batch_shape + (n_teams,))
+            if play_in_results and conf in play_in_results:
+                seventh, eighth = play_in_results[conf]
+                outcomes = [(np.ones(batch_shape), team_index[seventh], team_index[eighth])]
+            else:
+                outcomes = self.play_in_outcomes(home_win, list(range(offset + 6, offset + 10)))
+            
+            for p_outcome, seventh, eighth in outcomes:
+                p_outcome = np.asarray(p_outcome)[..., None]
+                seed_index = {seed: offset + seed - 1 for seed in range(1, 7)}
+                seed_index[7], seed_index[8] = seventh, eighth
+                
+                first_round = []
+                for seed1, seed2 in BRACKET_SEEDS:
+                    a, b = np.zeros(n_teams), np.zeros(n_teams)
+                    a[seed_index[seed1]], b[seed_index[seed2]] = 1.0, 1.0
+                    reach['make_playoffs'] += p_outcome * (a + b)
+                    first_round.append(_advance(first_round_series, a, b))
+                
+                semis = [_advance(semis_series, first_round[0], first_round[1]),
+                         _advance(semis_series, first_round[2], first_round[3])]
+                winner = _advance(conf_finals_series, semis[0], semis[1])
+                
+                reach['conf_semis'] += p_outcome * sum(first_round)
+                reach['conf_finals'] += p_outcome * sum(semis)
+                conf_champion += p_outcome * winner
+            
+            reach['finals'] += conf_champion
+            champions.append(conf_champion)
+            offset += n_conf
+        
+        reach['champion'] = _advance(finals_series, champions[0], champions[1])
+        return reach
+    
+    def solve_playoffs(self, east_df: pd.DataFrame, west_df: pd.DataFrame,
+                       series_states: Dict[Tuple[str, str], Tuple[int, int]] = None,
+                       play_in_results: Dict[str, Tuple[str, str]] = None,
+                       round_patterns: List[List[int]] = None) -> pd.DataFrame:
+        """Exact round-by-round odds for every playoff and play-in team
+        
+        Instead of sampling, the bracket is solved as a recursion over its tree: a
+        team's chance of winning a sub-bracket is its chance of winning its half times
+        the sum over possible opponents of the opponent's chance of winning the other
+        half times the series win probability. The play-in is integrated over all of
+        its outcomes rather than fixed to the most likely 7th/8th seeds.
+        
+        Args:
+            east_df: Eastern conference teams sorted by record
+            west_df: Western conference teams sorted by record
+            series_states: Optional {(team1, team2): (team1 wins, team2 wins)} for
+                series in progress; a side with 4 wins has won the series, which
+                prunes every branch where the loser advances
+            play_in_results: Optional {conference: (7th seed, 8th seed)} once the
+                play-in has been played
+            round_patterns: Optional series format of each round, as in
+                ROUND_PATTERNS (for past seasons with best-of-five first rounds)
+            
+        Returns:
+            DataFrame with one row per team and the probability of making the playoffs,
+            reaching each later round and winning the title
+        """
+        bracket = self._playoff_field(east_df, west_df)
+        home_win = self.bracket_home_win(bracket)
+        reach = self._solve_bracket(bracket, home_win, series_states, play_in_results, round_patterns)
+        
+        result = pd.DataFrame({
+            'Team': bracket['field']['Team'].to_numpy(),
+            'Conference': [conf for conf, n_conf in bracket['conferences'] for _ in range(n_conf)],
+            'Seed': bracket['seeds']
+        })
+        for column in ROUND_COLUMNS:
+            result[column] = reach[column]
+        return result
+    
+    def sweep(self, east_df: pd.DataFrame, west_df: pd.DataFrame,
+              home_court_advantage: List[float] = None, game_sd: List[float] = None,
+              rating_scale: List[float] = None, chunk_size: int = 500,
+              series_states: Dict[Tuple[str, str], Tuple[int, int]] = None,
+              play_in_results: Dict[str, Tuple[str, str]] = None) -> pd.DataFrame:
+        """Exact playoff odds over a grid of model parameters in one batched solve
+        
+        Every combination of the given values is evaluated by broadcasting the bracket
+        recursion over a parameter axis, so a 50x50 grid is one computation rather
+        than 2,500 runs. Parameters left as None stay at the simulator's value. The
+        sweep always uses NET_RATING, even after use_win_probabilities.
+        
+        Args:
+            east_df: Eastern conference teams sorted by record
+            west_df: Western conference teams sorted by record
+            home_court_advantage: Home court advantages to try, in points
+            game_sd: Game margin standard deviations to try, in points
+            rating_scale: Multipliers applied to rating differences
+            chunk_size: Parameter points solved per batch, to bound memory
+            series_states: Series in progress, as in solve_playoffs
+            play_in_results: Settled play-in seeds, as in solve_playoffs
+            
+        Returns:
+            Tidy DataFrame with one row per parameter point and team
+        """
+        grids = [self.home_court_advantage if home_court_advantage is None else home_court_advantage,
+                 self.game_sd if game_sd is None else game_sd,
+                 self.rating_scale if rating_scale is None else rating_scale]
+        mesh = np.meshgrid(*[np.atleast_1d(np.asarray(g, dtype=float)) for g in grids], indexing='ij')
+        points = np.stack([m.ravel() for m in mesh], axis=-1)
+        
+        bracket = self._playoff_field(east_df, west_df)
+        reach = {column: [] for column in ROUND_COLUMNS}
+        for start in range(0, len(points), chunk_size):
+            chunk = points[start:start + chunk_size]
+            home_win = self.home_win_matrix(bracket['ratings'], chunk[:, 0], chunk[:, 1], chunk[:, 2])
+            chunk_reach = self._solve_bracket(bracket, home_win, series_states, play_in_results)
+            for column in ROUND_COLUMNS:
+                reach[column].append(chunk_reach[column])
+        
+        n_teams = len(bracket['field'])
+        result = pd.DataFrame({
+            'home_court_advantage': np.repeat(points[:, 0], n_teams),
+            'game_sd': np.repeat(points[:, 1], n_teams),
+            'rating_scale': np.repeat(points[:, 2], n_teams),
+            'Team': np.tile(bracket['field']['Team'].to_numpy(), len(points)),
+            'Conference': np.tile([conf for conf, n_conf in bracket['conferences'] for _ in range(n_conf)], len(points)),
+            'Seed': np.tile(bracket['seeds'], len(points))
+        })
+        for column in ROUND_COLUMNS:
+            result[column] = np.concatenate(reach[column]).ravel()
+        return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate the playoffs from the current standings")
+    parser.add_argument('--simulations', type=int, default=10000)
+    parser.add_argument('--data', default="NBA_data/current_season.csv", help="Season table to simulate")
+    parser.add_argument('--game-model', metavar='PATH',
+                        help="Take game win probabilities from a trained game model (see game_model.py)")
+    parser.add_argument('--seed', type=int, help="Random seed for the play-in simulations")
+    args = parser.parse_args(argv)
+
+    if args.seed is not None:
+        np.random.seed(args.seed)
+
     # Initialize simulator
-    simulator = PlayoffSimulator(n_simulations=10000)
+    simulator = PlayoffSimulator(n_simulations=args.simulations)
     
     # Load team data
-    east_df, west_df = simulator.load_team_data("NBA_data/current_season.csv")
+    east_df, west_df = simulator.load_team_data(args.data)
+    
+    if args.game_model:
+        from game_model import GameModel
+        from form_features import FORM_COLUMNS
+        season = pd.concat([east_df, west_df])
+        missing = [column for column in FORM_COLUMNS if column not in season]
+        if missing:
+            print(f"Error: {args.data} has no form columns ({', '.join(missing)}); re-run the scraper")
+            return 1
+        simulator.use_win_probabilities(GameModel.load(args.game_model).win_probabilities(season[['Team'] + FORM_COLUMNS]))
     
     # Run playoff simulations
     results = simulator.simulate_playoffs(east_df, west_df)
@@ -232,6 +703,11 @@ def main():
         json.dump(results, f, indent=2)
     
     print("Playoff simulations complete! Results saved to 'NBA_data/playoff_simulations.json'")
+    
+    # Exact round-by-round odds from the bracket recursion
+    odds = simulator.solve_playoffs(east_df, west_df)
+    odds.to_csv("NBA_data/playoff_odds.csv", index=False)
+    print("Exact playoff odds saved to 'NBA_data/playoff_odds.csv'")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,46 +1,79 @@
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import QuantileTransformer
+import os
+import sys
+import argparse
+
+from data_loading import FLOAT_DTYPE, compact_dtypes, read_table, report_memory
 
 class DataPreprocessor:
-    def __init__(self):
+    def __init__(self, include_form=False):
         self.features = [
             'W', 'L', 'W/L%', 'GB', 'PS/G', 'PA/G',
             'FG', 'FGA', 'FG%', '3P', '3PA', '3P%', '2P', '2PA', '2P%',
             'FT', 'FTA', 'FT%', 'ORB', 'DRB', 'TRB', 'AST', 'STL', 'BLK',
             'TOV', 'PF', 'PTS'
         ]
+        if include_form:
+            # Recent-form columns from the game log (only in data from nba_scraper_2025)
+            from form_features import FORM_COLUMNS
+            self.features = self.features + FORM_COLUMNS
         self.target = 'Playoffs'
         self.transformer = None
     
     def load_data(self, filepath):
         """Load and clean the NBA data"""
         print(f"Loading data from {filepath}")
-        df = pd.read_csv(filepath)
+        df = read_table(filepath)
         print(f"Loaded {len(df)} rows with columns: {df.columns.tolist()}")
         
         # Fill missing values with 0
         for feature in self.features:
             if feature not in df.columns:
                 print(f"Warning: Column {feature} not found in data, filling with 0")
-                df[feature] = 0
-            else:
+                df[feature] = np.float32(0)
+            elif df[feature].hasnans:
                 df[feature] = df[feature].fillna(0)
         
         # Add playoff indicator (top 8 teams in each conference)
-        df['Playoffs'] = 0
-        for year in df['Year'].unique():
-            for conf in ['East', 'West']:
-                mask = (df['Year'] == year) & (df['Conference'] == conf)
-                conf_df = df[mask]
-                if not conf_df.empty:
-                    df.loc[mask, 'Playoffs'] = (
-                        conf_df['W/L%'].rank(ascending=False) <= 8
-                    ).astype(int)
+        rank = df.groupby(['Year', 'Conference'], observed=True)['W/L%'].rank(ascending=False)
+        df['Playoffs'] = ((rank <= 8) & df['Conference'].isin(['East', 'West'])).astype(np.int8)
         
         print(f"Data loaded and cleaned. Shape: {df.shape}")
         return df
     
+    def load_legacy_data(self, filepath):
+        """Load a basketball-reference export (NBA_data_all_*.csv) in load_data's layout
+
+        These files mark playoff teams with '*' after the name, which is used as the
+        target instead of the top-8 approximation. Record-based columns are derived
+        from W and L; PA/G is not in the export and is filled with 0.
+        """
+        print(f"Loading legacy data from {filepath}")
+        df = pd.read_csv(filepath).rename(columns={'Conf': 'Conference'})
+
+        df['Playoffs'] = df['Team'].str.endswith('*').astype(int)
+        df['Team'] = df['Team'].str.rstrip('*')
+        df['W/L%'] = df['W'] / (df['W'] + df['L'])
+
+        # Games behind the conference leader
+        lead = (df['W'] - df['L']).groupby([df['Year'], df['Conference']]).transform('max')
+        df['GB'] = (lead - (df['W'] - df['L'])) / 2
+        df['PS/G'] = df['PTS']
+        df['TRB'] = df['ORB'] + df['DRB']
+
+        for feature in self.features:
+            if feature not in df.columns:
+                print(f"Warning: Column {feature} not found in data, filling with 0")
+                df[feature] = 0
+            else:
+                df[feature] = df[feature].fillna(0)
+
+        compact_dtypes(df)
+        report_memory(df, os.path.basename(filepath))
+        print(f"Legacy data loaded. Shape: {df.shape}")
+        return df
+
     def preprocess(self, df, by_year=True):
         """Preprocess the data using quantile transformation"""
         if df.empty:
@@ -83,14 +116,16 @@ class DataPreprocessor:
         """Apply quantile transformation to features"""
         if X.empty:
             return X
+        from sklearn.preprocessing import QuantileTransformer
         
         # Replace infinities and very large numbers with 0
         X = X.replace([np.inf, -np.inf], 0)
         X = X.clip(-1e6, 1e6)  # Clip very large values
         
         self.transformer = QuantileTransformer(output_distribution='normal')
+        # Normal scores need no more precision than the stats they come from
         transformed = pd.DataFrame(
-            self.transformer.fit_transform(X),
+            self.transformer.fit_transform(X).astype(FLOAT_DTYPE, copy=False),
             columns=X.columns,
             index=X.index
         )
@@ -122,7 +157,8 @@ class DataPreprocessor:
         
         return X_train, X_test, y_train, y_test
 
-if __name__ == "__main__":
+def main(argv=None):
+    argparse.ArgumentParser(description="Quantile-transform the historical data by season").parse_args(argv)
     preprocessor = DataPreprocessor()
     
     # Load and preprocess data
@@ -138,4 +174,8 @@ if __name__ == "__main__":
         print("\nData preprocessing complete! Saved to 'NBA_data/processed_data.csv'")
     else:
         print("\nError: Failed to process data")
-        exit(1)
\ No newline at end of file
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
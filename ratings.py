@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import cg
+
+# Floor on the spread of true team strengths, so a small sample never shrinks every
+# team all the way to average
+MIN_RATING_SPREAD = 1.0
+
+
+def fit_rating_distribution(games: pd.DataFrame, home_court_advantage: float = None) -> pd.DataFrame:
+    """Fit a normal distribution for each team's rating from game margins
+
+    Each team's average home-court-adjusted margin is shrunk towards league average
+    (zero) by empirical Bayes: the spread of true ratings is estimated from how much
+    more team averages vary than game-to-game noise alone explains, and a team's
+    posterior uncertainty falls with the number of games it has played.
+
+    Args:
+        games: Paired games from game_log.pair_games
+        home_court_advantage: Points to credit the home team; estimated from the
+            average home margin when None
+
+    Returns:
+        DataFrame with Team, GP, NET_RATING (posterior mean) and NET_RATING_SD
+    """
+    if home_court_advantage is None:
+        home_court_advantage = games['HOME_MARGIN'].mean()
+    adjusted = games['HOME_MARGIN'].to_numpy(dtype=float) - home_court_advantage
+
+    margins = pd.DataFrame({
+        'Team': np.concatenate([games['HOME'].to_numpy(), games['AWAY'].to_numpy()]),
+        'margin': np.concatenate([adjusted, -adjusted])
+    })
+    by_team = margins.groupby('Team')['margin']
+    n_games = by_team.size()
+    means = by_team.mean()
+
+    # Game-to-game noise pooled over teams, and the spread of true strengths beyond it
+    residuals = margins['margin'] - margins['Team'].map(means)
+    noise_var = np.sum(residuals ** 2) / max(len(margins) - len(means), 1)
+    spread_var = max(means.var(ddof=1) - np.mean(noise_var / n_games), MIN_RATING_SPREAD ** 2)
+
+    precision = n_games / noise_var + 1 / spread_var
+    return pd.DataFrame({
+        'Team': means.index,
+        'GP': n_games.to_numpy(),
+        'NET_RATING': (n_games * means / noise_var / precision).to_numpy(),
+        'NET_RATING_SD': np.sqrt(1 / precision).to_numpy()
+    }).reset_index(drop=True)
+
+
+def apply_rating_distribution(team_df: pd.DataFrame, fit: pd.DataFrame) -> pd.DataFrame:
+    """Replace a conference table's point ratings with fitted means and SDs
+
+    The returned table keeps team_df's row order; teams missing from the fit keep
+    their NET_RATING with an uncertainty of the largest fitted SD.
+    """
+    fitted = team_df.drop(columns=['NET_RATING_SD'], errors='ignore').merge(
+        fit[['Team', 'NET_RATING', 'NET_RATING_SD']], on='Team', how='left', suffixes=('', '_FIT'))
+    fitted.index = team_df.index
+    fitted['NET_RATING'] = fitted['NET_RATING_FIT'].fillna(fitted['NET_RATING'])
+    fitted['NET_RATING_SD'] = fitted['NET_RATING_SD'].fillna(fit['NET_RATING_SD'].max())
+    return fitted.drop(columns=['NET_RATING_FIT'])
+
+
+class MasseyRatings:
+    """Margin-of-victory ratings (SRS, or ridge-regularized Massey) from a game log
+
+    Every game is a row of a sparse design matrix with +1 for the home team, -1
+    for the road team and 1 in a shared home court column, regressed on the home
+    margin. The normal equations are accumulated as games arrive and solved with
+    conjugate gradients, warm-started from the previous solution, so adding a
+    night of games only costs a few iterations.
+
+    When the games carry a SEASON column each team-season gets its own rating,
+    keyed "<season> <team>".
+    """
+
+    def __init__(self, ridge: float = 1.0, tol: float = 1e-8):
+        """
+        Args:
+            ridge: Penalty on squared ratings in units of games; 0 gives plain SRS
+            tol: Relative residual at which conjugate gradients stops
+        """
+        self.ridge = ridge
+        self.tol = tol
+        self._reset()
+
+    def _reset(self):
+        self.teams = []
+        self._team_index = {}
+        self._normal = sparse.csr_matrix((1, 1))
+        self._rhs = np.zeros(1)
+        self._coef = np.zeros(1)
+        self._n_games = 0
+        self._sum_sq_margin = 0.0
+
+    def _keys(self, games: pd.DataFrame, side: str) -> np.ndarray:
+        if 'SEASON' in games:
+            return (games['SEASON'].astype(str) + ' ' + games[side].astype(str)).to_numpy()
+        return games[side].astype(str).to_numpy()
+
+    def _design(self, games: pd.DataFrame) -> sparse.csr_matrix:
+        """Sparse design matrix for games, registering any new teams"""
+        home, away = self._keys(games, 'HOME'), self._keys(games, 'AWAY')
+        for team in pd.unique(np.concatenate([home, away])):
+            if team not in self._team_index:
+                self._team_index[team] = len(self.teams)
+                self.teams.append(team)
+
+        # Ratings come first; the home court coefficient is the last column
+        n_games, n_columns = len(games), len(self.teams) + 1
+        rows = np.repeat(np.arange(n_games), 3)
+        columns = np.column_stack([[self._team_index[t] for t in home],
+                                   [self._team_index[t] for t in away],
+                                   np.full(n_games, n_columns - 1)]).ravel()
+        values = np.tile([1.0, -1.0, 1.0], n_games)
+        return sparse.csr_matrix((values, (rows, columns)), shape=(n_games, n_columns))
+
+    def fit(self, games: pd.DataFrame) -> 'MasseyRatings':
+        """Solve ratings from scratch for a game log from game_log.pair_games"""
+        self._reset()
+        return self.update(games)
+
+    def update(self, games: pd.DataFrame) -> 'MasseyRatings':
+        """Add new games and re-solve, starting from the current ratings"""
+        design = self._design(games)
+        margins = games['HOME_MARGIN'].to_numpy(dtype=float)
+        n_columns = design.shape[1]
+
+        # Grow the accumulated normal equations to cover any new teams
+        old = self._normal.shape[0]
+        if n_columns > old:
+            self._normal = sparse.block_diag([self._normal, sparse.csr_matrix((n_columns - old, n_columns - old))],
+                                             format='csr')
+            # Keep the home court coefficient in the last slot
+            order = np.r_[np.arange(old - 1), np.arange(old, n_columns), old - 1]
+            self._normal = self._normal[order][:, order]
+            self._rhs = np.concatenate([self._rhs[:-1], np.zeros(n_columns - old), self._rhs[-1:]])
+            self._coef = np.concatenate([self._coef[:-1], np.zeros(n_columns - old), self._coef[-1:]])
+
+        self._normal = (self._normal + design.T @ design).tocsr()
+        self._rhs = self._rhs + design.T @ margins
+        self._n_games += len(games)
+        self._sum_sq_margin += float(margins @ margins)
+
+        # Ridge penalty on the ratings but not on home court; a tiny floor keeps
+        # plain SRS positive definite (its ratings are only defined up to a constant)
+        penalty = np.full(n_columns, max(self.ridge, 1e-9))
+        penalty[-1] = 0.0
+        system = self._normal + sparse.diags(penalty)
+        self._coef, info = cg(system, self._rhs, x0=self._coef, rtol=self.tol, maxiter=10 * n_columns)
+        if info > 0:
+            print(f"Warning: conjugate gradients stopped after {info} iterations without converging")
+        return self
+
+    @property
+    def ratings(self) -> pd.Series:
+        """Rating of every team (points better than an average team on a neutral court)"""
+        return pd.Series(self._coef[:-1], index=self.teams, name='NET_RATING')
+
+    @property
+    def home_court_advantage(self) -> float:
+        return float(self._coef[-1])
+
+    @property
+    def game_sd(self) -> float:
+        """Root mean squared error of the fitted margins"""
+        residual = self._sum_sq_margin - 2 * self._coef @ self._rhs + self._coef @ (self._normal @ self._coef)
+        return float(np.sqrt(max(residual, 0.0) / max(self._n_games - len(self._coef), 1)))
+
+    def ratings_vector(self, teams, season=None) -> np.ndarray:
+        """Ratings in the given team order (0 for teams without games)"""
+        prefix = f"{season} " if season is not None else ''
+        ratings = self.ratings
+        return np.array([ratings.get(prefix + team, 0.0) for team in teams])
+
+    def apply(self, team_df: pd.DataFrame, season=None) -> pd.DataFrame:
+        """Copy of a conference table with NET_RATING replaced by these ratings"""
+        rated = team_df.copy()
+        rated['NET_RATING'] = self.ratings_vector(team_df['Team'], season)
+        return rated
+
+    def configure(self, simulator):
+        """Use the fitted home court advantage and game-to-game spread in a simulator"""
+        simulator.home_court_advantage = self.home_court_advantage
+        simulator.game_sd = self.game_sd
+        return simulator
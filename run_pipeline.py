@@ -1,6 +1,11 @@
 import os
 import sys
 import time
+import argparse
+import importlib.util
+
+REQUIRED_PACKAGES = ['pandas', 'numpy', 'matplotlib', 'sklearn', 'requests', 'bs4',
+                     'seaborn', 'joblib', 'nba_api']
 
 def create_directories():
     """Create necessary directories if they don't exist"""
@@ -25,24 +30,39 @@ def run_step(step_name, script_name):
     print(f"\n{step_name} completed successfully!")
     return True
 
-def main():
+def start_results_server(port=0):
+    """Serve index.html with live bracket updates from a background thread
+    
+    Args:
+        port: Port to listen on (0 picks a free one)
+    
+    Returns:
+        Tuple of (server, URL of the results page)
+    """
+    import threading
+    from live_server import SIMULATIONS_PATH, BracketBroadcaster, create_server
+    from bracket_writer import BracketWriter
+    
+    broadcaster = BracketBroadcaster(BracketWriter())
+    threading.Thread(target=broadcaster.watch, args=(SIMULATIONS_PATH,), daemon=True).start()
+    server = create_server(broadcaster, port=port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}/index.html"
+
+def main(argv=None):
     """Run the complete pipeline"""
+    parser = argparse.ArgumentParser(description="Run every step from logo download to playoff simulation")
+    parser.add_argument('--no-serve', action='store_true',
+                        help="Don't serve and open the results page when the pipeline finishes")
+    args = parser.parse_args(argv)
     print("\nNBA Playoffs Predictor 2025 - Pipeline Runner")
     print("=" * 50)
     
-    # Check if Python environment has required packages
-    try:
-        import pandas
-        import numpy
-        import matplotlib
-        import sklearn
-        import requests
-        import bs4
-        import seaborn
-        import joblib
-        import nba_api
-    except ImportError as e:
-        print(f"ERROR: Missing required package: {e}")
+    # Check that the required packages are installed without importing them
+    missing = [package for package in REQUIRED_PACKAGES if importlib.util.find_spec(package) is None]
+    if missing:
+        print(f"ERROR: Missing required packages: {', '.join(missing)}")
         print("Please install all required packages: pip install -r requirements.txt")
         return 1
     
@@ -62,7 +82,8 @@ def main():
         return 1
     
     # Step 3: Train models
-    if not run_step("Model Training", "train_models.py"):
+    # Saved models are only updated with seasons they have not seen (see models/manifest.json)
+    if not run_step("Model Training", "train_models.py --incremental"):
         return 1
     
     # Step 4: Generate visualizations
@@ -104,10 +125,23 @@ def main():
     print("Pipeline completed successfully!")
     print("=" * 50)
     
-    # Open results in browser
-    print("\nOpening results in web browser...")
+    if args.no_serve:
+        print("\nServe the results with: python live_server.py  ->  http://127.0.0.1:8000/index.html")
+        return 0
+    
+    # The page fetches the bracket JSON, which browsers block on file:// URLs, so serve it
+    server, url = start_results_server()
+    print(f"\nServing results on {url} (Ctrl+C to stop)")
     import webbrowser
-    webbrowser.open('file://' + os.path.realpath('index.html'))
+    webbrowser.open(url)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
     
     return 0
 
@@ -0,0 +1,110 @@
+import numpy as np
+from typing import List, Tuple
+from scipy.special import ndtri
+
+from playoff_simulator import HOME_COURT_PATTERN
+
+# Probabilities are scaled to integer thresholds on 32-bit random words
+THRESHOLD_SCALE = 2 ** 32
+
+# Normal draws by inverse transform of 16-bit words: the midpoints of 2**16 equal
+# probability bins (tails truncated beyond 4.3 standard deviations)
+NORMAL_TABLE = ndtri((np.arange(2 ** 16) + 0.5) / 2 ** 16).astype(np.float32)
+
+
+def probability_thresholds(probabilities: np.ndarray) -> np.ndarray:
+    """Convert win probabilities to integer thresholds for 32-bit random words
+
+    A uniform 32-bit word is below the threshold with the given probability, to
+    within 2**-32 (a probability of 1 becomes 1 - 2**-32 so thresholds fit in uint32
+    and the comparison never has to widen the random words).
+    """
+    probabilities = np.clip(np.asarray(probabilities, dtype=float), 0.0, 1.0)
+    return np.minimum(np.floor(probabilities * THRESHOLD_SCALE), THRESHOLD_SCALE - 1).astype(np.uint32)
+
+
+def pack_outcomes(outcomes: np.ndarray) -> np.ndarray:
+    """Bit-pack boolean outcomes along the last axis (8 outcomes per byte)"""
+    return np.packbits(outcomes, axis=-1)
+
+
+def unpack_outcomes(packed: np.ndarray, count: int) -> np.ndarray:
+    """Inverse of pack_outcomes for the first count outcomes of the last axis"""
+    return np.unpackbits(packed, axis=-1, count=count).astype(bool)
+
+
+class ThresholdSampler:
+    """Bernoulli sampling by comparing raw random bits against integer thresholds
+
+    Drawing a full normal margin just to compare it with zero wastes most of the
+    work; here each outcome costs half of one raw 64-bit draw and an integer compare.
+    """
+
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def random_words(self, count: int) -> np.ndarray:
+        """Draw count uniform 32-bit words from raw 64-bit generator output"""
+        raw = self.rng.bit_generator.random_raw((count + 1) // 2)
+        return raw.view(np.uint32)[:count]
+
+    def standard_normal(self, size: Tuple[int, ...]) -> np.ndarray:
+        """Approximate float32 standard normal draws from a 16-bit lookup table
+
+        About three times faster than Generator.standard_normal; good enough where
+        the draws only perturb model inputs, such as team ratings.
+        """
+        count = int(np.prod(size, dtype=np.int64))
+        raw = self.rng.bit_generator.random_raw((count + 3) // 4)
+        return NORMAL_TABLE[raw.view(np.uint16)[:count]].reshape(size)
+
+    def sample(self, thresholds: np.ndarray, size: Tuple[int, ...] = ()) -> np.ndarray:
+        """Draw Bernoulli outcomes, broadcasting thresholds against size
+
+        Args:
+            thresholds: Integer thresholds from probability_thresholds
+            size: Leading shape of independent draws per threshold
+
+        Returns:
+            Boolean array of shape size + thresholds.shape
+        """
+        thresholds = np.asarray(thresholds, dtype=np.uint32)
+        shape = tuple(size) + thresholds.shape
+        words = self.random_words(int(np.prod(shape, dtype=np.int64))).reshape(shape)
+        return words < thresholds
+
+    def sample_packed(self, thresholds: np.ndarray, count: int) -> np.ndarray:
+        """Draw count outcomes per threshold and return them bit-packed
+
+        Returns:
+            uint8 array of shape thresholds.shape + (ceil(count / 8),)
+        """
+        outcomes = self.sample(thresholds, (count,))
+        return pack_outcomes(np.moveaxis(outcomes, 0, -1))
+
+    def simulate_series(self, home_thresholds: np.ndarray, away_thresholds: np.ndarray,
+                        n_trials: int, home_pattern: List[int] = HOME_COURT_PATTERN,
+                        wins_needed: int = 4) -> np.ndarray:
+        """Simulate best-of-seven series for one or more matchups
+
+        Every game of the series is drawn; the team that wins at least wins_needed
+        of them is the same team that would have got there first.
+
+        Args:
+            home_thresholds: Thresholds for team1 winning at home (any shape)
+            away_thresholds: Thresholds for team1 winning on the road
+            n_trials: Number of series to simulate per matchup
+            home_pattern: For each game, 1 if team1 is at home
+            wins_needed: Wins needed to take the series
+
+        Returns:
+            Boolean array of shape (n_trials,) + thresholds shape, True where team1 won
+        """
+        home_thresholds, away_thresholds = np.broadcast_arrays(
+            np.asarray(home_thresholds, dtype=np.uint32), np.asarray(away_thresholds, dtype=np.uint32))
+        n_games = 2 * wins_needed - 1
+        game_thresholds = np.stack([home_thresholds if home_pattern[game] else away_thresholds
+                                    for game in range(n_games)], axis=-1)
+
+        wins = self.sample(game_thresholds, (n_trials,)).sum(axis=-1, dtype=np.uint8)
+        return wins >= wins_needed
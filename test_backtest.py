@@ -0,0 +1,38 @@
+import json
+
+from backtest import SHARED_FEATURES, backtest_features, load_seasons, run_backtest, write_report
+
+
+def test_walk_forward_report(tmp_path):
+    data = load_seasons(api_files=[])
+    assert data['Year'].min() == 1980 and data['Year'].max() == 2020
+    assert data.loc[data['Year'] == 2019, 'Playoffs'].sum() == 16
+    assert not data['Team'].str.endswith('*').any()
+
+    report = run_backtest(data, n_jobs=1, seasons=[2019, 2020])
+    assert {row['season'] for row in report['seasons']} == {2019, 2020}
+    assert set(report['summary']) == {'logistic', 'random_forest', 'svm', 'ensemble'}
+    for row in report['seasons']:
+        assert 0 <= row['accuracy'] <= 1 and row['log_loss'] > 0 and 0 <= row['brier'] <= 1
+    assert report['summary']['ensemble']['accuracy'] > 0.7
+    assert {'load', 'preprocess', 'backtest', 'train', 'score'} <= set(report['timings'])
+
+    path = tmp_path / 'report.json'
+    write_report(report, str(path))
+    with open(path, 'r') as f:
+        assert json.load(f)['summary'].keys() == report['summary'].keys()
+
+
+def test_overlapping_sources_share_names_and_features(tmp_path):
+    legacy = load_seasons(api_files=[])
+    # An API-style file for 2020: nicknames, estimated ratings in FG/FGA
+    api = legacy[legacy['Year'] == 2020].drop(columns='Playoffs').copy()
+    api['FG'], api['FGA'] = 110.0, 108.0
+    path = tmp_path / 'historical_data.csv'
+    api.to_csv(path, index=False)
+
+    data = load_seasons(api_files=[str(path)])
+    season = data[data['Year'] == 2020]
+    assert len(season) == 30 and season['Team'].is_unique
+    assert 'Spurs' in set(season['Team']) and 'Trail Blazers' in set(season['Team'])
+    assert backtest_features(data) == SHARED_FEATURES
@@ -0,0 +1,33 @@
+import json
+
+from benchmarks import find_regressions, main
+
+
+def _entry(**medians):
+    return {'results': {name: {'median': median, 'min': median, 'repeats': 1} for name, median in medians.items()}}
+
+
+def test_regressions_compare_against_recent_median():
+    history = [_entry(load_data=10.0), _entry(load_data=1.0), _entry(load_data=1.0), _entry(load_data=1.2)]
+    results = {'load_data': {'median': 1.3}, 'preprocess': {'median': 5.0}}
+
+    # Baseline is the median of the last three runs (1.0); new benchmarks are never regressions
+    regressions = find_regressions(results, history, default_threshold=20.0, thresholds={}, baseline_runs=3)
+    assert [r['benchmark'] for r in regressions] == ['load_data']
+    assert abs(regressions[0]['change_pct'] - 30.0) < 1e-9
+
+    assert find_regressions(results, history, default_threshold=20.0,
+                            thresholds={'load_data': 50.0}, baseline_runs=3) == []
+
+
+def test_main_appends_history_and_flags_regressions(tmp_path):
+    history_path = tmp_path / "history.json"
+    assert main(['solve_playoffs', '--repeat', '1', '--history', str(history_path)]) == 0
+    history = json.loads(history_path.read_text())
+    assert list(history[0]['results']) == ['solve_playoffs']
+
+    # A baseline far faster than anything achievable must be reported
+    history[0]['results']['solve_playoffs']['median'] = 1e-9
+    history_path.write_text(json.dumps(history))
+    assert main(['solve_playoffs', '--repeat', '1', '--history', str(history_path), '--no-save']) == 1
+    assert len(json.loads(history_path.read_text())) == 1
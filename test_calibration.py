@@ -0,0 +1,53 @@
+import pandas as pd
+from nba_api.stats.static import teams
+
+from backtest import load_seasons
+from calibration import actual_series, round_patterns, run_calibration, season_bracket, solve_season
+from playoff_simulator import PlayoffSimulator
+
+
+def test_title_odds_are_scored_and_cached():
+    data = load_seasons(api_files=[])
+    data = data[data['Year'].between(2015, 2019)]
+    simulator = PlayoffSimulator()
+    report = run_calibration(data, simulator, n_jobs=1)
+
+    assert [row['season'] for row in report['seasons']] == [2015, 2016, 2017, 2018, 2019]
+    assert report['seasons'][0]['champion'] == 'Warriors'
+    assert all(0 < row['champion_probability'] <= 1 for row in report['seasons'])
+    assert report['summary']['title']['n'] == 5 * 20
+    assert sum(b['count'] for b in report['reliability']['title']) == 100
+
+    # Re-scoring with the same model reuses the cached seasons
+    season_df = data[data['Year'] == 2019].reset_index(drop=True)
+    assert solve_season.check_call_in_cache(season_df, None, simulator.home_court_advantage,
+                                            simulator.game_sd, simulator.rating_scale)
+
+
+def test_series_results_from_playoff_game_log():
+    nba = {team['nickname']: team for team in teams.get_teams()}
+    rows = []
+    for game, home_won in enumerate([True, True, False, False, True, True]):
+        home, away = (nba['Warriors'], nba['Cavaliers']) if game in (0, 1, 4) else (nba['Cavaliers'], nba['Warriors'])
+        margin = 5 if home_won else -5
+        game_id = f"00415000{game:02d}"
+        rows.append({'TEAM_ID': home['id'], 'GAME_ID': game_id, 'GAME_DATE': f"2015-06-{game + 4:02d}",
+                     'MATCHUP': f"{home['abbreviation']} vs. {away['abbreviation']}", 'PLUS_MINUS': margin})
+        rows.append({'TEAM_ID': away['id'], 'GAME_ID': game_id, 'GAME_DATE': f"2015-06-{game + 4:02d}",
+                     'MATCHUP': f"{away['abbreviation']} @ {home['abbreviation']}", 'PLUS_MINUS': -margin})
+
+    series = actual_series(pd.DataFrame(rows), ['Golden State Warriors', 'Cleveland Cavaliers'])
+    assert series == [('Golden State Warriors', 'Cleveland Cavaliers')]
+
+
+def test_past_seasons_use_their_seeding_and_series_formats():
+    data = load_seasons(api_files=[])
+    # 2006: the Northwest-winning Nuggets took the 3rd seed over the 60-win Mavericks
+    _, west, _ = season_bracket(data[data['Year'] == 2006].reset_index(drop=True))
+    assert list(west['Team'][:4]) == ['Spurs', 'Suns', 'Nuggets', 'Mavericks']
+    _, west, _ = season_bracket(data[data['Year'] == 2017].reset_index(drop=True))
+    assert list(west['W/L%'][:8]) == sorted(west['W/L%'][:8], reverse=True)
+
+    assert [len(pattern) for pattern in round_patterns(1999)] == [5, 7, 7, 7]
+    assert round_patterns(1999)[3] == [1, 1, 0, 0, 0, 1, 1]
+    assert [len(pattern) for pattern in round_patterns(2003)] == [7, 7, 7, 7]
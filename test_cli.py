@@ -0,0 +1,23 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+from cli import COMMANDS
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.mark.parametrize('command', ['predict', 'simulate'])
+def test_fast_commands_skip_heavy_imports(command):
+    code = (f"import sys, cli; cli.load({command!r}); "
+            "print(','.join(m for m in ['matplotlib', 'seaborn', 'sklearn', 'nba_api.stats.endpoints'] if m in sys.modules))")
+    loaded = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert loaded.stdout.strip() == ''
+
+
+def test_every_command_has_a_main():
+    code = "import cli; [cli.load(command) for command in cli.COMMANDS]"
+    subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True)
+    assert 'predict' in COMMANDS and 'simulate' in COMMANDS
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from compiled_scorer import CompiledScorer, load_compiled
+from train_models import ModelTrainer
+
+
+def _trained(conference='East'):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(300, 6)), columns=[f"f{i}" for i in range(6)])
+    y = (X['f0'] - 0.5 * X['f3'] + rng.normal(scale=0.7, size=300) > 0).astype(int)
+    trainer = ModelTrainer()
+    trainer.train_models(X[:240], y[:240], conference)
+    return trainer, X[240:]
+
+
+def test_compiled_scorer_matches_sklearn(tmp_path):
+    trainer, X_test = _trained()
+    trainer.save_models(str(tmp_path))
+    scorer = load_compiled(str(tmp_path))['East']
+
+    # Columns in a different order are matched by name
+    predictions, probabilities = scorer.score(X_test[X_test.columns[::-1]])
+    for name, model in trainer.trained_models['East'].items():
+        np.testing.assert_allclose(probabilities[name], model.predict_proba(X_test)[:, 1], rtol=0, atol=1e-9)
+        np.testing.assert_array_equal(predictions[name], model.predict(X_test))
+
+    expected = trainer.predict_playoffs(X_test, 'East')
+    compiled = scorer.predict_playoffs(X_test)
+    np.testing.assert_allclose(compiled[3], expected[3], atol=1e-9)
+    np.testing.assert_array_equal(compiled[2], expected[2])
+
+
+def test_compiled_scorer_handles_arrays_and_single_rows():
+    trainer, X_test = _trained()
+    scorer = CompiledScorer.from_models(trainer.trained_models['East'])
+    row = X_test.to_numpy()[:1]
+    probabilities = scorer.predict_proba(row)
+    for name, model in trainer.trained_models['East'].items():
+        np.testing.assert_allclose(probabilities[name], model.predict_proba(X_test[:1])[:, 1], atol=1e-9)
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from data_loading import compact_dtypes, frame_memory, read_table
+from playoff_simulator import PlayoffSimulator
+
+
+def _team_table(seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for year in [2024, 2025]:
+        for i in range(30):
+            wins = int(rng.integers(15, 65))
+            rows.append({'Team': f"Team {i}", 'Conference': 'East' if i < 15 else 'West', 'Year': year,
+                         'W': wins, 'L': 82 - wins, 'W/L%': round(wins / 82, 3),
+                         'FG': rng.normal(112, 3), 'FGA': rng.normal(112, 3)})
+    return pd.DataFrame(rows)
+
+
+def test_read_table_uses_compact_dtypes(tmp_path):
+    path = tmp_path / "teams.csv"
+    _team_table().to_csv(path, index=False)
+    df = read_table(str(path))
+
+    assert isinstance(df['Team'].dtype, pd.CategoricalDtype)
+    assert isinstance(df['Conference'].dtype, pd.CategoricalDtype)
+    assert df['Year'].dtype == np.int16 and df['W'].dtype == np.int16
+    assert df['FG'].dtype == np.float32
+    assert frame_memory(df) < frame_memory(pd.read_csv(path)) / 2
+    # Missing values keep counts from being squeezed into integers
+    with_gap = compact_dtypes(pd.DataFrame({'W': [50.0, np.nan]}))
+    assert with_gap['W'].dtype == np.float32
+
+
+def test_load_team_data_sorts_each_conference(tmp_path):
+    path = tmp_path / "teams.csv"
+    table = _team_table()
+    table.to_csv(path, index=False)
+    east, west = PlayoffSimulator(n_simulations=10).load_team_data(str(path))
+
+    season = table[table['Year'] == 2025]
+    for conference, loaded in [('East', east), ('West', west)]:
+        expected = season[season['Conference'] == conference].sort_values('W/L%', ascending=False, kind='stable')
+        assert list(loaded['Team']) == list(expected['Team'])
+        assert np.allclose(loaded['NET_RATING'], expected['FG'] - expected['FGA'], atol=1e-4)
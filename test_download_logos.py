@@ -0,0 +1,79 @@
+import io
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image
+
+from download_logos import download_logos
+
+
+def _png_bytes(color):
+    buffer = io.BytesIO()
+    Image.new('RGBA', (500, 500), color).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class _LogoHandler(BaseHTTPRequestHandler):
+    logos = {}
+    requests_seen = []
+
+    def do_GET(self):
+        content = self.logos[self.path]
+        etag = f'"{hash(content)}"'
+        self.requests_seen.append((self.path, self.headers.get('If-None-Match')))
+
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_download_logos(tmp_path):
+    _LogoHandler.logos = {
+        '/okc.png': _png_bytes((0, 122, 193, 255)),
+        '/den.png': _png_bytes((14, 34, 64, 255)),
+        '/nba.png': _png_bytes((0, 0, 0, 255)),
+    }
+    _LogoHandler.requests_seen = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _LogoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        kwargs = dict(
+            team_logos={'Thunder': f"{base}/okc.png", 'Nuggets': f"{base}/den.png"},
+            main_logos={'nba_no_background.png': f"{base}/nba.png"},
+            images_dir=str(tmp_path),
+        )
+
+        # First run downloads everything at full size
+        results = download_logos(**kwargs)
+        assert set(results.values()) == {'downloaded'}
+        for team in ['Thunder', 'Nuggets']:
+            with Image.open(os.path.join(tmp_path, 'logos', f"{team}.png")) as image:
+                assert image.size == (500, 500)
+
+        # Second run sends conditional requests and gets 304s back
+        results = download_logos(**kwargs)
+        assert set(results.values()) == {'not_modified'}
+        assert all(etag is not None for _, etag in _LogoHandler.requests_seen[-3:])
+
+        # A changed logo is the only one fetched again
+        _LogoHandler.logos['/okc.png'] = _png_bytes((239, 59, 36, 255))
+        results = download_logos(**kwargs)
+        assert results[os.path.join(tmp_path, 'logos', 'Thunder.png')] == 'downloaded'
+        assert results[os.path.join(tmp_path, 'logos', 'Nuggets.png')] == 'not_modified'
+    finally:
+        server.shutdown()
+        server.server_close()
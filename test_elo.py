@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from elo import EloRatings
+from playoff_simulator import PlayoffSimulator, ROUND_COLUMNS
+from test_playoff_simulator import _fixture
+
+
+def _game_log(n_seasons=2, n_teams=20, seed=0):
+    """Paired games with dates, one game per team per date"""
+    rng = np.random.default_rng(seed)
+    strength = np.linspace(-6, 6, n_teams)
+    rows = []
+    for season in range(2000, 2000 + n_seasons):
+        for day, date in enumerate(pd.date_range(f"{season - 1}-11-01", periods=60, freq='2D')):
+            order = rng.permutation(n_teams)
+            for home, away in zip(order[::2], order[1::2]):
+                margin = round(strength[home] - strength[away] + 3 + rng.normal(0, 12)) or 1
+                rows.append({'GAME_ID': f"{season}{day:03d}{home:02d}", 'GAME_DATE': date,
+                             'HOME': f"Team {home}", 'AWAY': f"Team {away}", 'HOME_MARGIN': margin})
+    return pd.DataFrame(rows)
+
+
+def test_batched_dates_match_single_game_updates_and_replay():
+    games = _game_log()
+    batched = EloRatings().process(games)
+
+    single = EloRatings()
+    for game in games.itertuples():
+        single.update_game(game.HOME, game.AWAY, game.HOME_MARGIN, date=game.GAME_DATE)
+    assert np.allclose(single.ratings[batched.teams], batched.ratings)
+
+    # Stronger teams end up rated higher
+    strength = batched.ratings[[f"Team {i}" for i in range(20)]].to_numpy()
+    assert np.corrcoef(strength, np.arange(20))[0, 1] > 0.8
+
+    # Any date can be replayed and continued to the same result
+    cutoff = games['GAME_DATE'].iloc[len(games) // 2]
+    replayed = batched.replay(cutoff)
+    assert np.allclose(replayed.ratings[replayed.teams], batched.ratings_on(cutoff)[replayed.teams])
+    replayed.process(games[games['GAME_DATE'] > cutoff])
+    assert np.allclose(replayed.ratings[batched.teams], batched.ratings)
+
+
+def test_simulator_uses_external_win_probabilities():
+    east, west = _fixture()
+    simulator = PlayoffSimulator()
+    baseline = simulator.solve_playoffs(east, west)
+
+    # A matrix equal to the ratings model reproduces the ratings-based odds
+    teams = list(west['Team'][:10]) + list(east['Team'][:10])
+    ratings = np.concatenate([west['NET_RATING'][:10], east['NET_RATING'][:10]])
+    matrix = pd.DataFrame(simulator.home_win_matrix(ratings), index=teams, columns=teams)
+    simulator.use_win_probabilities(matrix)
+    assert np.allclose(simulator.solve_playoffs(east, west)[ROUND_COLUMNS], baseline[ROUND_COLUMNS])
+
+    # Each team plays the next one on the same date, so teams appear twice in a day
+    games = pd.DataFrame({'GAME_DATE': '2025-01-01', 'HOME': teams, 'AWAY': np.roll(teams, -1),
+                          'HOME_MARGIN': np.round(ratings - np.roll(ratings, -1)) + 0.5})
+    elo = EloRatings().process(games)
+    simulator.use_win_probabilities(elo.win_probabilities(teams))
+    odds = simulator.solve_playoffs(east, west)
+    assert np.allclose(odds[ROUND_COLUMNS].sum().to_numpy(), [16, 8, 4, 2, 1])
+    p = simulator.team_win_probability(teams[1], teams[2], 1)
+    assert np.isclose(p, elo.expected(elo.ratings[teams[1]], elo.ratings[teams[2]]))
+
+
+def test_team_twice_on_one_side_in_a_date():
+    # A plays at home twice on one date, after X has already played
+    games = pd.DataFrame({'GAME_DATE': '2025-01-01', 'HOME': ['X', 'A', 'A', 'B'],
+                          'AWAY': ['Y', 'X', 'Z', 'A'], 'HOME_MARGIN': [10, 10, 10, -4]})
+    batched = EloRatings().process(games)
+
+    single = EloRatings()
+    for game in games.itertuples():
+        single.update_game(game.HOME, game.AWAY, game.HOME_MARGIN, date=game.GAME_DATE)
+    assert np.allclose(single.ratings[batched.teams], batched.ratings)
+    # Updates are zero-sum, so no game's update was lost
+    assert np.isclose(batched.ratings.sum(), 1500.0 * len(batched.teams))
@@ -0,0 +1,40 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from feature_importance import permutation_importance
+from train_models import ModelTrainer
+
+
+def _fitted():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(200, 4)), columns=['signal', 'noise', 'weak', 'other'])
+    y = (2 * X['signal'] + 0.5 * X['weak'] + rng.normal(scale=0.5, size=200) > 0).astype(int)
+    models = ModelTrainer().train_models(X[:150], y[:150], 'East')
+    return models, X[150:], y[150:]
+
+
+def test_every_model_ranks_the_signal_first(tmp_path):
+    models, X, y = _fitted()
+    results = permutation_importance(models, X, y, n_repeats=5, n_jobs=1, cache_dir=str(tmp_path))
+    assert set(results) == {'logistic', 'random_forest', 'svm'}
+    for result in results.values():
+        assert result['importance'].idxmax() == 'signal'
+        assert abs(result.loc['noise', 'importance']) < result.loc['signal', 'importance'] / 5
+
+
+def test_results_are_cached_per_model_and_match_parallel_runs(tmp_path):
+    models, X, y = _fitted()
+    first = permutation_importance(models, X, y, n_repeats=5, n_jobs=2, cache_dir=str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 3
+
+    serial = permutation_importance(models, X, y, n_repeats=5, n_jobs=1, cache_dir=None)
+    cached = permutation_importance(models, X, y, n_repeats=5, n_jobs=1, cache_dir=str(tmp_path))
+    for name in models:
+        pd.testing.assert_frame_equal(first[name], serial[name])
+        pd.testing.assert_frame_equal(first[name], cached[name])
+
+    # New data is a new cache entry for every model
+    permutation_importance(models, X[:40], y[:40], n_repeats=5, n_jobs=1, cache_dir=str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 6
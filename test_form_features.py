@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+from nba_api.stats.static import teams
+
+from form_features import FORM_COLUMNS, FormFeatures, team_games
+
+
+def _raw_box_scores(n_days=40, seed=0):
+    """leaguegamefinder-style box score rows for a few games a day"""
+    rng = np.random.default_rng(seed)
+    nba = teams.get_teams()
+    rows = []
+    for day, date in enumerate(pd.date_range('2024-10-22', periods=n_days)):
+        order = rng.permutation(len(nba))[:10]
+        for k, (home, away) in enumerate(zip(order[::2], order[1::2])):
+            game_id = f"00224{day:03d}{k:02d}"
+            for team, opponent, sep in [(home, away, 'vs.'), (away, home, '@')]:
+                rows.append({'TEAM_ID': nba[team]['id'], 'GAME_ID': game_id, 'GAME_DATE': str(date.date()),
+                             'MATCHUP': f"{nba[team]['abbreviation']} {sep} {nba[opponent]['abbreviation']}",
+                             'PTS': int(rng.integers(90, 130)), 'FGA': int(rng.integers(80, 95)),
+                             'OREB': int(rng.integers(5, 15)), 'TOV': int(rng.integers(8, 18)),
+                             'FTA': int(rng.integers(15, 30)), 'MIN': 240})
+    return pd.DataFrame(rows)
+
+
+def test_team_games_and_window_features():
+    games = team_games(_raw_box_scores())
+    assert len(games) == 40 * 10
+    assert np.allclose(games.groupby('GAME_ID')['MARGIN'].sum(), 0)
+    # Every game is 240 team minutes, so pace equals possessions
+    assert np.allclose(games['ORTG'] - games['DRTG'], 100 * games['MARGIN'] / games['PACE'])
+
+    features = FormFeatures().fit(games)
+    team = games['TEAM'].iloc[0]
+    mine = games[games['TEAM'] == team]
+    expected = mine['MARGIN'].rolling(5, min_periods=1).mean()
+    assert np.allclose(features.loc[mine.index, 'MARGIN_LAST5'], expected)
+    assert list(features.columns[3:]) == FORM_COLUMNS
+
+
+def test_incremental_updates_match_a_full_refit():
+    games = team_games(_raw_box_scores())
+    last_day = games['GAME_DATE'] == games['GAME_DATE'].max()
+
+    full = FormFeatures()
+    full_features = full.fit(games)
+    incremental = FormFeatures()
+    incremental.fit(games[~last_day])
+    new = incremental.update(games)  # already-seen rows are skipped
+
+    assert len(new) == last_day.sum()
+    merged = full_features.merge(new, on=['GAME_ID', 'TEAM'], suffixes=('', '_new'))
+    for column in FORM_COLUMNS:
+        assert np.allclose(merged[column], merged[f"{column}_new"])
+    pd.testing.assert_frame_equal(full.current().sort_values('Team').reset_index(drop=True),
+                                  incremental.current().sort_values('Team').reset_index(drop=True))
@@ -0,0 +1,100 @@
+import json
+import numpy as np
+import pandas as pd
+from nba_api.stats.static import teams
+
+import playoff_simulator
+from playoff_simulator import ROUND_COLUMNS
+from game_log import season_string
+from game_model import GAME_FEATURES, GameModel, game_rows, season_chunks
+from form_features import FormFeatures, team_games
+
+
+def _season_box_scores(year, n_days=60, seed=0):
+    """leaguegamefinder-style rows where stronger teams (by id order) win by more"""
+    rng = np.random.default_rng(seed)
+    nba = teams.get_teams()
+    strength = np.linspace(-8, 8, len(nba))
+    rows = []
+    for day, date in enumerate(pd.date_range(f'{year - 1}-10-22', periods=n_days)):
+        order = rng.permutation(len(nba))[:10]
+        for k, (home, away) in enumerate(zip(order[::2], order[1::2])):
+            # No ties in the NBA
+            margin = round(strength[home] - strength[away] + 3 + rng.normal(0, 12)) or 1
+            points = {home: 110 + margin, away: 110}
+            for team, opponent, sep in [(home, away, 'vs.'), (away, home, '@')]:
+                rows.append({'TEAM_ID': nba[team]['id'], 'GAME_ID': f"002{year % 100:02d}{day:03d}{k:02d}",
+                             'GAME_DATE': str(date.date()),
+                             'MATCHUP': f"{nba[team]['abbreviation']} {sep} {nba[opponent]['abbreviation']}",
+                             'PTS': points[team], 'FGA': 88, 'OREB': 10, 'TOV': 13, 'FTA': 22,
+                             'MIN': 240})
+    return pd.DataFrame(rows)
+
+
+def test_game_rows_use_pregame_form():
+    X, y = game_rows(_season_box_scores(2024))
+    assert X.shape[1] == len(GAME_FEATURES) and X.dtype == np.float32
+    # Both sides of every game: home flags and outcomes balance out
+    assert X[:, -1].sum() == 0
+    assert y.sum() * 2 == len(y)
+    # Without form before a team's first game, those rows are dropped
+    assert len(y) < 60 * 5 * 2
+
+
+def test_streamed_model_ranks_teams(tmp_path):
+    years = [2022, 2023, 2024]
+    for seed, year in enumerate(years):
+        with open(tmp_path / f"games_{season_string(year)}.json", 'w') as f:
+            json.dump(_season_box_scores(year, seed=seed).to_dict('records'), f)
+
+    chunks = list(season_chunks(years, chunk_size=200, cache_dir=str(tmp_path)))
+    assert max(len(y) for _, y in chunks) <= 200
+
+    model = GameModel(epochs=3).fit_seasons(years, chunk_size=200, cache_dir=str(tmp_path))
+    form = FormFeatures()
+    form.fit(team_games(_season_box_scores(2024)))
+    matrix = model.win_probabilities(form.current())
+
+    assert matrix.shape == (30, 30)
+    assert np.allclose(np.diag(matrix), 0.5)
+    # Home court helps: a team is likelier to beat an opponent at home than on the road
+    off_diagonal = ~np.eye(30, dtype=bool)
+    assert (matrix.to_numpy() + matrix.to_numpy().T)[off_diagonal].mean() > 1.0
+    # Strength is ordered by team id, and the best team is a home favourite over the worst
+    ids = {team['nickname']: team['id'] for team in teams.get_teams()}
+    ranked = sorted(matrix.index, key=ids.get)
+    assert matrix.at[ranked[-1], ranked[0]] > 0.7
+
+
+def test_simulator_main_uses_game_model(tmp_path, monkeypatch):
+    with open(tmp_path / f"games_{season_string(2024)}.json", 'w') as f:
+        json.dump(_season_box_scores(2024).to_dict('records'), f)
+    model_path = tmp_path / "game_model.joblib"
+    GameModel(epochs=2).fit_seasons([2024], cache_dir=str(tmp_path)).save(str(model_path))
+
+    # A season table as the scraper writes it, form columns included
+    form = FormFeatures()
+    form.fit(team_games(_season_box_scores(2025, seed=1)))
+    table = form.current()
+    table['Conference'] = ['East' if i % 2 else 'West' for i in range(len(table))]
+    table['Year'] = 2025
+    table['W/L%'] = 0.5 + table['MARGIN_EWM'] / 30
+    table['FG'], table['FGA'] = 110.0, 110.0
+    table.to_csv(tmp_path / "current_season.csv", index=False)
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "NBA_data").mkdir()
+    for args, output in [([], "ratings.csv"), (['--game-model', str(model_path)], "game_model.csv")]:
+        assert not playoff_simulator.main(['--simulations', '20', '--seed', '0', '--data', 'current_season.csv'] + args)
+        (tmp_path / "NBA_data" / "playoff_odds.csv").rename(tmp_path / output)
+
+    ratings, game_model = pd.read_csv(tmp_path / "ratings.csv"), pd.read_csv(tmp_path / "game_model.csv")
+    assert np.allclose(game_model.groupby('Conference')['make_playoffs'].sum(), 8)
+    assert not np.allclose(ratings['champion'], game_model['champion'])
+
+    # The same odds as handing the model's matrix to the simulator directly
+    simulator = playoff_simulator.PlayoffSimulator()
+    east, west = simulator.load_team_data("current_season.csv")
+    simulator.use_win_probabilities(GameModel.load(str(model_path)).win_probabilities(table))
+    expected = simulator.solve_playoffs(east, west)
+    assert np.allclose(game_model[ROUND_COLUMNS], expected[ROUND_COLUMNS])
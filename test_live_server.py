@@ -0,0 +1,74 @@
+import copy
+import json
+import socket
+import threading
+
+from live_server import BracketBroadcaster, create_server
+
+
+def _read_event(stream):
+    lines = []
+    while True:
+        line = stream.readline().decode().rstrip('\n')
+        if not line:
+            if lines:
+                break
+            continue
+        lines.append(line)
+    return json.loads(lines[-1][len('data: '):])
+
+
+def test_live_updates_push_only_changed_matchups(tmp_path):
+    with open('NBA_data/playoff_simulations.json', 'r') as f:
+        results = json.load(f)
+
+    broadcaster = BracketBroadcaster()
+    broadcaster.publish(results)
+    server = create_server(broadcaster, port=0, directory=str(tmp_path))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        connection = socket.create_connection(server.server_address, timeout=5)
+        connection.sendall(b"GET /events HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        stream = connection.makefile('rb')
+        while stream.readline() not in (b'\r\n', b'\n'):
+            pass
+
+        # A new page gets the whole bracket first
+        snapshot = _read_event(stream)
+        assert len(snapshot['matchups']) == sum(len(r['matchups']) for r in results['rounds'])
+
+        # Then only the matchup whose odds moved
+        updated = copy.deepcopy(results)
+        updated['rounds'][0]['matchups'][1]['team1']['probability'] = 0.61
+        updated['rounds'][0]['matchups'][1]['team2']['probability'] = 0.39
+        assert list(broadcaster.publish(updated)) == ['r0-m1']
+
+        patch = _read_event(stream)
+        assert list(patch['matchups']) == ['r0-m1']
+        assert patch['matchups']['r0-m1']['team1']['probability'] == 0.61
+        assert not patch['matchups']['r0-m1']['team1']['logo'].startswith('/')
+
+        # Republishing identical results sends nothing
+        assert broadcaster.publish(updated) == {}
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_pipeline_serves_results_over_http():
+    from urllib.request import urlopen
+    from run_pipeline import start_results_server
+
+    server, url = start_results_server()
+    try:
+        assert url.startswith('http://') and url.endswith('/index.html')
+        with urlopen(url, timeout=5) as response:
+            assert response.status == 200
+        # The page's bracket data is reachable from the same origin
+        with urlopen(url.replace('index.html', 'Images/bracket/bracket.json'), timeout=5) as response:
+            assert 'rounds' in json.loads(response.read())
+    finally:
+        server.shutdown()
+        server.server_close()
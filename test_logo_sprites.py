@@ -0,0 +1,35 @@
+import json
+import os
+
+import numpy as np
+from PIL import Image
+
+from logo_sprites import LogoCache, build_sprite_sheet
+
+
+def test_sprite_index_round_trips_through_logo_cache(tmp_path):
+    logos_dir = tmp_path / 'logos'
+    logos_dir.mkdir()
+    colors = {'Thunder': (0, 122, 193, 255), 'Nuggets': (14, 34, 64, 255), 'Trail Blazers': (224, 58, 62, 255)}
+    for team, color in colors.items():
+        Image.new('RGBA', (100, 100), color).save(logos_dir / f"{team}.png")
+
+    sprite_path = str(logos_dir / 'sprite.png')
+    index_path = str(logos_dir / 'sprite.json')
+    offsets = build_sprite_sheet(str(logos_dir), sprite_path, index_path, css_path=None, cell=32, columns=2)
+
+    with open(index_path) as f:
+        index = json.load(f)
+    assert index['cell'] == 32
+    assert index['teams'] == {team: list(offset) for team, offset in offsets.items()}
+    assert all(len(offset) == 2 for offset in index['teams'].values())
+
+    # Each logo comes back out of the sheet, not from its own file
+    for team in colors:
+        os.remove(logos_dir / f"{team}.png")
+    cache = LogoCache(sprite_path, index_path, str(logos_dir))
+    for team, color in colors.items():
+        logo = cache.get(team)
+        assert logo.shape == (32, 32, 4)
+        assert np.allclose(logo[16, 16], np.array(color) / 255.0)
+    assert cache.get('Lakers') is None
@@ -0,0 +1,95 @@
+import json
+import numpy as np
+import pandas as pd
+from nba_api.stats.static import teams
+
+from form_features import FORM_COLUMNS
+from nba_scraper_2025 import NBAScraper
+from test_form_features import _raw_box_scores
+
+METRICS = ['E_OFF_RATING', 'E_DEF_RATING', 'E_NET_RATING', 'E_PACE', 'E_AST_RATIO', 'E_OREB_PCT',
+           'E_DREB_PCT', 'E_REB_PCT', 'E_TM_TOV_PCT']
+
+
+def _write_cache(cache_dir, season="2024-25", n_days=40):
+    """Standings, metrics and game results for every team, as the scraper caches them"""
+    nba = teams.get_teams()
+    standings = [{'TeamID': team['id'], 'TeamName': team['nickname'],
+                  'Conference': 'Eastern' if i < 15 else 'Western', 'WINS': 41, 'LOSSES': 41,
+                  'WinPCT': 0.5, 'ConferenceGamesBack': '-' if i in (0, 15) else 3.0}
+                 for i, team in enumerate(nba)]
+    metrics = [dict({'TEAM_ID': team['id']}, **{metric: 100.0 + i for i, metric in enumerate(METRICS)})
+               for team in nba]
+    games = _raw_box_scores(n_days)
+    games['PLUS_MINUS'] = 2 * games['PTS'] - games.groupby('GAME_ID')['PTS'].transform('sum')
+    games = games.to_dict('records')
+    for endpoint, data in [('standings', standings), ('metrics', metrics), ('games', games)]:
+        with open(cache_dir / f"{endpoint}_{season}.json", 'w') as f:
+            json.dump(data, f)
+
+
+def _games_played(cache_dir, season="2024-25"):
+    nicknames = {team['id']: team['nickname'] for team in teams.get_teams()}
+    with open(cache_dir / f"games_{season}.json") as f:
+        games = json.load(f)
+    return pd.Series([nicknames[game['TEAM_ID']] for game in games]).value_counts()
+
+
+def test_get_season_data_from_cache(tmp_path):
+    _write_cache(tmp_path)
+    df = NBAScraper(cache_dir=str(tmp_path)).get_season_data(2025)
+
+    assert df is not None and len(df) == 30
+    assert set(df['Conference']) == {'East', 'West'}
+    # Every team played, so every team has form from the game log
+    assert all(column in df for column in FORM_COLUMNS)
+    assert not df[FORM_COLUMNS].isna().any().any()
+    # Margin-of-victory ratings are centred on zero
+    assert abs(df['SRS'].mean()) < 1e-3
+    # With at most 15 games played, the 15-game form margin is the season margin
+    played = df['Team'].map(_games_played(tmp_path))
+    short = played <= 15
+    assert short.any()
+    assert np.allclose((df['PS/G'] - df['PA/G'])[short], df.loc[short, 'MARGIN_LAST15'], atol=1e-3)
+
+
+def test_form_state_is_updated_with_new_games(tmp_path):
+    first, fresh = tmp_path / "first", tmp_path / "fresh"
+    first.mkdir()
+    fresh.mkdir()
+    _write_cache(first, n_days=25)
+    NBAScraper(cache_dir=str(first)).get_season_data(2025)
+    assert (first / "form_2024-25.npz").exists()
+
+    # More games arrive: the saved state only applies the new ones
+    _write_cache(first, n_days=40)
+    updated = NBAScraper(cache_dir=str(first)).get_season_data(2025)
+    _write_cache(fresh, n_days=40)
+    refit = NBAScraper(cache_dir=str(fresh)).get_season_data(2025)
+
+    assert np.allclose(updated[FORM_COLUMNS], refit[FORM_COLUMNS])
+
+
+def test_partial_game_log_keeps_team_stats(tmp_path):
+    _write_cache(tmp_path, n_days=3)
+    with open(tmp_path / "games_2024-25.json") as f:
+        games = json.load(f)
+    # The latest games are still in progress and have no margin yet
+    last = max(game['GAME_DATE'] for game in games)
+    for game in games:
+        if game['GAME_DATE'] == last:
+            game['PLUS_MINUS'] = None
+    with open(tmp_path / "games_2024-25.json", 'w') as f:
+        json.dump(games, f)
+    df = NBAScraper(cache_dir=str(tmp_path)).get_season_data(2025)
+    assert len(df) == 30 and df['SRS'].notna().all()
+
+    # A log the ratings and form can't be built from still gives every team's stats
+    for game in games:
+        del game['MATCHUP']
+    with open(tmp_path / "games_2024-25.json", 'w') as f:
+        json.dump(games, f)
+    df = NBAScraper(cache_dir=str(tmp_path)).get_season_data(2025)
+    assert len(df) == 30
+    assert np.allclose(df['SRS'], df['FG%'])
+    assert not any(column in df for column in FORM_COLUMNS)
@@ -0,0 +1,32 @@
+import numpy as np
+
+from outcome_store import simulate_outcomes
+from playoff_simulator import PlayoffSimulator, ROUND_COLUMNS
+from test_playoff_simulator import _fixture
+
+
+def test_stored_trials_match_exact_odds_and_answer_conditionals(tmp_path):
+    east, west = _fixture()
+    simulator = PlayoffSimulator()
+    n = 40000
+    store = simulate_outcomes(simulator, east, west, str(tmp_path), n_trials=n, seed=7, chunk_size=15000)
+    assert store.winners.shape == (21, n) and store.winners.dtype == np.uint8
+
+    exact = simulator.solve_playoffs(east, west)
+    for _, row in exact.iterrows():
+        for column in ROUND_COLUMNS:
+            p = row[column]
+            observed = store.probability(store.reaches(row['Team'], column))
+            assert abs(observed - p) <= 4 * np.sqrt(p * (1 - p) / n) + 1e-12
+
+    # Conditioning on a series result pins it, and joint = conditional * marginal
+    upset = ~store.wins('West 1', 'West first round 1v8')
+    given = store.beat('West 2', 'West 7') | store.beat('West 2', 'West 8')
+    assert store.probability(store.reaches('West 1', 'conf_semis'), upset) == 0.0
+    title = store.reaches('West 2')
+    assert np.isclose(store.probability(title & given),
+                      store.probability(title, given) * store.probability(given))
+
+    odds = store.conditional_odds(store.reaches('East 1'))
+    assert np.isclose(odds[ROUND_COLUMNS].sum().to_numpy(), [16, 8, 4, 2, 1]).all()
+    assert odds.loc[odds['Team'] == 'East 1', 'champion'].iloc[0] == 1.0
@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+
+from playoff_simulator import (HOME_COURT_PATTERN, PlayoffSimulator, ROUND_COLUMNS, series_state_table,
+                               series_win_probability)
+
+
+def _conference(conf, ratings):
+    """Conference table sorted by record, in the shape load_team_data returns"""
+    ratings = np.sort(np.asarray(ratings, dtype=float))[::-1]
+    return pd.DataFrame({
+        'Team': [f"{conf} {i + 1}" for i in range(len(ratings))],
+        'Conference': conf,
+        'W/L%': np.linspace(0.75, 0.25, len(ratings)),
+        'NET_RATING': ratings,
+    })
+
+
+def _fixture():
+    rng = np.random.default_rng(0)
+    return _conference('East', rng.normal(0, 5, 15)), _conference('West', rng.normal(0, 5, 15))
+
+
+def test_series_probability_matches_simulation():
+    np.random.seed(1)
+    simulator = PlayoffSimulator()
+    team1 = pd.Series({'Team': 'A', 'NET_RATING': 2.0})
+    team2 = pd.Series({'Team': 'B', 'NET_RATING': -1.0})
+
+    n = 20000
+    simulated = np.mean([simulator.simulate_series(team1, team2, True) == 1 for _ in range(n)])
+
+    margin = team1['NET_RATING'] - team2['NET_RATING']
+    exact = series_win_probability(
+        simulator.game_win_probability(margin + simulator.home_court_advantage),
+        simulator.game_win_probability(margin - simulator.home_court_advantage)
+    )
+    assert abs(simulated - exact) < 4 * np.sqrt(exact * (1 - exact) / n)
+
+
+def test_solve_playoffs_is_a_distribution():
+    east, west = _fixture()
+    odds = PlayoffSimulator().solve_playoffs(east, west)
+
+    assert len(odds) == 20
+    totals = odds[ROUND_COLUMNS].sum()
+    assert np.allclose(totals.to_numpy(), [16, 8, 4, 2, 1])
+
+    # Top six seeds are in; reaching a round is never likelier than the one before
+    assert np.allclose(odds.loc[odds['Seed'] <= 6, 'make_playoffs'], 1.0)
+    values = odds[ROUND_COLUMNS].to_numpy()
+    assert np.all(np.diff(values, axis=1) <= 1e-12)
+
+
+def test_equal_teams_split_evenly():
+    east = _conference('East', np.zeros(15))
+    west = _conference('West', np.zeros(15))
+    simulator = PlayoffSimulator()
+    simulator.home_court_advantage = 0.0
+    odds = simulator.solve_playoffs(east, west)
+
+    playoff_teams = odds[odds['Seed'] <= 6]
+    assert np.allclose(playoff_teams['champion'], 1 / 16)
+
+
+def test_series_state_table_recursion():
+    table = series_state_table(0.6, 0.45)
+
+    # Settled states, and each state is the mix of the two states after the next game
+    assert np.all(table[4, :4] == 1.0) and np.all(table[:4, 4] == 0.0)
+    assert np.isclose(table[2, 1], 0.45 * table[3, 1] + 0.55 * table[2, 2])  # game 4 on the road
+    assert np.isclose(table[3, 3], 0.6)  # game 7 at home
+
+    np.random.seed(2)
+    simulator = PlayoffSimulator()
+    team1 = pd.Series({'Team': 'A', 'NET_RATING': 0.0})
+    team2 = pd.Series({'Team': 'B', 'NET_RATING': 1.5})
+    n = 20000
+    simulated = np.mean([simulator.simulate_series(team1, team2, True, 2, 1) == 1 for _ in range(n)])
+    exact = simulator.live_series_probability(team1, team2, True, 2, 1)
+    assert abs(simulated - exact) < 4 * np.sqrt(exact * (1 - exact) / n)
+
+
+def test_resolved_series_prune_the_bracket():
+    east, west = _fixture()
+    simulator = PlayoffSimulator()
+
+    play_in = {'East': ('East 7', 'East 9'), 'West': ('West 8', 'West 7')}
+    states = {('East 2', 'East 7'): (1, 4), ('West 1', 'West 7'): (3, 0)}
+    odds = simulator.solve_playoffs(east, west, states, play_in)
+    assert odds.loc[odds['Team'] == 'East 8', 'make_playoffs'].iloc[0] == 0.0
+    east_2 = odds[odds['Team'] == 'East 2'].iloc[0]
+    assert east_2['conf_semis'] == 0.0 and east_2['champion'] == 0.0
+
+    baseline = simulator.solve_playoffs(east, west, play_in_results=play_in)
+    west_1 = odds[odds['Team'] == 'West 1'].iloc[0]
+    assert west_1['conf_semis'] > baseline.loc[baseline['Team'] == 'West 1', 'conf_semis'].iloc[0]
+    assert np.allclose(odds[ROUND_COLUMNS].sum().to_numpy(), [16, 8, 4, 2, 1])
+
+
+def test_sweep_matches_single_solves():
+    east, west = _fixture()
+    simulator = PlayoffSimulator()
+    sweep = simulator.sweep(east, west, home_court_advantage=[0.0, 3.0], game_sd=[10.0, 13.0],
+                            rating_scale=[0.8, 1.0, 1.2], chunk_size=5)
+    assert len(sweep) == 2 * 2 * 3 * 20
+
+    totals = sweep.groupby(['home_court_advantage', 'game_sd', 'rating_scale'])[ROUND_COLUMNS].sum()
+    assert np.allclose(totals.to_numpy(), [16, 8, 4, 2, 1])
+
+    simulator.home_court_advantage, simulator.game_sd, simulator.rating_scale = 0.0, 13.0, 1.2
+    point = sweep[(sweep['home_court_advantage'] == 0.0) & (sweep['game_sd'] == 13.0)
+                  & (sweep['rating_scale'] == 1.2)]
+    single = simulator.solve_playoffs(east, west)
+    assert np.allclose(point[ROUND_COLUMNS].to_numpy(), single[ROUND_COLUMNS].to_numpy())
+    assert list(point['Team']) == list(single['Team'])
+
+
+def test_best_of_five_first_round():
+    east, west = _fixture()
+    simulator = PlayoffSimulator()
+    default = simulator.solve_playoffs(east, west)
+    assert np.allclose(simulator.solve_playoffs(east, west, round_patterns=[HOME_COURT_PATTERN] * 4)[ROUND_COLUMNS],
+                       default[ROUND_COLUMNS])
+
+    short = simulator.solve_playoffs(east, west, round_patterns=[[1, 1, 0, 0, 1]] + [HOME_COURT_PATTERN] * 3)
+    # A shorter series gives the stronger top seed less margin for error
+    top_seeds = default['Seed'] == 1
+    assert (short.loc[top_seeds, 'conf_semis'] < default.loc[top_seeds, 'conf_semis']).all()
+    assert np.allclose(short.groupby('Conference')['conf_semis'].sum(), 4)
+
+    bracket = simulator._playoff_field(east, west)
+    rounds = simulator.meeting_rounds(bracket)
+    seed = {(conf, s): i for i, (conf, s) in enumerate(zip(
+        [c for c, n in bracket['conferences'] for _ in range(n)], bracket['seeds']))}
+    assert rounds[seed['East', 1], seed['East', 8]] == 0
+    assert rounds[seed['East', 1], seed['East', 4]] == 1
+    assert rounds[seed['East', 1], seed['East', 2]] == 2
+    assert rounds[seed['East', 1], seed['West', 1]] == 3
+    # The 9th and 10th place teams can only come through as the 8th seed
+    for place in (9, 10):
+        assert rounds[seed['East', 1], seed['East', place]] == 0
+        assert rounds[seed['East', 4], seed['East', place]] == 1
+        assert rounds[seed['East', 2], seed['East', place]] == 2
+        assert rounds[seed['East', place], seed['West', 2]] == 3
+
+
+def test_play_in_can_swap_seventh_and_eighth():
+    east, west = _fixture()
+    teams = list(east['Team']) + list(west['Team'])
+    home_win = pd.DataFrame(0.5, index=teams, columns=teams)
+    for conf in ['East', 'West']:
+        # 8th place always beats 7th, who then always beats the 9/10 winner
+        home_win.loc[f"{conf} 7", f"{conf} 8"], home_win.loc[f"{conf} 8", f"{conf} 7"] = 0.0, 1.0
+        home_win.loc[f"{conf} 7", [f"{conf} 9", f"{conf} 10"]] = 1.0
+    simulator = PlayoffSimulator(n_simulations=10).use_win_probabilities(home_win)
+
+    first_round = simulator.simulate_playoffs(east, west)['rounds'][0]['matchups']
+    seeded = {matchup['team2']['seed']: matchup['team2']['name'] for matchup in first_round[:4]}
+    assert seeded[7] == 'West 8' and seeded[8] == 'West 7'
+    # The caller's standings are untouched
+    assert list(west['Team'][:10]) == [f"West {i}" for i in range(1, 11)]
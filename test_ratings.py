@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from nba_api.stats.static import teams
+
+from game_log import pair_games
+from playoff_simulator import PlayoffSimulator
+from ratings import MasseyRatings, apply_rating_distribution, fit_rating_distribution
+
+
+def _raw_game_log(true_ratings, n_rounds, home_court=3.0, seed=0):
+    """leaguegamefinder-style rows (one per team per game) from known ratings"""
+    rng = np.random.default_rng(seed)
+    nba = teams.get_teams()[:len(true_ratings)]
+    rows = []
+    game = 0
+    for _ in range(n_rounds):
+        order = rng.permutation(len(nba))
+        for home, away in zip(order[::2], order[1::2]):
+            margin = round(true_ratings[home] - true_ratings[away] + home_court + rng.normal(0, 12))
+            margin = margin or 1
+            game_id = f"00224{game:05d}"
+            rows.append({'TEAM_ID': nba[home]['id'], 'GAME_ID': game_id, 'GAME_DATE': '2025-01-01',
+                         'MATCHUP': f"{nba[home]['abbreviation']} vs. {nba[away]['abbreviation']}",
+                         'PLUS_MINUS': margin})
+            rows.append({'TEAM_ID': nba[away]['id'], 'GAME_ID': game_id, 'GAME_DATE': '2025-01-01',
+                         'MATCHUP': f"{nba[away]['abbreviation']} @ {nba[home]['abbreviation']}",
+                         'PLUS_MINUS': -margin})
+            game += 1
+    return pd.DataFrame(rows), [team['nickname'] for team in nba]
+
+
+def test_pair_games_and_shrunk_ratings():
+    true_ratings = np.linspace(-8, 8, 30)
+    raw, names = _raw_game_log(true_ratings, 82)
+    games = pair_games(raw)
+    assert len(games) == 82 * 15
+    assert set(games.columns) == {'GAME_ID', 'GAME_DATE', 'HOME', 'AWAY', 'HOME_MARGIN'}
+
+    fit = fit_rating_distribution(games).set_index('Team').loc[names]
+    assert np.corrcoef(fit['NET_RATING'], true_ratings)[0, 1] > 0.9
+    # Shrinkage pulls estimates towards zero, and uncertainty falls with games played
+    adjusted = games['HOME_MARGIN'] - games['HOME_MARGIN'].mean()
+    raw_means = pd.concat([pd.Series(adjusted.values, games['HOME']),
+                           pd.Series(-adjusted.values, games['AWAY'])]).groupby(level=0).mean()
+    assert fit['NET_RATING'].std() < raw_means.std()
+    early = fit_rating_distribution(games.iloc[:150]).set_index('Team')
+    assert early['NET_RATING_SD'].mean() > fit['NET_RATING_SD'].mean()
+
+    table = pd.DataFrame({'Team': names[:3] + ['Expansion'], 'NET_RATING': [0.0, 0.0, 0.0, 1.5]})
+    applied = apply_rating_distribution(table, fit.reset_index())
+    assert list(applied['Team']) == list(table['Team'])
+    assert np.allclose(applied['NET_RATING'][:3], fit['NET_RATING'][:3])
+    assert applied['NET_RATING'].iloc[3] == 1.5 and applied['NET_RATING_SD'].iloc[3] == fit['NET_RATING_SD'].max()
+
+
+def test_massey_ratings_recover_truth_and_update_incrementally():
+    rng = np.random.default_rng(1)
+    true_ratings = rng.normal(0, 5, 30)
+    raw, names = _raw_game_log(true_ratings, 82, home_court=3.0, seed=2)
+    games = pair_games(raw)
+
+    srs = MasseyRatings(ridge=0.0).fit(games)
+    assert abs(srs.home_court_advantage - 3.0) < 1.0
+    assert abs(srs.game_sd - 12.0) < 1.0
+    fitted = srs.ratings_vector(names)
+    assert abs(fitted.mean()) < 1e-6
+    assert np.abs(fitted - (true_ratings - true_ratings.mean())).max() < 4.0
+
+    # Solving night by night from the previous solution matches one full solve
+    incremental = MasseyRatings(ridge=0.0).fit(games.iloc[:600])
+    for start in range(600, len(games), 15):
+        incremental.update(games.iloc[start:start + 15])
+    assert np.allclose(incremental.ratings_vector(names), fitted, atol=1e-5)
+
+    # Ridge shrinks ratings; a SEASON column separates team-seasons
+    ridge = MasseyRatings(ridge=20.0).fit(games)
+    assert np.abs(ridge.ratings_vector(names)).sum() < np.abs(fitted).sum()
+    seasons = pd.concat([games.assign(SEASON=2024), games.assign(SEASON=2025)], ignore_index=True)
+    by_season = MasseyRatings(ridge=0.0).fit(seasons)
+    assert np.allclose(by_season.ratings_vector(names, 2025), fitted, atol=1e-5)
+
+    simulator = srs.configure(PlayoffSimulator())
+    table = srs.apply(pd.DataFrame({'Team': names[:2], 'NET_RATING': [0.0, 0.0]}))
+    assert simulator.home_court_advantage == srs.home_court_advantage
+    assert np.allclose(table['NET_RATING'], fitted[:2])
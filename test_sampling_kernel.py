@@ -0,0 +1,49 @@
+import numpy as np
+
+from playoff_simulator import PlayoffSimulator, series_win_probability
+from sampling_kernel import ThresholdSampler, probability_thresholds, pack_outcomes, unpack_outcomes
+
+
+def _within(observed, expected, n, sigmas=4):
+    return np.all(np.abs(observed - expected) <= sigmas * np.sqrt(expected * (1 - expected) / n) + 1e-12)
+
+
+def test_threshold_games_match_normal_draws():
+    simulator = PlayoffSimulator()
+    margins = np.array([-9.0, -3.0, 0.0, 2.5, 7.0])
+    n = 200000
+
+    rng = np.random.default_rng(3)
+    normal_wins = (rng.normal(margins, simulator.game_sd, size=(n, len(margins))) > 0).mean(axis=0)
+
+    sampler = ThresholdSampler(seed=4)
+    thresholds = probability_thresholds(simulator.game_win_probability(margins))
+    threshold_wins = sampler.sample(thresholds, (n,)).mean(axis=0)
+
+    # Both paths estimate the same probability; their difference has twice the variance
+    expected = simulator.game_win_probability(margins)
+    assert _within(threshold_wins, expected, n)
+    assert np.all(np.abs(threshold_wins - normal_wins) <= 4 * np.sqrt(2 * expected * (1 - expected) / n))
+
+
+def test_threshold_series_match_exact_probability():
+    p_home = np.array([0.3, 0.55, 0.7])
+    p_away = np.array([0.2, 0.45, 0.6])
+    n = 100000
+
+    sampler = ThresholdSampler(seed=5)
+    won = sampler.simulate_series(probability_thresholds(p_home), probability_thresholds(p_away), n)
+    assert won.shape == (n, 3)
+    assert _within(won.mean(axis=0), series_win_probability(p_home, p_away), n)
+
+
+def test_certain_outcomes_and_packing():
+    sampler = ThresholdSampler(seed=6)
+    outcomes = sampler.sample(probability_thresholds([0.0, 1.0]), (1000,))
+    assert not outcomes[:, 0].any() and outcomes[:, 1].all()
+
+    packed = sampler.sample_packed(probability_thresholds([0.5, 0.25]), 1001)
+    assert packed.shape == (2, 126) and packed.dtype == np.uint8
+    unpacked = unpack_outcomes(packed, 1001)
+    assert unpacked.shape == (2, 1001)
+    assert np.array_equal(pack_outcomes(unpacked), packed)
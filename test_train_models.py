@@ -0,0 +1,80 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import train_models
+from train_models import MANIFEST_FILE, TREES_PER_SEASON, ModelTrainer
+
+
+def _seasons(years, rng):
+    rows = []
+    for year in years:
+        strength = rng.normal(size=15)
+        rows.append(pd.DataFrame({'Year': year, 'f0': strength + rng.normal(scale=0.3, size=15),
+                                  'f1': rng.normal(size=15), 'Playoffs': (strength.argsort().argsort() >= 7).astype(int)}))
+    return pd.concat(rows, ignore_index=True)
+
+
+def test_update_models_only_touches_new_seasons(tmp_path):
+    rng = np.random.default_rng(0)
+    data = _seasons(range(2010, 2020), rng)
+    old = data[data['Year'] < 2019]
+
+    trainer = ModelTrainer()
+    trainer.train_models(old[['f0', 'f1']], old['Playoffs'], 'East', old['Year'])
+    trainer.train_models(old[['f0', 'f1']], 1 - old['Playoffs'], 'West', old['Year'])
+    assert trainer.trained_models['East']['logistic'] is not trainer.trained_models['West']['logistic']
+    trainer.save_models(str(tmp_path))
+
+    reloaded = ModelTrainer()
+    reloaded.load_models(str(tmp_path))
+    actions = reloaded.update_models(data[['f0', 'f1']], data['Playoffs'], data['Year'], 'East')
+    assert actions['logistic'] == 'warm_start' and actions['random_forest'] == 'extended'
+    assert actions['svm'] in ('unchanged', 'refit')
+    assert len(reloaded.trained_models['East']['random_forest'].estimators_) == 100 + TREES_PER_SEASON
+    assert reloaded.manifest['East']['svm']['seasons'] == list(range(2010, 2020))
+
+    # Nothing new: nothing is refit, and the manifest round-trips through save_models
+    assert set(reloaded.update_models(data[['f0', 'f1']], data['Playoffs'], data['Year'], 'East').values()) == {'unchanged'}
+    reloaded.save_models(str(tmp_path))
+    with open(os.path.join(tmp_path, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    assert manifest['East']['random_forest']['trees'] == 100 + TREES_PER_SEASON
+    assert manifest['West']['logistic']['seasons'][-1] == 2018
+
+
+def test_trimmed_forest_updates_grow_new_trees(monkeypatch):
+    monkeypatch.setattr(train_models, 'MAX_FOREST_TREES', 100)
+    rng = np.random.default_rng(2)
+    data = _seasons(range(2010, 2020), rng)
+
+    trainer = ModelTrainer()
+    first = data[data['Year'] < 2017]
+    trainer.train_models(first[['f0', 'f1']], first['Playoffs'], 'East', first['Year'])
+    forest = trainer.trained_models['East']['random_forest']
+    seeds = {tree.random_state for tree in forest.estimators_}
+    for year in range(2017, 2020):
+        seen = data[data['Year'] <= year]
+        trainer.update_models(seen[['f0', 'f1']], seen['Playoffs'], seen['Year'], 'East')
+        added = {tree.random_state for tree in forest.estimators_[-TREES_PER_SEASON:]}
+        # Each update's trees are seeded apart from every tree grown before
+        assert len(forest.estimators_) == 100 and not added & seeds
+        seeds |= added
+
+
+def test_bootstrap_intervals_are_reproducible_across_workers():
+    rng = np.random.default_rng(1)
+    data = _seasons(range(2010, 2018), rng)
+    history, current = data[data['Year'] < 2017], data[data['Year'] == 2017]
+
+    trainer = ModelTrainer()
+    args = (history[['f0', 'f1']], history['Playoffs'], history['Year'], current[['f0', 'f1']])
+    serial = trainer.bootstrap_intervals(*args, n_replicates=6, n_jobs=1)
+    pooled = trainer.bootstrap_intervals(*args, n_replicates=6, n_jobs=2)
+
+    pd.testing.assert_frame_equal(serial, pooled)
+    assert list(serial.index) == list(current.index)
+    assert (serial['lower'] <= serial['probability']).all() and (serial['probability'] <= serial['upper']).all()
+    assert {'svm_lower', 'random_forest_upper', 'logistic_probability'} <= set(serial.columns)
@@ -0,0 +1,58 @@
+import tracemalloc
+import numpy as np
+
+from playoff_simulator import PlayoffSimulator, ROUND_COLUMNS
+from test_playoff_simulator import _fixture
+from trial_pipeline import stream_simulations
+
+
+def test_streamed_odds_match_exact_solution(capsys):
+    east, west = _fixture()
+    simulator = PlayoffSimulator()
+    n = 50000
+    aggregator = stream_simulations(simulator, east, west, n, memory_limit_mb=1, histograms=True, seed=8)
+    assert aggregator.n_trials == n
+    assert 'trials/s' in capsys.readouterr().out
+
+    odds = aggregator.odds()
+    exact = simulator.solve_playoffs(east, west)
+    p = exact[ROUND_COLUMNS].to_numpy()
+    assert np.all(np.abs(odds[ROUND_COLUMNS].to_numpy() - p) <= 4 * np.sqrt(p * (1 - p) / n) + 1e-12)
+
+    # Finals results add up to each team's title odds
+    finals = aggregator.finals_matchups()
+    assert np.allclose(finals.sum(axis=1).to_numpy(), odds['champion'])
+
+
+def test_peak_memory_does_not_grow_with_trials():
+    east, west = _fixture()
+    simulator = PlayoffSimulator()
+
+    peaks = []
+    for n in (20000, 200000):
+        tracemalloc.start()
+        stream_simulations(simulator, east, west, n, memory_limit_mb=1, seed=9, report_every=None)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    assert peaks[1] < 1.2 * peaks[0]
+    assert peaks[1] < 2 * 2 ** 20
+
+
+def test_sampled_ratings_widen_long_shot_odds():
+    east, west = _fixture()
+    simulator = PlayoffSimulator()
+    n = 100000
+
+    # With no uncertainty the sampled mode reproduces the exact point-rating odds
+    exact = simulator.solve_playoffs(east, west)
+    east['NET_RATING_SD'], west['NET_RATING_SD'] = 0.0, 0.0
+    certain = stream_simulations(simulator, east, west, n, seed=10, report_every=None).odds()
+    p = exact['champion'].to_numpy()
+    assert np.all(np.abs(certain['champion'].to_numpy() - p) <= 4 * np.sqrt(p * (1 - p) / n) + 1e-12)
+
+    east['NET_RATING_SD'], west['NET_RATING_SD'] = 4.0, 4.0
+    uncertain = stream_simulations(simulator, east, west, n, seed=11, report_every=None).odds()
+    favourite = np.argmax(p)
+    long_shots = (p > 0) & (p < 0.01)
+    assert uncertain['champion'].iloc[favourite] < p[favourite]
+    assert uncertain['champion'][long_shots].sum() > p[long_shots].sum()
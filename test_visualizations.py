@@ -46,7 +46,7 @@ def test_visualizations():
     visualizer.plot_round_probabilities(conference_data)
 
     print("Visualizations generated! Check the Images directory for:")
-    print("1. playoff_bracket.html")
+    print("1. bracket/bracket.json")
     print("2. round_probabilities.png")
 
 if __name__ == "__main__":
@@ -1,35 +1,217 @@
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.svm import SVC
-from sklearn.metrics import accuracy_score, classification_report
 import joblib
 import os
+import sys
+import json
+import argparse
+from datetime import datetime
+
+from compiled_scorer import COMPILED_FILE, CompiledScorer, save_compiled
+
+MANIFEST_FILE = "manifest.json"
+
+# Incremental updates: trees added to the forest per new season, the seasons those
+# trees are trained on, and the largest forest kept (oldest trees are dropped)
+TREES_PER_SEASON = 10
+FOREST_WINDOW_SEASONS = 5
+MAX_FOREST_TREES = 300
+
+# Bootstrap confidence intervals: replicates and the central share of them reported
+BOOTSTRAP_REPLICATES = 200
+BOOTSTRAP_INTERVAL = 0.9
+
+
+def _bootstrap_batch(models, X, y, seasons, X_score, seeds):
+    """Fit and score a batch of season-resampled replicates (run in a worker process)
+
+    X, y and seasons arrive memory-mapped, so every worker reads the same copy.
+
+    Returns:
+        Array of positive-class probabilities, shaped (replicate, model, scored row)
+    """
+    from sklearn.base import clone
+
+    unique = np.unique(seasons)
+    rows_by_season = [np.flatnonzero(seasons == season) for season in unique]
+    probabilities = np.empty((len(seeds), len(models), len(X_score)))
+    for replicate, seed in enumerate(seeds):
+        drawn = np.random.default_rng(seed).integers(len(unique), size=len(unique))
+        rows = np.concatenate([rows_by_season[i] for i in drawn])
+        fitted = {name: clone(model).fit(X[rows], y[rows]) for name, model in models.items()}
+        scored = CompiledScorer.from_models(fitted).predict_proba(X_score)
+        probabilities[replicate] = [scored[name] for name in models]
+    return probabilities
 
 class ModelTrainer:
     def __init__(self):
+        # sklearn is imported here rather than at module load to keep CLI startup fast
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.svm import SVC
+
         self.models = {
             'logistic': LogisticRegression(random_state=42),
             'random_forest': RandomForestClassifier(n_estimators=100, random_state=42),
             'svm': SVC(probability=True, random_state=42)
         }
         self.trained_models = {}
+        # Seasons each saved model has been trained on, by conference and model
+        self.manifest = {}
+
+    def train_models(self, X_train, y_train, conference, seasons=None):
+        """Train all models for a specific conference
+
+        Args:
+            seasons: Optional season of each training row, recorded in the manifest
+                so later runs can update the models incrementally
+        """
+        from sklearn.base import clone
 
-    def train_models(self, X_train, y_train, conference):
-        """Train all models for a specific conference"""
         conference_models = {}
         
         for name, model in self.models.items():
             print(f"Training {name} for {conference} conference...")
+            # A fresh copy per conference, so West doesn't refit East's estimators
+            model = clone(model)
             model.fit(X_train, y_train)
             conference_models[name] = model
         
         self.trained_models[conference] = conference_models
+        if seasons is not None:
+            self.manifest[conference] = {name: self._manifest_entry(seasons, len(y_train), 'full')
+                                         for name in conference_models}
         return conference_models
 
+    def _manifest_entry(self, seasons, rows, update, **extra):
+        return dict(seasons=sorted(int(season) for season in pd.unique(seasons)), rows=int(rows),
+                    update=update, updated=datetime.now().isoformat(timespec='seconds'), **extra)
+
+    def update_models(self, X_train, y_train, seasons, conference):
+        """Bring a conference's models up to date with seasons they haven't seen
+
+        Falls back to train_models when the conference has no saved models or
+        manifest. Otherwise, with the full history passed in:
+          - logistic regression is refit warm-started from its previous coefficients
+          - the random forest keeps its trees and grows TREES_PER_SEASON new trees per
+            new season, trained on the last FOREST_WINDOW_SEASONS seasons only
+          - the SVM is refit only if a new row falls inside its margin; otherwise the
+            current support vectors are still the optimal solution
+
+        Args:
+            X_train, y_train: Training rows for every season so far
+            seasons: Season of each row
+            conference: Conference name
+
+        Returns:
+            Dictionary of what was done to each model
+        """
+        from sklearn.base import clone
+
+        seasons = pd.Series(np.asarray(seasons), index=X_train.index)
+        manifest = self.manifest.get(conference)
+        models = self.trained_models.get(conference)
+        if not manifest or not models or set(models) != set(self.models):
+            print(f"No saved models for {conference} conference, training from scratch")
+            self.train_models(X_train, y_train, conference, seasons)
+            return {name: 'full' for name in self.models}
+
+        actions = {}
+        for name, model in models.items():
+            seen = set(manifest[name]['seasons'])
+            new = seasons[~seasons.isin(seen)]
+            if new.empty:
+                actions[name] = 'unchanged'
+                continue
+            new_seasons = sorted(new.unique())
+            extra = {}
+
+            if name == 'logistic':
+                model.set_params(warm_start=True)
+                model.fit(X_train, y_train)
+                actions[name] = 'warm_start'
+            elif name == 'random_forest':
+                window_start = sorted(seasons.unique())[-max(FOREST_WINDOW_SEASONS, len(new_seasons))]
+                window = (seasons >= window_start).to_numpy()
+                # Warm start seeds trees by their position in the forest, and trimming keeps
+                # the positions the same from one update to the next, so reseed each update
+                windows = manifest[name].get('windows', [])
+                random_state = int(np.random.SeedSequence(
+                    [self.models[name].random_state, len(windows) + 1]).generate_state(1)[0])
+                model.set_params(warm_start=True, random_state=random_state,
+                                 n_estimators=len(model.estimators_) + TREES_PER_SEASON * len(new_seasons))
+                model.fit(X_train[window], y_train[window])
+                if len(model.estimators_) > MAX_FOREST_TREES:
+                    model.estimators_ = model.estimators_[-MAX_FOREST_TREES:]
+                    model.set_params(n_estimators=MAX_FOREST_TREES)
+                extra['trees'] = len(model.estimators_)
+                extra['windows'] = windows + [
+                    {'seasons': sorted(int(s) for s in seasons[window].unique()),
+                     'trees': TREES_PER_SEASON * len(new_seasons)}]
+                actions[name] = 'extended'
+            else:
+                new_rows = new.index
+                sign = np.where(y_train[new_rows] == model.classes_[1], 1.0, -1.0)
+                if np.all(sign * model.decision_function(X_train.loc[new_rows]) >= 1.0):
+                    actions[name] = 'unchanged'
+                else:
+                    models[name] = model = clone(model).fit(X_train, y_train)
+                    actions[name] = 'refit'
+
+            print(f"Updated {name} for {conference} conference with seasons {new_seasons}: {actions[name]}")
+            self.manifest[conference][name] = self._manifest_entry(
+                np.concatenate([list(seen), new_seasons]), len(y_train), actions[name], **extra)
+        return actions
+
+    def bootstrap_intervals(self, X_train, y_train, seasons, X_current, n_replicates=BOOTSTRAP_REPLICATES,
+                            interval=BOOTSTRAP_INTERVAL, n_jobs=-1, seed=0):
+        """Percentile intervals for the ensemble probability from season-resampled refits
+
+        Each replicate draws whole seasons with replacement, refits every model on
+        them and scores the current rows. Replicates are fitted in a process pool
+        that shares the training matrix through memory mapping.
+
+        Args:
+            X_train, y_train: Training rows
+            seasons: Season of each training row (the resampling unit)
+            X_current: Rows to score, e.g. the current season
+            n_replicates: Number of bootstrap replicates
+            interval: Central share of the replicates covered by lower-upper
+            n_jobs: Worker processes (joblib convention, -1 for all cores)
+            seed: Seed for the resampling (results don't depend on n_jobs)
+
+        Returns:
+            DataFrame indexed like X_current with the median ensemble probability
+            (so it always lies inside the interval), its lower and upper
+            percentiles and the same three columns for each model
+        """
+        from joblib import Parallel, delayed, effective_n_jobs
+
+        X = np.ascontiguousarray(X_train, dtype=np.float64)
+        X_score = np.ascontiguousarray(X_current, dtype=np.float64)
+        seeds = np.random.SeedSequence(seed).generate_state(n_replicates)
+        batches = np.array_split(seeds, min(n_replicates, 4 * effective_n_jobs(n_jobs)))
+
+        # max_nbytes=0 memory-maps every array argument instead of pickling it per task
+        results = Parallel(n_jobs=n_jobs, max_nbytes=0, mmap_mode='r')(
+            delayed(_bootstrap_batch)(self.models, X, np.asarray(y_train), np.asarray(seasons), X_score, batch)
+            for batch in batches if len(batch))
+        probabilities = np.concatenate(results)
+
+        tail = 100 * (1 - interval) / 2
+        columns = {}
+        for name, values in [('ensemble', probabilities.mean(axis=1))] + [
+                (name, probabilities[:, i]) for i, name in enumerate(self.models)]:
+            prefix = '' if name == 'ensemble' else f"{name}_"
+            columns[f"{prefix}probability"] = np.median(values, axis=0)
+            columns[f"{prefix}lower"] = np.percentile(values, tail, axis=0)
+            columns[f"{prefix}upper"] = np.percentile(values, 100 - tail, axis=0)
+        return pd.DataFrame(columns, index=X_current.index)
+
     def evaluate_models(self, X_test, y_test, conference):
         """Evaluate all models for a specific conference"""
+        from sklearn.metrics import accuracy_score, classification_report
+
         results = {}
         
         for name, model in self.trained_models[conference].items():
@@ -79,6 +261,15 @@ class ModelTrainer:
                 joblib.dump(model, model_path)
                 print(f"Saved {name} model for {conference} conference to {model_path}")
 
+            # NumPy-only copy of the same models for fast scoring (see compiled_scorer)
+            compiled_path = os.path.join(conf_dir, COMPILED_FILE)
+            save_compiled(models, compiled_path)
+            print(f"Saved compiled models for {conference} conference to {compiled_path}")
+
+        if self.manifest:
+            with open(os.path.join(output_dir, MANIFEST_FILE), 'w') as f:
+                json.dump(self.manifest, f, indent=2, sort_keys=True)
+
     def load_models(self, input_dir="models"):
         """Load trained models from disk"""
         self.trained_models = {}
@@ -93,11 +284,22 @@ class ModelTrainer:
                     self.trained_models[conference][name] = joblib.load(model_path)
                     print(f"Loaded {name} model for {conference} conference from {model_path}")
 
-if __name__ == "__main__":
+        manifest_path = os.path.join(input_dir, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r') as f:
+                self.manifest = json.load(f)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train and evaluate the playoff classifiers for each conference")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Update the saved models with new seasons instead of refitting from scratch")
+    parser.add_argument('--form', action='store_true',
+                        help="Add the rolling and exponentially weighted form columns to the features")
+    args = parser.parse_args(argv)
     from preprocess_data import DataPreprocessor
     
     # Initialize preprocessor and load data
-    preprocessor = DataPreprocessor()
+    preprocessor = DataPreprocessor(include_form=args.form)
     data = preprocessor.load_data("NBA_data/historical_data.csv")
     processed_data = preprocessor.preprocess(data)
     
@@ -106,6 +308,8 @@ if __name__ == "__main__":
     
     # Initialize trainer
     trainer = ModelTrainer()
+    if args.incremental:
+        trainer.load_models()
     
     # Train and evaluate models for each conference
     for conf_data, conf_name in [(east_data, 'East'), (west_data, 'West')]:
@@ -113,11 +317,19 @@ if __name__ == "__main__":
         X_train, X_test, y_train, y_test = preprocessor.prepare_train_test(conf_data)
         
         # Train models
-        trainer.train_models(X_train, y_train, conf_name)
+        seasons = conf_data.loc[X_train.index, 'Year']
+        if args.incremental:
+            trainer.update_models(X_train, y_train, seasons, conf_name)
+        else:
+            trainer.train_models(X_train, y_train, conf_name, seasons)
         
         # Evaluate models
         trainer.evaluate_models(X_test, y_test, conf_name)
     
     # Save models
     trainer.save_models()
-    print("\nModel training complete!")
\ No newline at end of file
+    print("\nModel training complete!")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
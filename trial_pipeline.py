@@ -0,0 +1,113 @@
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+from playoff_simulator import PlayoffSimulator, ROUND_COLUMNS
+from outcome_store import bracket_slots, trial_blocks
+
+# Peak bytes allocated per trial in a block (measured with tracemalloc, with headroom)
+BYTES_PER_TRIAL = 160
+SAMPLED_RATINGS_BYTES_PER_TRIAL = 400
+MIN_BLOCK_SIZE = 1000
+
+# Larger blocks stop fitting in cache and run slower, so the memory limit is only
+# used to shrink blocks below this
+MAX_BLOCK_SIZE = 32768
+
+
+def block_size_for(memory_limit_mb: float, sampled_ratings: bool = False) -> int:
+    """Block of trials whose working set stays under the memory limit"""
+    bytes_per_trial = SAMPLED_RATINGS_BYTES_PER_TRIAL if sampled_ratings else BYTES_PER_TRIAL
+    return int(np.clip(memory_limit_mb * 2 ** 20 // bytes_per_trial, MIN_BLOCK_SIZE, MAX_BLOCK_SIZE))
+
+
+class TrialAggregator:
+    """Running per-team, per-round counters folded from blocks of simulated trials
+
+    The state is a handful of small integer arrays, independent of how many trials
+    have been folded in.
+    """
+
+    def __init__(self, teams: List[str], conferences: List[str], seeds: np.ndarray,
+                 slots: List[Dict], histograms: bool = False):
+        self.teams = list(teams)
+        self.conferences = list(conferences)
+        self.seeds = np.asarray(seeds)
+        self.n_trials = 0
+        self.counts = np.zeros((len(self.teams), len(ROUND_COLUMNS)), dtype=np.int64)
+        self.finals = np.zeros((len(self.teams), len(self.teams)), dtype=np.int64) if histograms else None
+        self._round_slots = [[i for i, slot in enumerate(slots) if slot['round'] == round_index]
+                             for round_index in range(len(ROUND_COLUMNS) - 1)]
+
+    def update(self, winners: np.ndarray, losers: np.ndarray):
+        """Fold one block of (n_slots, trials) winner and loser codes into the counters"""
+        n_teams = len(self.teams)
+        first_round = self._round_slots[0]
+        playoff_teams = np.concatenate([winners[first_round].ravel(), losers[first_round].ravel()])
+        self.counts[:, 0] += np.bincount(playoff_teams, minlength=n_teams)
+        for column, slots in enumerate(self._round_slots, start=1):
+            self.counts[:, column] += np.bincount(winners[slots].ravel(), minlength=n_teams)
+
+        if self.finals is not None:
+            final = self._round_slots[-1][0]
+            pairs = winners[final].astype(np.int64) * n_teams + losers[final]
+            self.finals += np.bincount(pairs, minlength=n_teams * n_teams).reshape(n_teams, n_teams)
+        self.n_trials += winners.shape[1]
+
+    def odds(self) -> pd.DataFrame:
+        """Round-by-round probabilities in the layout of PlayoffSimulator.solve_playoffs"""
+        result = pd.DataFrame({'Team': self.teams, 'Conference': self.conferences, 'Seed': self.seeds})
+        for column, name in enumerate(ROUND_COLUMNS):
+            result[name] = self.counts[:, column] / max(self.n_trials, 1)
+        return result
+
+    def finals_matchups(self) -> pd.DataFrame:
+        """Probability of each (champion, runner-up) Finals result"""
+        if self.finals is None:
+            raise ValueError("Finals histograms were not collected; pass histograms=True")
+        return pd.DataFrame(self.finals / max(self.n_trials, 1), index=self.teams, columns=self.teams)
+
+
+def stream_simulations(simulator: PlayoffSimulator, east_df: pd.DataFrame, west_df: pd.DataFrame,
+                       n_trials: int = None, memory_limit_mb: float = 256, histograms: bool = False,
+                       seed=None, report_every: float = 5.0) -> TrialAggregator:
+    """Simulate any number of full brackets in constant memory
+
+    Trials are generated in fixed-size blocks sized to the memory limit and folded
+    into running counters, so peak memory does not grow with n_trials. Tables with a
+    NET_RATING_SD column have each team's rating drawn per trial.
+
+    Args:
+        simulator: Simulator whose ratings model and parameters are used
+        east_df: Eastern conference teams sorted by record
+        west_df: Western conference teams sorted by record
+        n_trials: Number of brackets to simulate (defaults to simulator.n_simulations)
+        memory_limit_mb: Ceiling for the per-block working set
+        histograms: Also count every Finals (champion, runner-up) pairing
+        seed: Seed for the sampler
+        report_every: Seconds between progress reports (None to stay quiet)
+
+    Returns:
+        TrialAggregator holding the counters
+    """
+    n_trials = n_trials or simulator.n_simulations
+    bracket = simulator._playoff_field(east_df, west_df)
+    slots = bracket_slots(bracket['conferences'])
+    conferences = [conf for conf, n_conf in bracket['conferences'] for _ in range(n_conf)]
+    aggregator = TrialAggregator(bracket['field']['Team'], conferences, bracket['seeds'], slots, histograms)
+
+    block_size = min(block_size_for(memory_limit_mb, bracket['rating_sd'] is not None), n_trials)
+    start = time.perf_counter()
+    last_report = start
+    for winners, losers in trial_blocks(simulator, bracket, slots, n_trials, block_size, seed):
+        aggregator.update(winners, losers)
+
+        now = time.perf_counter()
+        if report_every is not None and (now - last_report >= report_every or aggregator.n_trials == n_trials):
+            rate = aggregator.n_trials / max(now - start, 1e-9)
+            print(f"{aggregator.n_trials:,}/{n_trials:,} trials "
+                  f"({100 * aggregator.n_trials / n_trials:.1f}%), {rate:,.0f} trials/s")
+            last_report = now
+
+    return aggregator
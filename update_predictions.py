@@ -1,21 +1,38 @@
 import pandas as pd
 import numpy as np
 from preprocess_data import DataPreprocessor
-from train_models import ModelTrainer
-from generate_visualizations import Visualizer
+from compiled_scorer import load_compiled
+from data_loading import read_table
+import argparse
 import os
 
 class PlayoffPredictor:
-    def __init__(self):
-        self.preprocessor = DataPreprocessor()
-        self.trainer = ModelTrainer()
-        self.visualizer = Visualizer()
+    def __init__(self, include_form=False):
+        self.preprocessor = DataPreprocessor(include_form=include_form)
+        self._trainer = None
+        self._visualizer = None
         
         # Create necessary directories
         for dir_name in ['NBA_data', 'models', 'Images']:
             if not os.path.exists(dir_name):
                 os.makedirs(dir_name)
 
+    @property
+    def trainer(self):
+        """ModelTrainer, created only when the compiled models can't be used"""
+        if self._trainer is None:
+            from train_models import ModelTrainer
+            self._trainer = ModelTrainer()
+        return self._trainer
+
+    @property
+    def visualizer(self):
+        """Visualizer, created on first use so predictions don't load matplotlib"""
+        if self._visualizer is None:
+            from generate_visualizations import Visualizer
+            self._visualizer = Visualizer()
+        return self._visualizer
+
     def update_data(self):
         """Update the dataset with latest NBA data"""
         from nba_scraper_2025 import NBAScraper
@@ -29,7 +46,7 @@ class PlayoffPredictor:
         
         # Load and combine with historical data if it exists
         if os.path.exists("NBA_data/historical_data.csv"):
-            historical_data = pd.read_csv("NBA_data/historical_data.csv")
+            historical_data = read_table("NBA_data/historical_data.csv")
             # Remove current year if it exists in historical data
             historical_data = historical_data[historical_data['Year'] != 2025]
             # Combine data
@@ -38,8 +55,13 @@ class PlayoffPredictor:
         else:
             current_data.to_csv("NBA_data/historical_data.csv", index=False)
 
-    def generate_predictions(self):
-        """Generate playoff predictions for current season"""
+    def generate_predictions(self, plot=True, bootstrap=0, n_jobs=-1):
+        """Generate playoff predictions for current season (charting them unless plot is False)
+
+        With bootstrap > 0, that many season-resampled refits of the saved models'
+        training seasons give each team a percentile interval, and the reported
+        probability is the replicates' median (see ModelTrainer.bootstrap_intervals).
+        """
         # Load and preprocess data
         data = self.preprocessor.load_data("NBA_data/historical_data.csv")
         processed_data = self.preprocessor.preprocess(data)
@@ -47,8 +69,10 @@ class PlayoffPredictor:
         # Split data by conference
         east_data, west_data = self.preprocessor.split_conferences(processed_data)
         
-        # Load trained models
-        self.trainer.load_models()
+        # Load trained models, preferring the compiled copies that score without sklearn
+        scorers = load_compiled()
+        if len(scorers) < 2:
+            self.trainer.load_models()
         
         predictions = {}
         
@@ -60,8 +84,12 @@ class PlayoffPredictor:
             teams = current_data['Team']
             
             # Get predictions
-            model_predictions, probabilities, final_predictions, avg_proba = \
-                self.trainer.predict_playoffs(X_current, conf_name)
+            if conf_name in scorers:
+                model_predictions, probabilities, final_predictions, avg_proba = \
+                    scorers[conf_name].predict_playoffs(X_current)
+            else:
+                model_predictions, probabilities, final_predictions, avg_proba = \
+                    self.trainer.predict_playoffs(X_current, conf_name)
             
             # Store predictions
             predictions[conf_name] = {
@@ -69,14 +97,27 @@ class PlayoffPredictor:
                 'probabilities': avg_proba,
                 'predictions': final_predictions
             }
+
+            if bootstrap:
+                # Refit on the seasons the saved models were trained on (see train_models.main)
+                X_train, _, y_train, _ = self.preprocessor.prepare_train_test(conf_data)
+                print(f"Fitting {bootstrap} bootstrap replicates for {conf_name} conference...")
+                intervals = self.trainer.bootstrap_intervals(
+                    X_train, y_train, conf_data.loc[X_train.index, 'Year'],
+                    X_current, n_replicates=bootstrap, n_jobs=n_jobs)
+                # Report the bootstrap's own centre so each probability sits inside its interval
+                predictions[conf_name]['probabilities'] = intervals['probability'].to_numpy()
+                predictions[conf_name]['predictions'] = (intervals['probability'].to_numpy() > 0.5).astype(int)
+                predictions[conf_name]['intervals'] = intervals[['lower', 'upper']].to_numpy()
             
             # Generate visualization
-            self.visualizer.plot_prediction_probabilities(
-                probabilities,
-                teams.values,
-                conf_name,
-                2025
-            )
+            if plot:
+                self.visualizer.plot_prediction_probabilities(
+                    probabilities,
+                    teams.values,
+                    conf_name,
+                    2025
+                )
         
         return predictions
 
@@ -94,6 +135,7 @@ class PlayoffPredictor:
                 teams = predictions[conference]['teams']
                 probas = predictions[conference]['probabilities']
                 preds = predictions[conference]['predictions']
+                intervals = predictions[conference].get('intervals')
                 
                 sorted_indices = np.argsort(probas)[::-1]
                 
@@ -103,18 +145,33 @@ class PlayoffPredictor:
                     prediction = preds[idx]
                     
                     status = "PLAYOFF BOUND" if prediction == 1 else "PREDICTED OUT"
-                    f.write(f"{team:<25} {probability:.1%} ({status})\n")
+                    if intervals is not None:
+                        lower, upper = intervals[idx]
+                        f.write(f"{team:<25} {probability:.1%} [{lower:.1%}-{upper:.1%}] ({status})\n")
+                    else:
+                        f.write(f"{team:<25} {probability:.1%} ({status})\n")
                 
                 f.write("\n")
 
-def main():
-    predictor = PlayoffPredictor()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Update the season data and predict the 2025 playoff field")
+    parser.add_argument('--skip-update', action='store_true', help="Predict from the data already on disk")
+    parser.add_argument('--no-plots', action='store_true', help="Don't chart the probabilities")
+    parser.add_argument('--bootstrap', type=int, default=0, metavar='N',
+                        help="Add 90%% intervals from N bootstrap refits of the models")
+    parser.add_argument('--jobs', type=int, default=-1, help="Processes for the bootstrap refits")
+    parser.add_argument('--form', action='store_true',
+                        help="Use the form columns (for models trained with train_models.py --form)")
+    args = parser.parse_args(argv)
+
+    predictor = PlayoffPredictor(include_form=args.form)
     
-    print("Updating NBA data...")
-    predictor.update_data()
+    if not args.skip_update:
+        print("Updating NBA data...")
+        predictor.update_data()
     
     print("\nGenerating predictions...")
-    predictions = predictor.generate_predictions()
+    predictions = predictor.generate_predictions(plot=not args.no_plots, bootstrap=args.bootstrap, n_jobs=args.jobs)
     
     print("\nSaving predictions...")
     predictor.save_predictions(predictions)